@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark event database throughput under SQLite's stock settings and the
+tuned profile used by Doodie Duty.
+
+Run it on the target device (e.g. the Pi's SD card), since fsync cost is
+what the profile mainly changes:
+
+    python benchmark_db.py --events 2000 --dir /home/pi/doodie_duty
+"""
+
+import argparse
+import asyncio
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from src.database import Database, SQLiteProfile
+
+
+async def run_profile(
+    name: str,
+    profile: SQLiteProfile,
+    directory: Path,
+    events: int,
+    batch_rows: int,
+    batch_delay_ms: float
+) -> dict:
+    db_path = directory / f"bench_{name}.db"
+    db = Database(
+        f"sqlite+aiosqlite:///{db_path}",
+        snapshot_directory=str(directory / f"bench_{name}_snapshots"),
+        batch_max_rows=batch_rows,
+        batch_max_delay_ms=batch_delay_ms,
+        sqlite_profile=profile
+    )
+    await db.init_db()
+
+    # Sequential inserts: each event waits for its own commit, like a quiet day
+    started = time.perf_counter()
+    for i in range(events // 10):
+        await db.log_event(state="supervised", dogs_detected=1, humans_detected=1)
+    sequential_rate = (events // 10) / (time.perf_counter() - started)
+
+    # Concurrent inserts: a burst of flapping events shares batch commits
+    started = time.perf_counter()
+    await asyncio.gather(*[
+        db.log_event(
+            state="unsupervised" if i % 2 else "supervised",
+            dogs_detected=1,
+            humans_detected=i % 2,
+            alert_triggered=(i % 10 == 0)
+        )
+        for i in range(events)
+    ])
+    burst_rate = events / (time.perf_counter() - started)
+
+    # Paged reads, walking the whole alert history by cursor
+    started = time.perf_counter()
+    pages = 0
+    cursor = None
+    while True:
+        _, cursor = await db.get_events_page(limit=50, cursor=cursor, alerts_only=True)
+        pages += 1
+        if cursor is None:
+            break
+    for _ in range(50):
+        await db.get_statistics()
+    query_seconds = time.perf_counter() - started
+
+    await db.close()
+    return {
+        "sequential_inserts_per_s": sequential_rate,
+        "burst_inserts_per_s": burst_rate,
+        "queries_per_s": (pages + 50) / query_seconds,
+        "avg_commit_ms": db.get_stats()["avg_commit_ms"]
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark Doodie Duty's event database")
+    parser.add_argument("--events", type=int, default=2000, help="Events inserted in the burst test")
+    parser.add_argument("--batch-rows", type=int, default=50, help="Rows per batch commit")
+    parser.add_argument(
+        "--batch-delay-ms", type=float, default=0,
+        help="Batch wait; 0 commits whatever is queued so commit cost is measured directly"
+    )
+    parser.add_argument("--dir", type=str, default=None, help="Directory for the benchmark databases")
+    args = parser.parse_args()
+
+    directory = Path(tempfile.mkdtemp(prefix="doodie_bench_", dir=args.dir))
+    profiles = {
+        "stock": SQLiteProfile.sqlite_defaults(),
+        "tuned": SQLiteProfile()
+    }
+
+    print("=" * 50)
+    print("DOODIE DUTY DATABASE BENCHMARK")
+    print("=" * 50)
+    print(f"Databases in {directory}")
+
+    results = {}
+    try:
+        for name, profile in profiles.items():
+            print(f"\nRunning {name} profile ({profile.journal_mode}, synchronous={profile.synchronous})...")
+            results[name] = await run_profile(name, profile, directory, args.events, args.batch_rows, args.batch_delay_ms)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    print(f"\n{'metric':<28}{'stock':>10}{'tuned':>10}{'speedup':>10}")
+    for metric in results["stock"]:
+        stock = results["stock"][metric]
+        tuned = results["tuned"][metric]
+        if metric.endswith("_ms"):
+            speedup = stock / tuned if tuned else 0.0
+        else:
+            speedup = tuned / stock if stock else 0.0
+        print(f"{metric:<28}{stock:>10.1f}{tuned:>10.1f}{speedup:>9.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
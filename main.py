@@ -1,4 +1,5 @@
 import asyncio
+import logging
 import uvicorn
 import signal
 import sys
@@ -9,7 +10,16 @@ from src.camera import AsyncCameraCapture
 from src.detector import DogHumanDetector
 from src.supervisor import DogSupervisor, SupervisionEvent, SupervisionState
 from src.web_app import WebApp
-from src.database import Database
+from src.database import Database, SQLiteProfile
+from src.retention import RetentionManager
+from src.media import MediaCatalog
+from src.audio import AudioPlayer
+from src.webhooks import WebhookDispatcher
+from src.log_writer import RotatingJsonlWriter
+from src.logging_setup import configure_logging, shutdown_logging
+from src.thumbnails import ThumbnailPipeline
+from src.workers import vision_pool, loop_monitor
+from src.recording import probe_video_codec
 from src.actions import (
     ActionManager,
     SoundAlert,
@@ -20,19 +30,83 @@ from src.actions import (
 )
 
 
+logger = logging.getLogger("main")
+
+
 class DoodieDutyApp:
     def __init__(self, config_file: str = None):
         self.config = load_config(config_file)
-        self.database = Database(self.config.database_url)
+        # Optional JSON-lines copy of the application log, next to the event logs
+        self.app_log = RotatingJsonlWriter(
+            self.config.log_directory,
+            prefix="app",
+            flush_interval_seconds=self.config.log_flush_interval_seconds,
+            max_bytes=int(self.config.log_max_file_mb * 1024 * 1024),
+            compress=self.config.log_compress_rotated
+        ) if self.config.log_json else None
+        configure_logging(self.config.log_level, self.config.log_module_levels, json_writer=self.app_log)
+        self.database = Database(
+            self.config.database_url,
+            self.config.snapshot_directory,
+            batch_max_rows=self.config.db_batch_max_rows,
+            batch_max_delay_ms=self.config.db_batch_max_delay_ms,
+            queue_size=self.config.db_queue_size,
+            sqlite_profile=SQLiteProfile(
+                journal_mode=self.config.sqlite_journal_mode,
+                synchronous=self.config.sqlite_synchronous,
+                mmap_size=self.config.sqlite_mmap_size,
+                cache_size_kb=self.config.sqlite_cache_size_kb,
+                busy_timeout_ms=self.config.sqlite_busy_timeout_ms,
+                temp_store=self.config.sqlite_temp_store,
+                pool_size=self.config.sqlite_pool_size
+            )
+        )
         self.action_manager = ActionManager()
+        self.audio_player = None
+        self.webhooks = None
+        self.event_log = None
         self.supervisor = None
         self.web_app = None
+        self.thumbnails = ThumbnailPipeline(
+            self.config.thumbnail_directory,
+            width=self.config.thumbnail_width,
+            image_format=self.config.thumbnail_format,
+            quality=self.config.thumbnail_quality
+        )
+        self.media_catalog = MediaCatalog(
+            self.database,
+            self.config.recording_directory,
+            "captures",
+            thumbnails=self.thumbnails
+        )
+        self.retention = RetentionManager(
+            self.database,
+            captures_dir="captures",
+            recordings_dir=self.config.recording_directory,
+            max_age_days=self.config.cleanup_days,
+            max_disk_mb=self.config.max_disk_usage_mb,
+            interval_seconds=self.config.retention_interval_minutes * 60,
+            batch_size=self.config.retention_batch_size,
+            orphan_grace_seconds=self.config.orphan_grace_minutes * 60,
+            media_catalog=self.media_catalog
+        )
 
     async def initialize(self):
-        print(f"\n[MAIN] 🚀 Initializing Doodie Duty...")
-        print(f"[MAIN] Config: camera={self.config.camera_index}, alert_delay={self.config.alert_delay_seconds}s")
+        logger.info(
+            "🚀 Initializing Doodie Duty (camera=%s, alert_delay=%ss)",
+            self.config.camera_index, self.config.alert_delay_seconds
+        )
+        if self.app_log:
+            self.app_log.start()
+
+        vision_pool.configure(self.config.vision_workers)
+        logger.info("Vision worker pool: %d threads", self.config.vision_workers)
 
         await self.database.init_db()
+        # Index any media written while the catalog wasn't running, without delaying startup
+        asyncio.create_task(self.media_catalog.backfill())
+        self.thumbnails.start()
+        self.retention.start()
 
         model_name = "yolov8n.pt" if not self.config.use_lightweight_model else "yolov8n.pt"
         detector = DogHumanDetector(
@@ -42,7 +116,9 @@ class DoodieDutyApp:
 
         camera = AsyncCameraCapture(
             camera_index=self.config.camera_index,
-            fps_limit=self.config.camera_fps
+            fps_limit=self.config.camera_fps,
+            idle_fps=self.config.camera_idle_fps,
+            frame_buffers=self.config.camera_frame_buffers
         )
 
         self.supervisor = DogSupervisor(
@@ -54,61 +130,99 @@ class DoodieDutyApp:
 
         self._setup_actions()
         self._setup_event_handlers()
+        if self.webhooks:
+            await self.webhooks.start()
 
-        self.web_app = WebApp(self.supervisor, self.database)
+        if self.config.enable_video_recording:
+            # Probe once now so the first alert recording starts instantly
+            probe = await vision_pool.run(probe_video_codec, (640, 480), self.config.recording_fps)
+            logger.info("Recording codec: %s", probe["codec"] or "none available")
+
+        self.web_app = WebApp(
+            self.supervisor,
+            self.database,
+            stream_max_fps=self.config.stream_max_fps,
+            stream_jpeg_quality=self.config.stream_jpeg_quality,
+            action_manager=self.action_manager,
+            retention_manager=self.retention,
+            media_catalog=self.media_catalog
+        )
 
-        print(f"[MAIN] ✓ Initialization complete!\n")
+        logger.info("✓ Initialization complete")
 
     def _setup_actions(self):
-        print(f"[MAIN] 🎛️ Setting up action triggers...")
         self.action_manager.cooldown_seconds = self.config.action_cooldown_seconds
-        print(f"[MAIN] Action cooldown: {self.config.action_cooldown_seconds}s")
+        logger.info("🎛️ Setting up action triggers (cooldown %ss)", self.config.action_cooldown_seconds)
 
         actions_enabled = []
 
         if self.config.enable_sound_alert:
-            sound_alert = SoundAlert(self.config.sound_file)
+            self.audio_player = AudioPlayer(self.config.sound_file)
+            sound_alert = SoundAlert(self.config.sound_file, player=self.audio_player)
             self.action_manager.add_action(sound_alert)
             actions_enabled.append(f"sound_alert ({sound_alert.system})")
 
         if self.config.enable_file_logging:
-            file_logger = FileLogger(self.config.log_directory)
+            self.event_log = RotatingJsonlWriter(
+                self.config.log_directory,
+                prefix="events",
+                flush_interval_seconds=self.config.log_flush_interval_seconds,
+                max_bytes=int(self.config.log_max_file_mb * 1024 * 1024),
+                compress=self.config.log_compress_rotated
+            )
+            self.event_log.start()
+            file_logger = FileLogger(self.config.log_directory, writer=self.event_log)
             self.action_manager.add_action(file_logger)
             actions_enabled.append(f"file_logger ({self.config.log_directory})")
 
         if self.config.enable_video_recording:
             video_recorder = VideoRecorder(
                 self.config.recording_directory,
-                self.config.recording_duration
+                self.config.recording_duration,
+                self.config.recording_preroll_seconds,
+                self.config.recording_fps,
+                catalog=self.media_catalog
             )
             self.action_manager.add_action(video_recorder)
-            actions_enabled.append(f"video_recorder ({self.config.recording_duration}s)")
+            if self.config.recording_preroll_seconds > 0:
+                self.supervisor.camera.enable_preroll(
+                    self.config.recording_preroll_seconds,
+                    self.config.recording_preroll_fps
+                )
+            actions_enabled.append(
+                f"video_recorder ({self.config.recording_preroll_seconds}s + {self.config.recording_duration}s)"
+            )
 
         if self.config.notification_webhook:
-            notification = NotificationSender(self.config.notification_webhook)
+            self.webhooks = WebhookDispatcher(
+                self.config.notification_webhook.split(","),
+                outbox_dir=self.config.webhook_outbox_directory,
+                max_attempts=self.config.webhook_max_attempts,
+                backoff_base_seconds=self.config.webhook_backoff_seconds,
+                coalesce_seconds=self.config.webhook_coalesce_seconds
+            )
+            notification = NotificationSender(self.config.notification_webhook, dispatcher=self.webhooks)
             self.action_manager.add_action(notification)
-            actions_enabled.append("webhook_notification")
+            actions_enabled.append(f"webhook_notification ({len(self.webhooks.targets)} target(s))")
 
         # Add image capture action - always enabled for state changes and alerts
-        image_capture = ImageCapture("captures")
+        image_capture = ImageCapture("captures", catalog=self.media_catalog)
         self.action_manager.add_action(image_capture)
         actions_enabled.append("image_capture (captures)")
 
         if actions_enabled:
-            print(f"[MAIN] Enabled actions: {', '.join(actions_enabled)}")
+            logger.info("Enabled actions: %s", ", ".join(actions_enabled))
         else:
-            print(f"[MAIN] ⚠️ No actions enabled!")
+            logger.warning("⚠️ No actions enabled!")
 
     def _setup_event_handlers(self):
         async def on_event(event: SupervisionEvent):
-            print(f"[MAIN] ⚙️ Processing supervision event: {event.state.value}")
-            print(f"[MAIN] Event timestamp: {event.timestamp.strftime('%H:%M:%S')}")
+            logger.debug("Processing %s event from %s", event.state.value, event.timestamp.strftime("%H:%M:%S"))
 
             captured_image_filename = None
 
             # Trigger actions for alerts OR state changes (to capture images)
             if event.state == SupervisionState.ALERT or True:  # Always trigger for image capture
-                print(f"[MAIN] 🚨 Event - preparing to trigger actions (including image capture)")
                 event_data = {
                     "state": event.state.value,
                     "dogs_detected": event.dogs_detected,
@@ -116,16 +230,18 @@ class DoodieDutyApp:
                     "duration_unsupervised": event.duration_unsupervised.total_seconds()
                     if event.duration_unsupervised else None,
                     "camera": self.supervisor.camera,
-                    "detector": self.supervisor.detector
+                    "detector": self.supervisor.detector,
+                    "detection_cache": self.supervisor.detection_cache
                 }
                 try:
-                    await self.action_manager.trigger_actions(event_data)
+                    # Only the capture has to finish before the database write; the
+                    # other actions carry on in the background
+                    await self.action_manager.trigger_actions(event_data, wait_for=("image_capture",))
                     # Check if image was captured
                     if "captured_image" in event_data:
                         captured_image_filename = event_data["captured_image"]["filename"]
-                        print(f"[MAIN] 📸 Image captured: {captured_image_filename}")
                 except Exception as e:
-                    print(f"[MAIN] ✗ Action triggering failed: {e}")
+                    logger.exception("✗ Action triggering failed: %s", e)
 
             # Log to database with captured image info
             try:
@@ -140,12 +256,11 @@ class DoodieDutyApp:
                     alert_triggered=(event.state == SupervisionState.ALERT),
                     captured_image_filename=captured_image_filename
                 )
-                print(f"[MAIN] ✓ Event logged to database (ID: {event_id})")
+                logger.debug("✓ Event logged to database (ID: %s)", event_id)
             except Exception as e:
-                print(f"[MAIN] ✗ Database logging failed: {e}")
+                logger.error("✗ Database logging failed: %s", e)
 
         self.supervisor.add_event_handler(on_event)
-        print(f"[MAIN] Event handler registered")
 
     async def run(self):
         await self.initialize()
@@ -154,45 +269,51 @@ class DoodieDutyApp:
             app=self.web_app.app,
             host=self.config.host,
             port=self.config.port,
-            log_level="info"
+            log_level=self.config.log_level.lower()
         )
         server = uvicorn.Server(config)
 
-        print(f"\n[MAIN] ========================================")
-        print(f"[MAIN] 🐕 DOODIE DUTY IS RUNNING!")
-        print(f"[MAIN] ========================================")
-        print(f"[MAIN] 📡 Web interface: http://{self.config.host}:{self.config.port}")
-        print(f"[MAIN] 📷 Camera: Device {self.config.camera_index}")
-        print(f"[MAIN] ⏰ Alert delay: {self.config.alert_delay_seconds} seconds")
-        print(f"[MAIN] 🎛️ Actions: {len(self.action_manager.actions)} configured")
-        print(f"[MAIN] ========================================")
-        print(f"[MAIN] Press Ctrl+C to stop...\n")
+        logger.info(
+            "🐕 DOODIE DUTY IS RUNNING! Web interface: http://%s:%s, camera device %s, "
+            "alert delay %ss, %d actions configured. Press Ctrl+C to stop",
+            self.config.host, self.config.port, self.config.camera_index,
+            self.config.alert_delay_seconds, len(self.action_manager.actions)
+        )
 
+        loop_monitor.start()
         await server.serve()
 
     async def cleanup(self):
-        print(f"\n[MAIN] 🛑 Shutting down...")
+        logger.info("🛑 Shutting down...")
         if self.supervisor:
             await self.supervisor.stop()
 
-        print(f"[MAIN] 🧪 Cleaning up old database events...")
-        try:
-            deleted = await self.database.cleanup_old_events(self.config.cleanup_days)
-            if deleted > 0:
-                print(f"[MAIN] ✓ Cleaned up {deleted} old events")
-            else:
-                print(f"[MAIN] No old events to clean up")
-        except Exception as e:
-            print(f"[MAIN] ✗ Cleanup failed: {e}")
-
-        print(f"[MAIN] 😭 Goodbye! 🐕")
+        await self.action_manager.close()
+        if self.audio_player:
+            await self.audio_player.stop()
+        if self.webhooks:
+            await self.webhooks.stop()
+        if self.event_log:
+            await self.event_log.stop()
+        # Pruning runs in the background while the app is up; just stop it here
+        await self.retention.stop()
+        await self.thumbnails.stop()
+        await self.database.close()
+        await loop_monitor.stop()
+        vision_pool.shutdown(wait=False)
+
+        logger.info("😭 Goodbye! 🐕")
+        # Drain the log queue, then flush the JSON copy it feeds
+        shutdown_logging()
+        if self.app_log:
+            await self.app_log.stop()
 
 
 async def main():
     app = DoodieDutyApp()
 
     def signal_handler(sig, frame):
-        print("\nReceived interrupt signal")
+        logger.info("Received interrupt signal")
         sys.exit(0)
 
     signal.signal(signal.SIGINT, signal_handler)
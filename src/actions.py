@@ -1,87 +1,93 @@
-import os
-import subprocess
-import platform
+import logging
+import time
 from datetime import datetime
-from typing import Optional, Dict, Any, Callable
+from typing import Optional, Dict, Any, Callable, Iterable
 import asyncio
-import json
-import aiofiles
 from pathlib import Path
 import cv2
 import base64
 
+from .audio import AudioPlayer
+from .log_writer import RotatingJsonlWriter
+from .media import CAPTURE, RECORDING
+from .webhooks import WebhookDispatcher
+from .recording import RecordingWriter, probe_video_codec, get_video_codec_probe, reset_video_codec_probe
+from .workers import LatencyHistogram, vision_pool
+
+
+logger = logging.getLogger(__name__)
+
 
 class ActionTrigger:
+    # Longest a single run may take before the manager gives up on it
+    timeout_seconds: float = 30.0
+
     def __init__(self, name: str):
         self.name = name
         self.enabled = True
         self.last_triggered = None
+        self.latency = LatencyHistogram()
+        self.failures = 0
+        self.timeouts = 0
 
     async def trigger(self, event_data: Dict[str, Any]) -> bool:
         if not self.enabled:
-            print(f"[ACTION] {self.name} is disabled, skipping")
+            logger.debug("%s is disabled, skipping", self.name)
             return False
 
-        print(f"[ACTION] Triggering {self.name} at {datetime.now().strftime('%H:%M:%S')}")
         self.last_triggered = datetime.now()
         return await self._execute(event_data)
 
     async def _execute(self, event_data: Dict[str, Any]) -> bool:
         raise NotImplementedError
 
+    async def close(self):
+        """Finish or stop any work the action left running in the background."""
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "last_triggered": self.last_triggered.isoformat() if self.last_triggered else None,
+            "timeout_seconds": self.timeout_seconds,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "latency": self.latency.to_dict()
+        }
+
 
 class SoundAlert(ActionTrigger):
-    def __init__(self, sound_file: Optional[str] = None):
+    timeout_seconds = 15.0
+
+    def __init__(self, sound_file: Optional[str] = None, player: Optional[AudioPlayer] = None):
         super().__init__("sound_alert")
         self.sound_file = sound_file
-        self.system = platform.system()
+        self.player = player or AudioPlayer(sound_file)
+        self.system = self.player.system
 
     async def _execute(self, event_data: Dict[str, Any]) -> bool:
-        print(f"[SOUND] Executing sound alert on {self.system}")
-        print(f"[SOUND] Event data: dogs={event_data.get('dogs_detected')}, humans={event_data.get('humans_detected')}, duration={event_data.get('duration_unsupervised')}s")
-
-        try:
-            if self.system == "Darwin":  # macOS
-                if self.sound_file and os.path.exists(self.sound_file):
-                    print(f"[SOUND] Playing custom sound: {self.sound_file}")
-                    subprocess.run(["afplay", self.sound_file], check=False)
-                else:
-                    print(f"[SOUND] Using system TTS for alert")
-                    subprocess.run(["say", "Alert! Dog detected unsupervised"], check=False)
-            elif self.system == "Linux":
-                if self.sound_file and os.path.exists(self.sound_file):
-                    print(f"[SOUND] Playing custom sound: {self.sound_file}")
-                    subprocess.run(["aplay", self.sound_file], check=False)
-                else:
-                    print(f"[SOUND] Using espeak for alert")
-                    subprocess.run(["espeak", "Alert! Dog detected unsupervised"], check=False)
-            elif self.system == "Windows":
-                import winsound
-                if self.sound_file and os.path.exists(self.sound_file):
-                    print(f"[SOUND] Playing custom sound: {self.sound_file}")
-                    winsound.PlaySound(self.sound_file, winsound.SND_FILENAME)
-                else:
-                    print(f"[SOUND] Using system beep")
-                    winsound.Beep(1000, 1000)
-
-            print(f"[SOUND] ✓ Sound alert completed successfully")
+        # Playback happens in the player's own tasks; this only queues it
+        if self.player.play():
+            logger.debug("Sound alert queued on %s", self.system)
             return True
-        except Exception as e:
-            print(f"[SOUND] ✗ Sound alert failed: {e}")
-            return False
+        return False
+
+    def get_status(self) -> Dict[str, Any]:
+        status = super().get_status()
+        status["player"] = self.player.get_stats()
+        return status
 
 
 class FileLogger(ActionTrigger):
-    def __init__(self, log_dir: str = "logs"):
+    timeout_seconds = 5.0
+
+    def __init__(self, log_dir: str = "logs", writer: Optional[RotatingJsonlWriter] = None):
         super().__init__("file_logger")
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(exist_ok=True)
+        self.writer = writer or RotatingJsonlWriter(log_dir, prefix="events")
 
     async def _execute(self, event_data: Dict[str, Any]) -> bool:
         try:
-            log_file = self.log_dir / f"events_{datetime.now().strftime('%Y%m%d')}.log"
-            print(f"[LOG] Writing event to {log_file}")
-
             log_entry = {
                 "timestamp": datetime.now().isoformat(),
                 "state": event_data.get("state"),
@@ -90,153 +96,244 @@ class FileLogger(ActionTrigger):
                 "duration_unsupervised": event_data.get("duration_unsupervised")
             }
 
-            print(f"[LOG] Entry: {json.dumps(log_entry)}")
-
-            async with aiofiles.open(log_file, mode='a') as f:
-                await f.write(json.dumps(log_entry) + "\n")
-
-            print(f"[LOG] ✓ Event logged successfully")
+            # Buffered; the writer's task flushes it to the day's file shortly
+            self.writer.start()
+            self.writer.write(log_entry)
             return True
         except Exception as e:
-            print(f"[LOG] ✗ File logging failed: {e}")
+            logger.error("✗ File logging failed: %s", e)
             return False
 
+    def get_status(self) -> Dict[str, Any]:
+        status = super().get_status()
+        status["writer"] = self.writer.get_stats()
+        return status
+
 
 class VideoRecorder(ActionTrigger):
-    def __init__(self, output_dir: str = "recordings", duration_seconds: int = 30):
+    def __init__(
+        self,
+        output_dir: str = "recordings",
+        duration_seconds: int = 30,
+        preroll_seconds: float = 0,
+        fps: int = 20,
+        catalog=None
+    ):
         super().__init__("video_recorder")
+        self.catalog = catalog
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
         self.duration_seconds = duration_seconds
+        self.preroll_seconds = preroll_seconds
+        self.fps = fps
         self.is_recording = False
         self.recording_task = None
+        # Set when the post-alert window closes, or early by close()
+        self.recording_finished: Optional[asyncio.Event] = None
+        self.last_recording_stats: Optional[Dict[str, Any]] = None
 
     async def _execute(self, event_data: Dict[str, Any]) -> bool:
         if self.is_recording:
-            print("[VIDEO] ⚠ Already recording, skipping new recording request")
+            logger.info("Already recording, skipping new recording request")
             return False
 
-        print(f"[VIDEO] Starting {self.duration_seconds}s video recording")
-        print(f"[VIDEO] Event: dogs={event_data.get('dogs_detected')}, humans={event_data.get('humans_detected')}")
-
         try:
             self.is_recording = True
             camera = event_data.get("camera")
             if not camera:
-                print("[VIDEO] ✗ No camera provided for recording")
+                logger.error("✗ No camera provided for recording")
                 return False
 
+            # Grab the pre-roll now, before it rolls past the moment of the alert
+            alert_time = time.monotonic()
+            preroll = [
+                entry for entry in camera.get_preroll()
+                if entry[0] >= alert_time - self.preroll_seconds
+            ] if self.preroll_seconds > 0 else []
+
             filename = self.output_dir / f"alert_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp4"
-            print(f"[VIDEO] Recording to: {filename}")
+            logger.info("🎥 Recording %ss to %s (%d pre-roll frames)", self.duration_seconds, filename, len(preroll))
 
             self.recording_task = asyncio.create_task(
-                self._record_video(camera, filename, self.duration_seconds)
+                self._record_video(
+                    camera, filename, self.duration_seconds, preroll, alert_time, event_data.get("state")
+                )
             )
-
-            print(f"[VIDEO] ✓ Recording task started")
             return True
         except Exception as e:
-            print(f"[VIDEO] ✗ Video recording failed: {e}")
+            logger.error("✗ Video recording failed: %s", e)
             self.is_recording = False
             return False
 
-    async def _record_video(self, camera, filename: Path, duration: int):
+    async def _record_video(
+        self,
+        camera,
+        filename: Path,
+        duration: int,
+        preroll=None,
+        alert_time: float = None,
+        state: Optional[str] = None
+    ):
         import cv2
 
+        writer = None
+        listener = None
         try:
-            # Try browser-compatible codecs in order of preference
-            fps = 20
+            fps = self.fps
             frame_width = 640
             frame_height = 480
 
-            codecs_to_try = [
-                ('avc1', cv2.VideoWriter_fourcc(*'avc1')),  # H.264 (best browser support)
-                ('H264', cv2.VideoWriter_fourcc(*'H264')),  # H.264 alternative
-                ('XVID', cv2.VideoWriter_fourcc(*'XVID')),  # MPEG-4 Part 2
-                ('mp4v', cv2.VideoWriter_fourcc(*'mp4v')),  # Fallback
-            ]
-
-            out = None
-            used_codec = None
-
-            for codec_name, fourcc in codecs_to_try:
-                print(f"[VIDEO] Trying codec: {codec_name}")
-                test_out = cv2.VideoWriter(str(filename), fourcc, fps, (frame_width, frame_height))
-
-                if test_out.isOpened():
-                    out = test_out
-                    used_codec = codec_name
-                    print(f"[VIDEO] ✓ Using codec: {codec_name}")
-                    break
-                else:
-                    test_out.release()
-                    print(f"[VIDEO] ✗ Codec {codec_name} failed")
-
-            if out is None:
-                print(f"[VIDEO] ✗ All codecs failed")
+            # The codec probe runs once (at startup or on first use) and is cached
+            probe = await vision_pool.run(probe_video_codec, (frame_width, frame_height), fps)
+            used_codec = probe["codec"]
+            if used_codec is None:
+                logger.error("✗ No working video codec")
                 return False
 
-            start_time = datetime.now()
-            frames_written = 0
-
-            while (datetime.now() - start_time).total_seconds() < duration:
-                frame = camera.get_frame_sync()
-                if frame is not None:
-                    resized = cv2.resize(frame, (frame_width, frame_height))
-                    out.write(resized)
-                    frames_written += 1
+            out = await vision_pool.run(
+                cv2.VideoWriter, str(filename), cv2.VideoWriter_fourcc(*used_codec), fps, (frame_width, frame_height)
+            )
+            if not out.isOpened():
+                logger.error("✗ Codec %s failed to open, will re-probe next time", used_codec)
+                out.release()
+                filename.unlink(missing_ok=True)
+                reset_video_codec_probe()
+                return False
 
-                await asyncio.sleep(1.0 / fps)
+            writer = RecordingWriter(out, fps, (frame_width, frame_height))
+            writer.start()
+
+            if preroll:
+                # Pre-roll arrives in one burst, larger than the live queue; wait for
+                # space rather than drop the seconds leading up to the alert
+                await asyncio.get_running_loop().run_in_executor(None, writer.submit_preroll, preroll)
+
+            # Subscribe to the camera's frame stream; every captured frame goes
+            # to the writer thread with its capture timestamp until the
+            # post-alert window closes
+            end_time = (alert_time or time.monotonic()) + duration
+            finished = self.recording_finished = asyncio.Event()
+            loop = asyncio.get_running_loop()
+            poster_pending = self.catalog is not None
+            window_open = True
+
+            def listener(frame, seq, timestamp):
+                nonlocal poster_pending, window_open
+                if timestamp >= end_time:
+                    if window_open:
+                        window_open = False
+                        try:
+                            loop.call_soon_threadsafe(finished.set)
+                        except RuntimeError:
+                            # The loop is gone; the task waiting on it was cancelled with it
+                            pass
+                    return
+                writer.submit(frame, timestamp)
+                if poster_pending:
+                    # The first live frame becomes the poster, straight from memory
+                    poster_pending = False
+                    loop.call_soon_threadsafe(self.catalog.submit_thumbnail, RECORDING, filename.name, frame)
+
+            camera.request_rate("recorder", fps)
+            camera.add_frame_listener(listener)
+
+            # Wall-clock bound in case the camera stalls before end_time
+            try:
+                await asyncio.wait_for(finished.wait(), max(0.0, end_time - time.monotonic()) + 5)
+            except asyncio.TimeoutError:
+                logger.warning("Camera stalled, ending recording %s early", filename.name)
+            camera.remove_frame_listener(listener)
+            listener = None
+
+            stats = await asyncio.get_running_loop().run_in_executor(None, writer.close)
+            writer = None
+            self.last_recording_stats = stats
+
+            logger.info(
+                "✓ Recording completed: %s (%d frames, %.1fs, %.1f fps achieved, %d dropped, codec %s)",
+                filename, stats["frames_written"], stats["duration_seconds"],
+                stats["achieved_fps"], stats["frames_dropped"], used_codec
+            )
 
-            out.release()
-            print(f"[VIDEO] ✓ Recording completed: {filename}")
-            print(f"[VIDEO] Saved {frames_written} frames ({frames_written/fps:.1f}s of video)")
-            print(f"[VIDEO] Codec used: {used_codec}")
+            if self.catalog:
+                await self.catalog.record_recording(filename, duration_seconds=stats["duration_seconds"], state=state)
 
         except Exception as e:
-            print(f"[VIDEO] ✗ Recording error: {e}")
+            logger.exception("✗ Recording error: %s", e)
         finally:
+            if listener is not None:
+                camera.remove_frame_listener(listener)
+            if writer is not None:
+                await asyncio.get_running_loop().run_in_executor(None, writer.close)
+            camera.release_rate("recorder")
+            self.recording_finished = None
             self.is_recording = False
-            print(f"[VIDEO] Recording state reset")
+
+    async def close(self, timeout_seconds: float = 15.0):
+        """End a recording in progress now and wait for it to be written and cataloged."""
+        task = self.recording_task
+        if task is None or task.done():
+            return
+        if self.recording_finished is not None:
+            self.recording_finished.set()
+        done, _ = await asyncio.wait([task], timeout=timeout_seconds)
+        if not done:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    def get_status(self) -> Dict[str, Any]:
+        status = super().get_status()
+        status.update({
+            "is_recording": self.is_recording,
+            "codec": get_video_codec_probe(),
+            "last_recording": self.last_recording_stats
+        })
+        return status
 
 
 class NotificationSender(ActionTrigger):
-    def __init__(self, webhook_url: Optional[str] = None):
+    timeout_seconds = 10.0
+
+    def __init__(self, webhook_url: Optional[str] = None, dispatcher: Optional[WebhookDispatcher] = None):
         super().__init__("notification")
         self.webhook_url = webhook_url
+        self.dispatcher = dispatcher or (WebhookDispatcher(webhook_url.split(",")) if webhook_url else None)
 
     async def _execute(self, event_data: Dict[str, Any]) -> bool:
         try:
-            if self.webhook_url:
-                print(f"[WEBHOOK] Sending notification to webhook")
-                import aiohttp
-                async with aiohttp.ClientSession() as session:
-                    payload = {
-                        "text": f"🚨 Doodie Duty Alert! Dog detected unsupervised for {event_data.get('duration_unsupervised', 0):.1f} seconds",
-                        "timestamp": datetime.now().isoformat(),
-                        "dogs": event_data.get("dogs_detected", 0),
-                        "humans": event_data.get("humans_detected", 0)
-                    }
-                    print(f"[WEBHOOK] Payload: {json.dumps(payload)}")
-                    async with session.post(self.webhook_url, json=payload) as resp:
-                        if resp.status == 200:
-                            print(f"[WEBHOOK] ✓ Notification sent successfully (status={resp.status})")
-                            return True
-                        else:
-                            print(f"[WEBHOOK] ✗ Failed with status {resp.status}")
-                            return False
+            if self.dispatcher:
+                payload = {
+                    "text": f"🚨 Doodie Duty Alert! Dog detected unsupervised for {event_data.get('duration_unsupervised') or 0:.1f} seconds",
+                    "timestamp": datetime.now().isoformat(),
+                    "dogs": event_data.get("dogs_detected", 0),
+                    "humans": event_data.get("humans_detected", 0)
+                }
+                logger.debug("Webhook payload: %s", payload)
+                # Only waits for the outbox write; delivery and retries happen in the dispatcher
+                queued = await self.dispatcher.enqueue(payload)
+                logger.info("✓ Notification queued for %d target(s)", queued)
+                return queued > 0
             else:
-                print("[WEBHOOK] No webhook URL configured, skipping")
+                logger.debug("No webhook URL configured, skipping")
                 return False
 
         except Exception as e:
-            print(f"[WEBHOOK] ✗ Notification failed: {e}")
+            logger.error("✗ Notification failed: %s", e)
             return False
 
+    def get_status(self) -> Dict[str, Any]:
+        status = super().get_status()
+        if self.dispatcher:
+            status["delivery"] = self.dispatcher.get_stats()
+        return status
+
 
 class ImageCapture(ActionTrigger):
-    def __init__(self, output_dir: str = "captures"):
+    timeout_seconds = 10.0
+
+    def __init__(self, output_dir: str = "captures", catalog=None):
         super().__init__("image_capture")
+        self.catalog = catalog
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
 
@@ -244,34 +341,32 @@ class ImageCapture(ActionTrigger):
         try:
             camera = event_data.get("camera")
             if not camera:
-                print("[IMAGE] ✗ No camera provided for image capture")
+                logger.error("✗ No camera provided for image capture")
                 return False
 
             # Get current frame
-            frame = camera.get_frame_sync()
+            seq, frame = camera.get_frame_with_seq_sync()
             if frame is None:
-                print("[IMAGE] ✗ Failed to get frame from camera")
+                logger.error("✗ Failed to get frame from camera")
                 return False
 
-            # Add detection annotations if detector available
-            detector = event_data.get("detector")
-            if detector:
-                is_unsupervised, dogs, humans = detector.is_dog_unsupervised(frame)
-                all_detections = dogs + humans
-                frame = detector.draw_detections(frame, all_detections)
-
             # Generate filename with timestamp and state
             timestamp = datetime.now()
             state = event_data.get("state", "unknown")
             filename = f"capture_{timestamp.strftime('%Y%m%d_%H%M%S')}_{state}.jpg"
             filepath = self.output_dir / filename
 
-            print(f"[IMAGE] Capturing image: {filename}")
-            print(f"[IMAGE] Event: dogs={event_data.get('dogs_detected')}, humans={event_data.get('humans_detected')}, state={state}")
-
-            # Save image with high quality
-            success = cv2.imwrite(str(filepath), frame, [cv2.IMWRITE_JPEG_QUALITY, 95])
+            # Annotate and save on the vision pool, off the event loop
+            annotated = await vision_pool.run(
+                self._annotate_and_save,
+                frame,
+                seq,
+                event_data.get("detector"),
+                event_data.get("detection_cache"),
+                filepath
+            )
 
+            success = annotated is not None
             if success:
                 # Store image info in event data for later reference
                 event_data["captured_image"] = {
@@ -281,22 +376,50 @@ class ImageCapture(ActionTrigger):
                     "state": state
                 }
 
-                print(f"[IMAGE] ✓ Image captured successfully: {filepath}")
+                logger.info("📸 Image captured: %s", filepath)
+                if self.catalog:
+                    self.catalog.submit_thumbnail(CAPTURE, filename, annotated)
+                    await self.catalog.record_capture(filepath, state=state, created_at=timestamp.replace(microsecond=0))
                 return True
             else:
-                print(f"[IMAGE] ✗ Failed to save image: {filepath}")
+                logger.error("✗ Failed to save image: %s", filepath)
                 return False
 
         except Exception as e:
-            print(f"[IMAGE] ✗ Image capture failed: {e}")
+            logger.exception("✗ Image capture failed: %s", e)
             return False
 
+    def _annotate_and_save(self, frame, seq: int, detector, detection_cache, filepath: Path):
+        """Annotate and write the capture; returns the annotated frame, or None if the write failed."""
+        # Add detection annotations if detector available, reusing the
+        # supervisor's result for this frame when it has one
+        if detector:
+            if detection_cache:
+                result = detection_cache.get_or_detect(seq, frame)
+            else:
+                result = detector.classify(frame)
+            frame = detector.draw_detections(frame, result.detections)
+
+        # Save image with high quality
+        if not cv2.imwrite(str(filepath), frame, [cv2.IMWRITE_JPEG_QUALITY, 95]):
+            return None
+        return frame
+
 
 class ActionManager:
+    """Runs the configured actions for each event.
+
+    Actions run concurrently, each under its own timeout, so a slow webhook
+    or sound player can't hold up image capture or the event's database
+    write. A failure or timeout only affects the action it happened in.
+    """
+
     def __init__(self):
         self.actions: Dict[str, ActionTrigger] = {}
         self.cooldown_seconds = 60
         self.last_trigger_time = {}
+        self.in_flight = set()
+        self.pending = set()
 
     def add_action(self, action: ActionTrigger):
         self.actions[action.name] = action
@@ -313,50 +436,108 @@ class ActionManager:
         if name in self.actions:
             self.actions[name].enabled = False
 
-    async def trigger_actions(self, event_data: Dict[str, Any]):
+    async def trigger_actions(self, event_data: Dict[str, Any], wait_for: Iterable[str] = ()) -> Dict[str, bool]:
+        """Dispatch every eligible action and return once the ones named in wait_for are done.
+
+        The other actions keep running in the background. Returns the results
+        of the actions that have finished by then.
+        """
         current_time = datetime.now()
-        print(f"\n[ACTIONS] ========== TRIGGERING ACTIONS ==========")
-        print(f"[ACTIONS] Time: {current_time.strftime('%H:%M:%S')}")
-        print(f"[ACTIONS] State: {event_data.get('state')}")
-        print(f"[ACTIONS] Dogs: {event_data.get('dogs_detected')}, Humans: {event_data.get('humans_detected')}")
-        print(f"[ACTIONS] Duration unsupervised: {event_data.get('duration_unsupervised')}s")
-        print(f"[ACTIONS] Active actions: {', '.join(self.actions.keys())}")
-
-        triggered_count = 0
+        logger.debug(
+            "Triggering actions for %s event (dogs=%s, humans=%s, unsupervised=%ss)",
+            event_data.get("state"), event_data.get("dogs_detected"),
+            event_data.get("humans_detected"), event_data.get("duration_unsupervised")
+        )
+
+        runs: Dict[str, asyncio.Task] = {}
         for name, action in self.actions.items():
             if not action.enabled:
-                print(f"[ACTIONS] {name}: disabled")
+                logger.debug("%s: disabled", name)
+                continue
+
+            if name in self.in_flight:
+                logger.info("%s: still running from a previous event", name)
                 continue
 
             if name in self.last_trigger_time:
                 time_since_last = (current_time - self.last_trigger_time[name]).total_seconds()
                 if time_since_last < self.cooldown_seconds:
-                    print(f"[ACTIONS] {name}: on cooldown ({self.cooldown_seconds - time_since_last:.0f}s remaining)")
+                    logger.debug("%s: on cooldown (%.0fs remaining)", name, self.cooldown_seconds - time_since_last)
                     continue
 
+            self.in_flight.add(name)
+            runs[name] = self._track(self._run_action(action, event_data, current_time))
+
+        self._track(self._report(runs))
+
+        waiting = [runs[name] for name in wait_for if name in runs]
+        if waiting:
+            await asyncio.wait(waiting)
+        return {name: task.result() for name, task in runs.items() if task.done()}
+
+    def _track(self, coro) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self.pending.add(task)
+        task.add_done_callback(self.pending.discard)
+        return task
+
+    async def _run_action(self, action: ActionTrigger, event_data: Dict[str, Any], current_time: datetime) -> bool:
+        name = action.name
+        try:
+            logger.debug("Executing %s", name)
+            started = time.perf_counter()
             try:
-                print(f"[ACTIONS] Executing {name}...")
-                success = await action.trigger(event_data)
-                if success:
-                    self.last_trigger_time[name] = current_time
-                    print(f"[ACTIONS] {name}: ✓ SUCCESS")
-                    triggered_count += 1
-                else:
-                    print(f"[ACTIONS] {name}: ✗ FAILED")
+                success = await asyncio.wait_for(action.trigger(event_data), action.timeout_seconds)
+            except asyncio.TimeoutError:
+                action.timeouts += 1
+                logger.warning("%s: ✗ timed out after %gs", name, action.timeout_seconds)
+                success = False
             except Exception as e:
-                print(f"[ACTIONS] {name}: ✗ EXCEPTION - {e}")
-
-        print(f"[ACTIONS] Triggered {triggered_count}/{len(self.actions)} actions")
-        print(f"[ACTIONS] ========================================\n")
+                logger.exception("%s: ✗ raised %s", name, e)
+                success = False
+            action.latency.observe((time.perf_counter() - started) * 1000)
+        finally:
+            self.in_flight.discard(name)
+
+        if success:
+            self.last_trigger_time[name] = current_time
+            logger.debug("%s: ✓ success", name)
+        else:
+            action.failures += 1
+            logger.warning("%s: ✗ failed", name)
+        return success
+
+    async def _report(self, runs: Dict[str, asyncio.Task]):
+        if runs:
+            await asyncio.wait(runs.values())
+        triggered_count = sum(1 for task in runs.values() if not task.cancelled() and task.result())
+        logger.info("Triggered %d/%d actions", triggered_count, len(self.actions))
+
+    async def close(self, timeout_seconds: float = 5.0):
+        """Give running actions a moment to finish, cancel what's left, then close each action.
+
+        Actions that keep working after their run (a recording in progress) are
+        finished off here, before the caller closes the database they write to.
+        """
+        if self.pending:
+            _, still_running = await asyncio.wait(list(self.pending), timeout=timeout_seconds)
+            for task in still_running:
+                task.cancel()
+            if still_running:
+                await asyncio.gather(*still_running, return_exceptions=True)
+
+        for action in self.actions.values():
+            try:
+                await action.close()
+            except Exception as e:
+                logger.exception("%s: ✗ close failed: %s", action.name, e)
 
     def get_status(self) -> Dict[str, Any]:
         return {
             "actions": {
-                name: {
-                    "enabled": action.enabled,
-                    "last_triggered": action.last_triggered.isoformat() if action.last_triggered else None
-                }
+                name: action.get_status()
                 for name, action in self.actions.items()
             },
+            "running": sorted(self.in_flight),
             "cooldown_seconds": self.cooldown_seconds
-        }
\ No newline at end of file
+        }
@@ -0,0 +1,198 @@
+import asyncio
+import logging
+import platform
+import time
+import wave
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_SOUND_FILE = Path(__file__).resolve().parent.parent / "no_no.wav"
+DEFAULT_TTS_TEXT = "Alert! Dog detected unsupervised"
+
+
+@dataclass
+class AudioClip:
+    path: Path
+    data: Optional[bytes]  # Whole WAV file, when it can be fed to the player from memory
+    duration_seconds: float
+
+
+def load_clip(path: Path) -> AudioClip:
+    """Read a sound file once. WAVs are validated and kept in memory."""
+    path = Path(path)
+    if path.suffix.lower() != ".wav":
+        # Only WAV can be streamed from memory; other formats are played from disk
+        return AudioClip(path, None, 0.0)
+
+    data = path.read_bytes()
+    with wave.open(str(path), "rb") as clip:
+        duration = clip.getnframes() / float(clip.getframerate() or 1)
+    return AudioClip(path, data, duration)
+
+
+class AudioPlayer:
+    """Plays alert sounds without ever blocking the event loop.
+
+    The clip is read once at startup. On Linux the in-memory WAV is piped to
+    aplay's stdin, so an alert never touches the disk. On macOS afplay
+    needs a path, and on Windows winsound plays the WAV from memory on a
+    worker thread. Play requests go through a bounded queue: up to
+    max_concurrent clips overlap, more wait their turn, and requests beyond
+    the queue are dropped instead of piling up.
+    """
+
+    def __init__(
+        self,
+        sound_file: Optional[str] = None,
+        max_concurrent: int = 2,
+        queue_size: int = 4,
+        tts_text: str = DEFAULT_TTS_TEXT
+    ):
+        self.system = platform.system()
+        self.tts_text = tts_text
+        self.max_concurrent = max(1, max_concurrent)
+        self.queue_size = queue_size
+        self.clip: Optional[AudioClip] = None
+
+        path = Path(sound_file) if sound_file else DEFAULT_SOUND_FILE
+        if path.exists():
+            try:
+                self.clip = load_clip(path)
+                logger.info("Loaded %s (%.1fs)", path.name, self.clip.duration_seconds)
+            except (OSError, wave.Error, EOFError) as e:
+                logger.warning("✗ Could not load %s: %s, falling back to speech", path, e)
+        elif sound_file:
+            logger.warning("✗ Sound file %s not found, falling back to speech", sound_file)
+
+        self.queue: Optional[asyncio.Queue] = None
+        self.task: Optional[asyncio.Task] = None
+        self.playing: set = set()
+        self.slots: Optional[asyncio.Semaphore] = None
+
+        self.played = 0
+        self.dropped = 0
+        self.failed = 0
+        self.last_latency_ms: Optional[float] = None
+
+    def start(self):
+        if self.queue is None:
+            self.queue = asyncio.Queue(maxsize=self.queue_size)
+            self.slots = asyncio.Semaphore(self.max_concurrent)
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        for task in list(self.playing):
+            task.cancel()
+        if self.playing:
+            await asyncio.gather(*self.playing, return_exceptions=True)
+
+    def play(self) -> bool:
+        """Queue one playback. Returns False if the queue is full."""
+        if self.queue is None or self.task is None:
+            self.start()
+        try:
+            self.queue.put_nowait(time.perf_counter())
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning("Playback queue full, dropping alert sound")
+            return False
+
+    async def _run(self):
+        while True:
+            queued_at = await self.queue.get()
+            await self.slots.acquire()
+            task = asyncio.create_task(self._play(queued_at))
+            self.playing.add(task)
+            task.add_done_callback(self._finished)
+
+    def _finished(self, task: asyncio.Task):
+        self.playing.discard(task)
+        self.slots.release()
+
+    async def _play(self, queued_at: float):
+        self.last_latency_ms = round((time.perf_counter() - queued_at) * 1000, 1)
+        try:
+            if self.system == "Windows":
+                await asyncio.get_running_loop().run_in_executor(None, self._play_windows)
+            else:
+                command, data = self._command()
+                await self._run_process(command, data)
+            self.played += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.failed += 1
+            logger.error("✗ Playback failed: %s", e)
+
+    def _command(self):
+        """(argv, stdin bytes) for the platform's player."""
+        if self.system == "Darwin":
+            if self.clip:
+                return ["afplay", str(self.clip.path)], None
+            return ["say", self.tts_text], None
+        if self.clip and self.clip.data is not None:
+            return ["aplay", "-q", "-"], self.clip.data
+        if self.clip:
+            return ["aplay", "-q", str(self.clip.path)], None
+        return ["espeak", self.tts_text], None
+
+    async def _run_process(self, command: List[str], data: Optional[bytes]):
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdin=asyncio.subprocess.PIPE if data is not None else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        # Generous bound so a wedged audio device can't hold a slot forever
+        limit = (self.clip.duration_seconds if self.clip else 0) + 10
+        try:
+            if data is not None:
+                try:
+                    process.stdin.write(data)
+                    await process.stdin.drain()
+                    process.stdin.close()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+            returncode = await asyncio.wait_for(process.wait(), limit)
+        except BaseException:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            raise
+        if returncode != 0:
+            raise RuntimeError(f"{command[0]} exited with status {returncode}")
+
+    def _play_windows(self):
+        import winsound
+        if self.clip and self.clip.data is not None:
+            winsound.PlaySound(self.clip.data, winsound.SND_MEMORY)
+        elif self.clip:
+            winsound.PlaySound(str(self.clip.path), winsound.SND_FILENAME)
+        else:
+            winsound.Beep(1000, 1000)
+
+    def get_stats(self) -> dict:
+        return {
+            "clip": self.clip.path.name if self.clip else None,
+            "in_memory": bool(self.clip and self.clip.data is not None),
+            "playing": len(self.playing),
+            "queued": self.queue.qsize() if self.queue else 0,
+            "played": self.played,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "last_latency_ms": self.last_latency_ms
+        }
@@ -0,0 +1,70 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Iterator, Optional
+
+
+class BlobStore:
+    """Content-addressed files on disk.
+
+    Each blob is stored once under its SHA-256 digest, fanned out into
+    two-character subdirectories so no single directory grows huge. Writes go
+    through a temp file and an atomic rename, so a crash never leaves a
+    partial blob under a valid digest.
+    """
+
+    def __init__(self, root: str = "snapshots", extension: str = ".jpg"):
+        self.root = Path(root)
+        self.extension = extension
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def digest(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def path_for(self, digest: str) -> Path:
+        return self.root / digest[:2] / f"{digest}{self.extension}"
+
+    def put(self, data: bytes) -> str:
+        digest = self.digest(data)
+        path = self.path_for(digest)
+        if path.exists():
+            # Refresh mtime so orphan pruning treats a reused blob as new
+            try:
+                os.utime(path)
+                return digest
+            except FileNotFoundError:
+                pass
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp_")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return digest
+
+    def get(self, digest: str) -> Optional[bytes]:
+        try:
+            return self.path_for(digest).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def exists(self, digest: str) -> bool:
+        return self.path_for(digest).exists()
+
+    def delete(self, digest: str) -> bool:
+        try:
+            self.path_for(digest).unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
+    def iter_digests(self) -> Iterator[str]:
+        for path in self.root.glob(f"??/*{self.extension}"):
+            yield path.name[:-len(self.extension)] if self.extension else path.name
@@ -1,23 +1,189 @@
 import cv2
 import asyncio
+import logging
 import threading
 import time
-from typing import Optional, Callable
+import sys
+from collections import deque
+from typing import Optional, Callable, Tuple, Dict, List
 import numpy as np
-from queue import Queue, Empty
+
+
+logger = logging.getLogger(__name__)
+
+
+class FrameRing:
+    """Small ring of preallocated frame buffers published as read-only views.
+
+    Consumers hold references to the published views instead of copies. Every
+    numpy view keeps its owning buffer alive through ``.base``, so a buffer's
+    Python reference count tells us whether any consumer still holds it; only
+    unreferenced buffers are handed back to the camera for the next read.
+    """
+
+    # References held by the ring list, the loop variable and getrefcount itself
+    _UNREFERENCED = 3
+
+    def __init__(self, size: int = 4):
+        self.size = max(2, size)
+        self.buffers: List[np.ndarray] = []
+        self.next_index = 0
+        self.reused = 0
+        self.allocated = 0
+        self.exhausted = 0
+
+    def acquire(self) -> Optional[np.ndarray]:
+        """Return a buffer nobody references, or None if a fresh one is needed."""
+        count = len(self.buffers)
+        for offset in range(count):
+            index = (self.next_index + offset) % count
+            buffer = self.buffers[index]
+            if sys.getrefcount(buffer) <= self._UNREFERENCED:
+                self.next_index = (index + 1) % count
+                self.reused += 1
+                return buffer
+
+        if count >= self.size:
+            self.exhausted += 1
+        return None
+
+    def adopt(self, frame: np.ndarray):
+        """Take ownership of a frame the camera allocated itself."""
+        if any(frame is buffer for buffer in self.buffers):
+            return
+
+        self.allocated += 1
+        if len(self.buffers) < self.size:
+            self.buffers.append(frame)
+        else:
+            # Every slot is still referenced; the displaced buffer lives on
+            # with its holders and is simply no longer recycled
+            self.buffers[self.next_index] = frame
+            self.next_index = (self.next_index + 1) % len(self.buffers)
+
+    @staticmethod
+    def publish(frame: np.ndarray) -> np.ndarray:
+        view = frame.view()
+        view.flags.writeable = False
+        return view
+
+    def get_stats(self) -> dict:
+        return {
+            "size": self.size,
+            "reused": self.reused,
+            "allocated": self.allocated,
+            "exhausted": self.exhausted
+        }
+
+
+class PreRollBuffer:
+    """Bounded buffer of the last few seconds of frames, kept for alert recordings.
+
+    Frames are sampled at a fixed rate, downscaled to the recording size and
+    held as JPEG bytes, so memory stays at roughly seconds * fps * ~40 KB
+    regardless of the camera resolution. The cost is paid whether or not
+    anything is recorded: the camera is held at fps and every sampled frame
+    is encoded, which get_stats() reports as encode time per second.
+    """
+
+    def __init__(
+        self,
+        seconds: float = 5.0,
+        fps: float = 10.0,
+        frame_size: Tuple[int, int] = (640, 480),
+        jpeg_quality: int = 80
+    ):
+        self.seconds = seconds
+        self.fps = fps
+        self.frame_size = frame_size
+        self.jpeg_quality = jpeg_quality
+        self.frames: deque = deque()
+        self.total_bytes = 0
+        self.last_sample_time = 0.0
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.frames_encoded = 0
+        self.encode_seconds = 0.0
+
+    def add(self, frame: np.ndarray, seq: int, timestamp: float):
+        # Small tolerance so capture jitter at exactly the sampling rate
+        # doesn't skip every other frame
+        if timestamp - self.last_sample_time < 0.9 / self.fps:
+            return
+        self.last_sample_time = timestamp
+
+        started = time.perf_counter()
+        if (frame.shape[1], frame.shape[0]) != self.frame_size:
+            frame = cv2.resize(frame, self.frame_size)
+        ok, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+        if not ok:
+            return
+        data = buffer.tobytes()
+
+        with self.lock:
+            self.frames_encoded += 1
+            self.encode_seconds += time.perf_counter() - started
+            self.frames.append((timestamp, seq, data))
+            self.total_bytes += len(data)
+            while self.frames and self.frames[0][0] < timestamp - self.seconds:
+                self.total_bytes -= len(self.frames.popleft()[2])
+
+    def snapshot(self) -> List[Tuple[float, int, bytes]]:
+        """Return the buffered (timestamp, seq, jpeg) tuples, oldest first."""
+        with self.lock:
+            return list(self.frames)
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            buffered_seconds = self.frames[-1][0] - self.frames[0][0] if len(self.frames) > 1 else 0.0
+            elapsed = max(time.monotonic() - self.started, 1e-6)
+            return {
+                "seconds": self.seconds,
+                "fps": self.fps,
+                "frames": len(self.frames),
+                "bytes": self.total_bytes,
+                "buffered_seconds": round(buffered_seconds, 2),
+                "frames_encoded": self.frames_encoded,
+                "avg_encode_ms": round(self.encode_seconds / self.frames_encoded * 1000, 2) if self.frames_encoded else 0.0,
+                # Share of one core spent encoding pre-roll, recording or not
+                "encode_ms_per_second": round(self.encode_seconds / elapsed * 1000, 1)
+            }
 
 
 class CameraCapture:
-    def __init__(self, camera_index: int = 0, fps_limit: int = 30):
+    def __init__(
+        self,
+        camera_index: int = 0,
+        fps_limit: int = 30,
+        idle_fps: float = 1.0,
+        frame_buffers: int = 4
+    ):
         self.camera_index = camera_index
         self.fps_limit = fps_limit
+        self.idle_fps = idle_fps
         self.cap: Optional[cv2.VideoCapture] = None
         self.is_running = False
-        self.frame_queue = Queue(maxsize=2)
         self.capture_thread: Optional[threading.Thread] = None
+        self.frame_ring = FrameRing(frame_buffers)
         self.current_frame: Optional[np.ndarray] = None
+        self.frame_seq = 0
+        self.last_nowait_seq = 0
         self.frame_lock = threading.Lock()
         self.frame_callbacks: list[Callable] = []
+        self.frame_listeners: list[Callable] = []
+        self.preroll: Optional[PreRollBuffer] = None
+
+        # Consumers declare how many frames per second they need; the capture
+        # loop reads at the highest declared rate (capped at fps_limit)
+        self.rate_demands: Dict[str, float] = {}
+        self.wake_event = threading.Event()
+
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self.read_failures = 0
+        self.read_latency_ms = 0.0
+        self.max_read_latency_ms = 0.0
+        self.capture_times: deque = deque(maxlen=64)
 
     def start(self) -> bool:
         if self.is_running:
@@ -25,7 +191,7 @@ class CameraCapture:
 
         self.cap = cv2.VideoCapture(self.camera_index)
         if not self.cap.isOpened():
-            print(f"Failed to open camera {self.camera_index}")
+            logger.error("Failed to open camera %s", self.camera_index)
             return False
 
         self.cap.set(cv2.CAP_PROP_FPS, self.fps_limit)
@@ -36,61 +202,180 @@ class CameraCapture:
         self.capture_thread.daemon = True
         self.capture_thread.start()
 
-        print(f"Camera {self.camera_index} started successfully")
+        logger.info("Camera %s started successfully", self.camera_index)
         return True
 
     def stop(self):
         self.is_running = False
+        self.wake_event.set()
         if self.capture_thread:
             self.capture_thread.join(timeout=2)
         if self.cap:
             self.cap.release()
-        print(f"Camera {self.camera_index} stopped")
+        logger.info("Camera %s stopped", self.camera_index)
+
+    def request_rate(self, consumer: str, fps: float):
+        """Declare that consumer needs frames at fps until release_rate is called."""
+        self.rate_demands[consumer] = fps
+        self.wake_event.set()
+
+    def release_rate(self, consumer: str):
+        if self.rate_demands.pop(consumer, None) is not None:
+            self.wake_event.set()
+
+    def get_target_fps(self) -> float:
+        demands = list(self.rate_demands.values())
+        if not demands:
+            return min(self.idle_fps, self.fps_limit)
+        return max(0.1, min(max(demands), self.fps_limit))
 
     def _capture_loop(self):
-        frame_interval = 1.0 / self.fps_limit
-        last_frame_time = 0
+        last_deadline = None
+        rate_changed = False
 
         while self.is_running:
-            current_time = time.time()
-            if current_time - last_frame_time < frame_interval:
-                time.sleep(0.001)
+            frame_interval = 1.0 / self.get_target_fps()
+            now = time.monotonic()
+            deadline = now if last_deadline is None else last_deadline + frame_interval
+
+            # Sleep until the next deadline; a demand change or stop() wakes
+            # us early so the new rate is picked up immediately
+            delay = deadline - now
+            if delay > 0:
+                if self.wake_event.wait(delay):
+                    self.wake_event.clear()
+                    rate_changed = True
                 continue
 
-            ret, frame = self.cap.read()
+            behind = now - deadline
+            if behind > frame_interval:
+                # Whole frame slots went by without a read; after a rate
+                # change that is expected and not counted as dropped
+                if not rate_changed:
+                    self.frames_dropped += int(behind // frame_interval)
+                deadline = now
+            last_deadline = deadline
+            rate_changed = False
+
+            # Below the camera's native rate the driver buffer holds a stale
+            # frame; grab() discards it without decoding
+            if frame_interval > 2.0 / self.fps_limit:
+                self.cap.grab()
+
+            buffer = self.frame_ring.acquire()
+            read_started = time.monotonic()
+            if buffer is not None:
+                ret, frame = self.cap.read(buffer)
+            else:
+                ret, frame = self.cap.read()
+            read_latency_ms = (time.monotonic() - read_started) * 1000
+            del buffer
+
             if not ret:
-                print("Failed to read frame")
-                time.sleep(0.1)
+                logger.warning("Failed to read frame")
+                self.read_failures += 1
+                self.wake_event.wait(0.1)
                 continue
 
+            self.frames_captured += 1
+            self.capture_times.append(read_started)
+            self.read_latency_ms = 0.9 * self.read_latency_ms + 0.1 * read_latency_ms
+            self.max_read_latency_ms = max(self.max_read_latency_ms, read_latency_ms)
+
+            self.frame_ring.adopt(frame)
+            frame = FrameRing.publish(frame)
+
             with self.frame_lock:
                 self.current_frame = frame
+                self.frame_seq += 1
+                seq = self.frame_seq
 
-            if not self.frame_queue.full():
+            for callback in self.frame_callbacks:
                 try:
-                    self.frame_queue.put_nowait(frame)
-                except:
-                    pass
+                    callback(frame)
+                except Exception as e:
+                    logger.exception("Frame callback error: %s", e)
 
-            for callback in self.frame_callbacks:
+            for listener in self.frame_listeners:
                 try:
-                    callback(frame.copy())
+                    listener(frame, seq, read_started)
                 except Exception as e:
-                    print(f"Frame callback error: {e}")
+                    logger.exception("Frame listener error: %s", e)
+            del frame
 
-            last_frame_time = current_time
+    def get_capture_stats(self) -> dict:
+        # Measure over the last couple of seconds so rate changes show up quickly
+        horizon = time.monotonic() - 2.0
+        times = [t for t in self.capture_times if t >= horizon]
+        measured_fps = 0.0
+        if len(times) >= 2 and times[-1] > times[0]:
+            measured_fps = (len(times) - 1) / (times[-1] - times[0])
+
+        return {
+            "target_fps": round(self.get_target_fps(), 2),
+            "measured_fps": round(measured_fps, 2),
+            "frames_captured": self.frames_captured,
+            "frames_dropped": self.frames_dropped,
+            "read_failures": self.read_failures,
+            "read_latency_ms": round(self.read_latency_ms, 2),
+            "max_read_latency_ms": round(self.max_read_latency_ms, 2),
+            "demands": dict(self.rate_demands),
+            "frame_ring": self.frame_ring.get_stats(),
+            "preroll": self.preroll.get_stats() if self.preroll else None
+        }
 
-    def get_frame(self) -> Optional[np.ndarray]:
+    def get_frame(self, writable: bool = False) -> Optional[np.ndarray]:
+        """Return the latest frame as a shared read-only view.
+
+        Pass writable=True only when the caller needs to modify the frame in
+        place; that is the one case where a copy is made.
+        """
         with self.frame_lock:
-            if self.current_frame is not None:
-                return self.current_frame.copy()
-        return None
+            frame = self.current_frame
+        if frame is not None and writable:
+            return frame.copy()
+        return frame
+
+    def get_frame_with_seq(self) -> Tuple[int, Optional[np.ndarray]]:
+        """Return the latest frame (read-only view) together with its monotonically increasing sequence number."""
+        with self.frame_lock:
+            return self.frame_seq, self.current_frame
 
     def get_frame_nowait(self) -> Optional[np.ndarray]:
-        try:
-            return self.frame_queue.get_nowait()
-        except Empty:
-            return None
+        """Return the latest frame if it has not been returned by this method before."""
+        with self.frame_lock:
+            if self.current_frame is None or self.frame_seq == self.last_nowait_seq:
+                return None
+            self.last_nowait_seq = self.frame_seq
+            return self.current_frame
+
+    def add_frame_listener(self, listener: Callable):
+        """Register listener(frame, seq, timestamp), called on the capture thread for every frame.
+
+        timestamp is the time.monotonic() at which the frame was read. Listeners
+        must be quick and must not modify the frame.
+        """
+        self.frame_listeners.append(listener)
+
+    def remove_frame_listener(self, listener: Callable):
+        if listener in self.frame_listeners:
+            self.frame_listeners.remove(listener)
+
+    def enable_preroll(
+        self,
+        seconds: float,
+        fps: float = 10.0,
+        frame_size: Tuple[int, int] = (640, 480)
+    ):
+        """Keep the last seconds of frames in memory so recordings can start before the alert."""
+        if self.preroll is not None:
+            self.remove_frame_listener(self.preroll.add)
+        self.preroll = PreRollBuffer(seconds, fps, frame_size)
+        self.add_frame_listener(self.preroll.add)
+        self.request_rate("preroll", fps)
+
+    def get_preroll(self) -> List[Tuple[float, int, bytes]]:
+        return self.preroll.snapshot() if self.preroll else []
 
     def add_frame_callback(self, callback: Callable):
         self.frame_callbacks.append(callback)
@@ -119,8 +404,14 @@ class CameraCapture:
 
 
 class AsyncCameraCapture:
-    def __init__(self, camera_index: int = 0, fps_limit: int = 30):
-        self.sync_capture = CameraCapture(camera_index, fps_limit)
+    def __init__(
+        self,
+        camera_index: int = 0,
+        fps_limit: int = 30,
+        idle_fps: float = 1.0,
+        frame_buffers: int = 4
+    ):
+        self.sync_capture = CameraCapture(camera_index, fps_limit, idle_fps, frame_buffers)
         self.frame_available = asyncio.Event()
 
     async def start(self) -> bool:
@@ -133,17 +424,44 @@ class AsyncCameraCapture:
             None, self.sync_capture.stop
         )
 
-    async def get_frame(self) -> Optional[np.ndarray]:
-        return await asyncio.get_event_loop().run_in_executor(
-            None, self.sync_capture.get_frame
-        )
+    # Frames are shared by reference, so fetching one is just a lock and
+    # needs no executor hop
+    async def get_frame(self, writable: bool = False) -> Optional[np.ndarray]:
+        return self.sync_capture.get_frame(writable)
+
+    async def get_frame_with_seq(self) -> Tuple[int, Optional[np.ndarray]]:
+        return self.sync_capture.get_frame_with_seq()
 
-    def get_frame_sync(self) -> Optional[np.ndarray]:
-        return self.sync_capture.get_frame()
+    def get_frame_sync(self, writable: bool = False) -> Optional[np.ndarray]:
+        return self.sync_capture.get_frame(writable)
+
+    def get_frame_with_seq_sync(self) -> Tuple[int, Optional[np.ndarray]]:
+        return self.sync_capture.get_frame_with_seq()
 
     def get_camera_info(self) -> dict:
         return self.sync_capture.get_camera_info()
 
+    def request_rate(self, consumer: str, fps: float):
+        self.sync_capture.request_rate(consumer, fps)
+
+    def release_rate(self, consumer: str):
+        self.sync_capture.release_rate(consumer)
+
+    def get_capture_stats(self) -> dict:
+        return self.sync_capture.get_capture_stats()
+
+    def add_frame_listener(self, listener: Callable):
+        self.sync_capture.add_frame_listener(listener)
+
+    def remove_frame_listener(self, listener: Callable):
+        self.sync_capture.remove_frame_listener(listener)
+
+    def enable_preroll(self, seconds: float, fps: float = 10.0, frame_size: Tuple[int, int] = (640, 480)):
+        self.sync_capture.enable_preroll(seconds, fps, frame_size)
+
+    def get_preroll(self) -> List[Tuple[float, int, bytes]]:
+        return self.sync_capture.get_preroll()
+
     async def __aenter__(self):
         await self.start()
         return self
@@ -8,6 +8,8 @@ class Settings(BaseSettings):
     # Camera settings
     camera_index: int = Field(0, description="Camera device index")
     camera_fps: int = Field(30, description="Camera FPS limit")
+    camera_idle_fps: float = Field(1.0, description="Capture rate when no consumer needs frames")
+    camera_frame_buffers: int = Field(4, description="Preallocated frame buffers shared with consumers")
 
     # Detection settings
     model_name: str = Field("yolov8n.pt", description="YOLO model to use")
@@ -17,23 +19,64 @@ class Settings(BaseSettings):
     alert_delay_seconds: int = Field(5, description="Seconds before triggering alert")
     check_interval_seconds: float = Field(0.5, description="Detection check interval")
 
+    # Worker settings
+    vision_workers: int = Field(2, description="Threads dedicated to detection, drawing and encoding")
+
     # Web server settings
     host: str = Field("0.0.0.0", description="Web server host")
     port: int = Field(8000, description="Web server port")
+    stream_max_fps: float = Field(10, description="Maximum FPS for live video viewers (websocket and MJPEG)")
+    stream_jpeg_quality: int = Field(80, description="JPEG quality for live video frames")
 
     # Database settings
     database_url: str = Field("sqlite+aiosqlite:///doodie_duty.db", description="Database URL")
-    cleanup_days: int = Field(30, description="Days to keep events in database")
+    cleanup_days: int = Field(30, description="Days to keep events, captures and recordings")
+    max_disk_usage_mb: int = Field(0, description="Size quota for captures, recordings and snapshots (0 = no quota)")
+    retention_interval_minutes: float = Field(60, description="Minutes between background retention passes")
+    retention_batch_size: int = Field(500, description="Events deleted per retention transaction")
+    orphan_grace_minutes: float = Field(60, description="Age before unreferenced files are pruned")
+    snapshot_directory: str = Field("snapshots", description="Directory for event snapshot blobs")
+    db_batch_max_rows: int = Field(50, description="Most events committed in one transaction")
+    db_batch_max_delay_ms: float = Field(100, description="Longest an event waits for its batch to commit")
+    db_queue_size: int = Field(1000, description="Events buffered before log_event applies backpressure")
+    sqlite_journal_mode: str = Field("WAL", description="SQLite journal mode (WAL, DELETE, ...)")
+    sqlite_synchronous: str = Field("NORMAL", description="SQLite synchronous level (OFF, NORMAL, FULL, EXTRA)")
+    sqlite_mmap_size: int = Field(64 * 1024 * 1024, description="Bytes of the database file memory-mapped for reads")
+    sqlite_cache_size_kb: int = Field(8192, description="SQLite page cache per connection, in KiB")
+    sqlite_busy_timeout_ms: int = Field(5000, description="How long a connection waits on a locked database")
+    sqlite_temp_store: str = Field("MEMORY", description="Where SQLite keeps temporary tables and indices")
+    sqlite_pool_size: int = Field(4, description="Pooled SQLite connections")
 
     # Action settings
     enable_sound_alert: bool = Field(True, description="Enable sound alerts")
-    sound_file: Optional[str] = Field(None, description="Custom sound file path")
+    sound_file: Optional[str] = Field(None, description="Custom alert sound (WAV plays from memory; defaults to no_no.wav)")
     enable_file_logging: bool = Field(True, description="Enable file logging")
     log_directory: str = Field("logs", description="Log directory path")
+    log_level: str = Field("INFO", description="Application log level (DEBUG, INFO, WARNING, ERROR)")
+    log_module_levels: str = Field("", description="Per-module levels, e.g. supervisor=DEBUG,web_app=WARNING")
+    log_json: bool = Field(False, description="Also write the application log as JSON lines (logs/app_YYYYMMDD.log)")
+    log_flush_interval_seconds: float = Field(1.0, description="Longest a log record waits in memory before it is written")
+    log_max_file_mb: float = Field(10, description="Size at which a day's log file is rotated")
+    log_compress_rotated: bool = Field(True, description="Gzip log files once they are rotated")
     enable_video_recording: bool = Field(True, description="Enable video recording on alert")
     recording_directory: str = Field("recordings", description="Recording directory path")
-    recording_duration: int = Field(30, description="Recording duration in seconds")
-    notification_webhook: Optional[str] = Field(None, description="Webhook URL for notifications")
+    recording_duration: int = Field(30, description="Seconds recorded after the alert")
+    recording_preroll_seconds: float = Field(
+        0.0,
+        description="Seconds before the alert included in recordings; holds the camera at the pre-roll fps "
+                    "and JPEG-encodes frames continuously (0 = off)"
+    )
+    recording_preroll_fps: float = Field(10.0, description="Frame rate of the buffered pre-roll")
+    recording_fps: int = Field(20, description="Frame rate of recorded clips")
+    thumbnail_directory: str = Field("thumbnails", description="Directory for capture previews and recording posters")
+    thumbnail_width: int = Field(320, description="Width of thumbnails in pixels")
+    thumbnail_format: str = Field("webp", description="Thumbnail format (webp or jpg)")
+    thumbnail_quality: int = Field(70, description="Thumbnail encode quality")
+    notification_webhook: Optional[str] = Field(None, description="Webhook URL for notifications (comma-separate several)")
+    webhook_outbox_directory: str = Field("outbox", description="Directory for notifications awaiting delivery")
+    webhook_max_attempts: int = Field(8, description="Delivery attempts before a notification is dead-lettered")
+    webhook_backoff_seconds: float = Field(2.0, description="First retry delay; doubles on each further failure")
+    webhook_coalesce_seconds: float = Field(5.0, description="Alerts within this window of a send go out together")
     action_cooldown_seconds: int = Field(60, description="Cooldown between action triggers")
 
     # Raspberry Pi optimization
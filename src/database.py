@@ -1,14 +1,31 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Boolean, LargeBinary
+from sqlalchemy import create_engine, event, Column, Integer, String, Float, DateTime, Boolean, Index, inspect, text, and_, or_
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from datetime import datetime
-from typing import List, Optional
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
 import json
+import asyncio
 import base64
+import logging
+import sqlite3
+import time
+from collections import deque
+from dataclasses import dataclass, asdict
+from pathlib import Path
 import cv2
 import numpy as np
 
+from .blob_store import BlobStore
+from .media import CAPTURE, local_to_utc, parse_capture_filename, parse_recording_filename
+from .workers import vision_pool
+
+
+logger = logging.getLogger(__name__)
+
+
 Base = declarative_base()
 
 
@@ -21,23 +38,418 @@ class EventLog(Base):
     dogs_detected = Column(Integer, default=0)
     humans_detected = Column(Integer, default=0)
     duration_unsupervised_seconds = Column(Float, nullable=True)
-    frame_snapshot = Column(LargeBinary, nullable=True)
+    # Snapshot JPEGs live in the content-addressed BlobStore, not in the row
+    snapshot_hash = Column(String(64), nullable=True)
+    snapshot_size = Column(Integer, nullable=True)
     detections_json = Column(String, nullable=True)
     alert_triggered = Column(Boolean, default=False)
     captured_image_filename = Column(String, nullable=True)
 
+    # Filtered listings walk these newest-first; SQLite appends the rowid (id)
+    # to every index, so (filter, timestamp, id) ordering needs no sort step
+    __table_args__ = (
+        Index("ix_event_logs_alert_timestamp", "alert_triggered", "timestamp"),
+        Index("ix_event_logs_state_timestamp", "state", "timestamp"),
+    )
+
+
+class MediaItem(Base):
+    """Catalog entry for a recording or captured image written to disk."""
+    __tablename__ = "media_items"
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(16), nullable=False)  # "recording" or "capture"
+    filename = Column(String, nullable=False)
+    created_at = Column(DateTime, nullable=False)  # naive UTC, like event_logs.timestamp
+    size_bytes = Column(Integer, nullable=False, default=0)
+    duration_seconds = Column(Float, nullable=True)
+    state = Column(String, nullable=True)
+
+    __table_args__ = (
+        Index("ux_media_items_kind_filename", "kind", "filename", unique=True),
+        Index("ix_media_items_kind_created", "kind", "created_at"),
+        Index("ix_media_items_kind_state_created", "kind", "state", "created_at"),
+    )
+
+
+class EventRollup(Base):
+    """Per-state event aggregates for one hour or one day, kept in step with event_logs."""
+    __tablename__ = "event_rollups"
+
+    period = Column(String(4), primary_key=True)  # "hour" or "day"
+    bucket_start = Column(DateTime, primary_key=True)
+    state = Column(String, primary_key=True)
+    event_count = Column(Integer, nullable=False, default=0)
+    alert_count = Column(Integer, nullable=False, default=0)
+    duration_count = Column(Integer, nullable=False, default=0)
+    duration_sum = Column(Float, nullable=False, default=0.0)
+    duration_max = Column(Float, nullable=True)
+
+
+class SchemaMigration(Base):
+    """One-off data migrations that have already been applied to this database."""
+    __tablename__ = "schema_migrations"
+
+    name = Column(String, primary_key=True)
+    applied_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+ROLLUP_PERIODS = {
+    "hour": (timedelta(hours=1), "%Y-%m-%d %H:00:00.000000"),
+    "day": (timedelta(days=1), "%Y-%m-%d 00:00:00.000000"),
+}
+
+
+def floor_bucket(timestamp: datetime, period: str) -> datetime:
+    bucket = timestamp.replace(minute=0, second=0, microsecond=0)
+    if period == "day":
+        bucket = bucket.replace(hour=0)
+    return bucket
+
+
+def ceil_bucket(timestamp: datetime, period: str) -> datetime:
+    bucket = floor_bucket(timestamp, period)
+    if bucket < timestamp:
+        bucket += ROLLUP_PERIODS[period][0]
+    return bucket
+
+
+@dataclass
+class SQLiteProfile:
+    """Connection-level SQLite tuning, applied to every pooled connection.
+
+    The defaults suit a single-writer app on an SD card: WAL lets readers
+    proceed during commits, synchronous=NORMAL only fsyncs at checkpoints
+    (durable against app crashes, may lose the last commits on power loss),
+    and mmap plus a larger page cache keep hot reads out of the filesystem.
+    """
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    mmap_size: int = 64 * 1024 * 1024
+    cache_size_kb: int = 8192
+    busy_timeout_ms: int = 5000
+    temp_store: str = "MEMORY"
+    pool_size: int = 4
+
+    JOURNAL_MODES = ("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF")
+    SYNCHRONOUS_LEVELS = ("OFF", "NORMAL", "FULL", "EXTRA")
+    TEMP_STORES = ("DEFAULT", "FILE", "MEMORY")
+
+    def __post_init__(self):
+        self.journal_mode = self.journal_mode.upper()
+        self.synchronous = self.synchronous.upper()
+        self.temp_store = self.temp_store.upper()
+        if self.journal_mode not in self.JOURNAL_MODES:
+            raise ValueError(f"Unknown SQLite journal_mode: {self.journal_mode}")
+        if self.synchronous not in self.SYNCHRONOUS_LEVELS:
+            raise ValueError(f"Unknown SQLite synchronous level: {self.synchronous}")
+        if self.temp_store not in self.TEMP_STORES:
+            raise ValueError(f"Unknown SQLite temp_store: {self.temp_store}")
+
+    @classmethod
+    def sqlite_defaults(cls) -> "SQLiteProfile":
+        """SQLite's stock settings, for comparison."""
+        return cls(
+            journal_mode="DELETE",
+            synchronous="FULL",
+            mmap_size=0,
+            cache_size_kb=2000,
+            busy_timeout_ms=0,
+            temp_store="DEFAULT",
+            pool_size=5
+        )
+
+    def pragmas(self) -> List[str]:
+        return [
+            f"PRAGMA journal_mode={self.journal_mode}",
+            f"PRAGMA synchronous={self.synchronous}",
+            f"PRAGMA mmap_size={int(self.mmap_size)}",
+            # Negative cache_size is in KiB rather than pages
+            f"PRAGMA cache_size={-int(self.cache_size_kb)}",
+            f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}",
+            f"PRAGMA temp_store={self.temp_store}",
+        ]
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(timestamp: datetime, event_id: int) -> str:
+    payload = json.dumps([timestamp.isoformat(), event_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii').rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, event_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(timestamp), int(event_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor!r}") from e
+
 
 class Database:
-    def __init__(self, database_url: str = "sqlite+aiosqlite:///doodie_duty.db"):
+    def __init__(
+        self,
+        database_url: str = "sqlite+aiosqlite:///doodie_duty.db",
+        snapshot_directory: str = "snapshots",
+        batch_max_rows: int = 50,
+        batch_max_delay_ms: float = 100,
+        queue_size: int = 1000,
+        sqlite_profile: Optional[SQLiteProfile] = None
+    ):
         self.database_url = database_url
-        self.engine = create_async_engine(database_url, echo=False)
+        self.sqlite_profile = None
+        engine_options = {}
+
+        if database_url.startswith("sqlite"):
+            self.sqlite_profile = sqlite_profile or SQLiteProfile()
+            if ":memory:" not in database_url:
+                # aiosqlite defaults to NullPool, reopening the file (and
+                # re-running the pragmas) for every session
+                engine_options["poolclass"] = AsyncAdaptedQueuePool
+                engine_options["pool_size"] = self.sqlite_profile.pool_size
+                engine_options["max_overflow"] = 0
+
+        self.engine = create_async_engine(database_url, echo=False, **engine_options)
+        if self.sqlite_profile:
+            event.listen(self.engine.sync_engine, "connect", self._apply_sqlite_profile)
         self.async_session = async_sessionmaker(
             self.engine, class_=AsyncSession, expire_on_commit=False
         )
+        self.blob_store = BlobStore(snapshot_directory)
+        # Set when an existing file still needs the one-off VACUUM to switch auto_vacuum modes
+        self.auto_vacuum_pending = False
+
+        # Write-behind batching: log_event enqueues, one task commits many rows per transaction
+        self.batch_max_rows = max(1, batch_max_rows)
+        self.batch_max_delay = max(0.0, batch_max_delay_ms / 1000.0)
+        self.queue_size = queue_size
+        self.write_queue: Optional[asyncio.Queue] = None
+        self.writer_task: Optional[asyncio.Task] = None
+        self.batches_committed = 0
+        self.rows_committed = 0
+        self.rows_failed = 0
+        self.backpressure_waits = 0
+        self.max_queue_depth = 0
+        self.commit_latencies: deque = deque(maxlen=200)
+
+    def _apply_sqlite_profile(self, dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in self.sqlite_profile.pragmas():
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
 
     async def init_db(self):
+        if self.sqlite_profile and ":memory:" not in self.database_url:
+            await self._enable_incremental_vacuum()
+
         async with self.engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(self._migrate_inline_snapshots)
+            await conn.run_sync(self._create_missing_indexes)
+            await conn.run_sync(self._run_once, "media_times_utc", self._migrate_media_times_to_utc)
+            await conn.run_sync(self._backfill_rollups)
+
+        if self.sqlite_profile:
+            async with self.engine.connect() as conn:
+                journal_mode = (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+                synchronous = (await conn.execute(text("PRAGMA synchronous"))).scalar()
+            logger.info(
+                "SQLite journal_mode=%s, synchronous=%s, mmap=%dMB, cache=%sKB",
+                journal_mode, synchronous, self.sqlite_profile.mmap_size // (1024 * 1024),
+                self.sqlite_profile.cache_size_kb
+            )
+
+        self._ensure_writer()
+
+    async def _enable_incremental_vacuum(self):
+        """Switch the file to auto_vacuum=INCREMENTAL so freed pages can be returned in small steps.
+
+        FULL switches in place and a fresh file converts instantly. An existing
+        database needs a full VACUUM, which can hold the write lock for minutes
+        on slow storage, so that is left to the first incremental_vacuum() call
+        (the retention job) instead of blocking startup.
+        """
+        async with self.engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            mode = (await conn.execute(text("PRAGMA auto_vacuum"))).scalar()
+            if mode == 2:
+                return
+
+            await conn.execute(text("PRAGMA auto_vacuum=INCREMENTAL"))
+            if mode == 1:
+                return
+            tables = (await conn.execute(text("SELECT count(*) FROM sqlite_master WHERE type = 'table'"))).scalar()
+            if tables:
+                self.auto_vacuum_pending = True
+                logger.info("Database will be converted to incremental auto-vacuum on the first retention pass")
+                return
+            # The file header already exists (WAL mode wrote it), so the new
+            # mode only takes effect after a VACUUM; on an empty file it is instant
+            await conn.execute(text("VACUUM"))
+
+    async def _convert_to_incremental_vacuum(self) -> int:
+        """Run the VACUUM deferred from startup. Returns the free pages it released."""
+        async with self.engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(text("PRAGMA auto_vacuum=INCREMENTAL"))
+            before = (await conn.execute(text("PRAGMA freelist_count"))).scalar()
+            logger.info("Converting database to incremental auto-vacuum...")
+            started = time.perf_counter()
+            await conn.execute(text("VACUUM"))
+            mode = (await conn.execute(text("PRAGMA auto_vacuum"))).scalar()
+        self.auto_vacuum_pending = False
+        logger.info(
+            "✓ Converted to auto_vacuum=%s in %.1fs",
+            "INCREMENTAL" if mode == 2 else mode, time.perf_counter() - started
+        )
+        return before
+
+    def _ensure_writer(self):
+        if self.write_queue is None:
+            self.write_queue = asyncio.Queue(maxsize=self.queue_size)
+        if self.writer_task is None or self.writer_task.done():
+            self.writer_task = asyncio.create_task(self._writer_loop())
+
+    async def close(self):
+        """Flush every queued event, stop the writer and release connections."""
+        if self.writer_task and not self.writer_task.done():
+            await self.write_queue.put(None)
+            await self.writer_task
+        self.writer_task = None
+        await self.engine.dispose()
+
+    @classmethod
+    def _backfill_rollups(cls, conn):
+        from sqlalchemy import select
+
+        if conn.execute(select(EventRollup.period).limit(1)).first() is not None:
+            return
+        if conn.execute(select(EventLog.id).limit(1)).first() is None:
+            return
+
+        cls._rebuild_rollups(conn)
+        logger.info("Built statistics rollups from existing events")
+
+    @staticmethod
+    def _rebuild_rollups(conn, start: Optional[datetime] = None, end: Optional[datetime] = None):
+        """Recompute rollup buckets in [start, end) from event_logs.
+
+        start and end must fall on day boundaries so every hour and day
+        bucket in the range is rebuilt whole. Works on a sync Connection or Session.
+        """
+        from sqlalchemy import select, delete, func, insert, case, literal
+
+        for period, (_, bucket_format) in ROLLUP_PERIODS.items():
+            clear = delete(EventRollup).where(EventRollup.period == period)
+            if start:
+                clear = clear.where(EventRollup.bucket_start >= start)
+            if end:
+                clear = clear.where(EventRollup.bucket_start < end)
+            conn.execute(clear)
+
+            bucket = func.strftime(bucket_format, EventLog.timestamp)
+            aggregate = select(
+                literal(period),
+                bucket,
+                EventLog.state,
+                func.count(EventLog.id),
+                func.sum(case((EventLog.alert_triggered == True, 1), else_=0)),
+                func.count(EventLog.duration_unsupervised_seconds),
+                func.coalesce(func.sum(EventLog.duration_unsupervised_seconds), 0.0),
+                func.max(EventLog.duration_unsupervised_seconds)
+            )
+            if start:
+                aggregate = aggregate.where(EventLog.timestamp >= start)
+            if end:
+                aggregate = aggregate.where(EventLog.timestamp < end)
+            aggregate = aggregate.group_by(bucket, EventLog.state)
+
+            conn.execute(insert(EventRollup).from_select([
+                "period", "bucket_start", "state", "event_count", "alert_count",
+                "duration_count", "duration_sum", "duration_max"
+            ], aggregate))
+
+    @staticmethod
+    def _create_missing_indexes(conn):
+        # create_all only builds indexes alongside new tables
+        for table in (EventLog.__table__, MediaItem.__table__):
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
+    @staticmethod
+    def _run_once(conn, name: str, migration):
+        """Apply a data migration unless schema_migrations says it already ran."""
+        table = SchemaMigration.__table__
+        if conn.execute(table.select().where(table.c.name == name)).first() is not None:
+            return
+        migration(conn)
+        # Same transaction as the migration, so a crash part way through reruns it
+        conn.execute(table.insert().values(name=name, applied_at=datetime.utcnow()))
+
+    @staticmethod
+    def _migrate_media_times_to_utc(conn):
+        """Convert catalog rows written in local time (as in their filenames) to UTC. Runs once."""
+        table = MediaItem.__table__
+        rows = conn.execute(table.select().with_only_columns(
+            table.c.id, table.c.kind, table.c.filename, table.c.created_at
+        )).fetchall()
+        converted = 0
+        for row_id, kind, filename, created_at in rows:
+            path = Path(filename)
+            local = parse_capture_filename(path)[0] if kind == CAPTURE else parse_recording_filename(path)
+            # Rows already in UTC no longer match the local time in their name
+            if local is None or created_at != local:
+                continue
+            utc = local_to_utc(local)
+            if utc != local:
+                conn.execute(table.update().where(table.c.id == row_id).values(created_at=utc))
+                converted += 1
+        if converted:
+            logger.info("Converted %d catalog timestamps to UTC", converted)
+
+    def _migrate_inline_snapshots(self, conn):
+        """Move JPEGs from the legacy event_logs.frame_snapshot column into the blob store."""
+        columns = {column["name"] for column in inspect(conn).get_columns("event_logs")}
+
+        if "snapshot_hash" not in columns:
+            conn.execute(text("ALTER TABLE event_logs ADD COLUMN snapshot_hash VARCHAR(64)"))
+            conn.execute(text("ALTER TABLE event_logs ADD COLUMN snapshot_size INTEGER"))
+
+        if "frame_snapshot" not in columns:
+            return
+
+        moved = 0
+        while True:
+            rows = conn.execute(text(
+                "SELECT id, frame_snapshot FROM event_logs "
+                "WHERE frame_snapshot IS NOT NULL LIMIT 100"
+            )).fetchall()
+            if not rows:
+                break
+
+            for row_id, data in rows:
+                digest = self.blob_store.put(data)
+                conn.execute(
+                    text(
+                        "UPDATE event_logs SET snapshot_hash = :digest, snapshot_size = :size, "
+                        "frame_snapshot = NULL WHERE id = :id"
+                    ),
+                    {"digest": digest, "size": len(data), "id": row_id}
+                )
+            moved += len(rows)
+
+        if sqlite3.sqlite_version_info >= (3, 35, 0):
+            conn.execute(text("ALTER TABLE event_logs DROP COLUMN frame_snapshot"))
+
+        logger.info("Migrated %d inline snapshots to %s", moved, self.blob_store.root)
 
     async def log_event(
         self,
@@ -50,40 +462,167 @@ class Database:
         alert_triggered: bool = False,
         captured_image_filename: Optional[str] = None
     ) -> int:
-        async with self.async_session() as session:
-            frame_data = None
-            if frame_snapshot is not None:
-                _, buffer = cv2.imencode('.jpg', frame_snapshot, [cv2.IMWRITE_JPEG_QUALITY, 70])
-                frame_data = buffer.tobytes()
-
-            detections_json = None
-            if detections:
-                detections_dict = [
-                    {
-                        "class_name": d.class_name,
-                        "confidence": d.confidence,
-                        "bbox": d.bbox,
-                        "timestamp": d.timestamp.isoformat()
-                    }
-                    for d in detections
-                ]
-                detections_json = json.dumps(detections_dict)
-
-            event = EventLog(
-                timestamp=datetime.utcnow(),
-                state=state,
-                dogs_detected=dogs_detected,
-                humans_detected=humans_detected,
-                duration_unsupervised_seconds=duration_unsupervised_seconds,
-                frame_snapshot=frame_data,
-                detections_json=detections_json,
-                alert_triggered=alert_triggered,
-                captured_image_filename=captured_image_filename
+        """Queue an event for the next batch commit and return its id once committed."""
+        snapshot_hash = None
+        snapshot_size = None
+        if frame_snapshot is not None:
+            frame_data = await vision_pool.run(self._encode_snapshot, frame_snapshot)
+            snapshot_hash = await asyncio.get_running_loop().run_in_executor(
+                None, self.blob_store.put, frame_data
             )
+            snapshot_size = len(frame_data)
 
-            session.add(event)
-            await session.commit()
-            return event.id
+        detections_json = None
+        if detections:
+            detections_dict = [
+                {
+                    "class_name": d.class_name,
+                    "confidence": d.confidence,
+                    "bbox": d.bbox,
+                    "timestamp": d.timestamp.isoformat()
+                }
+                for d in detections
+            ]
+            detections_json = json.dumps(detections_dict)
+
+        event = EventLog(
+            timestamp=datetime.utcnow(),
+            state=state,
+            dogs_detected=dogs_detected,
+            humans_detected=humans_detected,
+            duration_unsupervised_seconds=duration_unsupervised_seconds,
+            snapshot_hash=snapshot_hash,
+            snapshot_size=snapshot_size,
+            detections_json=detections_json,
+            alert_triggered=alert_triggered,
+            captured_image_filename=captured_image_filename
+        )
+
+        self._ensure_writer()
+        committed = asyncio.get_running_loop().create_future()
+        if self.write_queue.full():
+            self.backpressure_waits += 1
+        # Blocks while the queue is full, slowing producers to the commit rate
+        await self.write_queue.put((event, committed))
+        self.max_queue_depth = max(self.max_queue_depth, self.write_queue.qsize())
+        return await committed
+
+    async def _writer_loop(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self.write_queue.get()
+            if item is None:
+                break
+            batch = [item]
+
+            # Gather more rows until the batch is full or the oldest row has waited long enough
+            deadline = loop.time() + self.batch_max_delay
+            while len(batch) < self.batch_max_rows:
+                try:
+                    item = self.write_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self.write_queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await self._commit_batch(batch)
+
+    async def _commit_batch(self, batch):
+        started = time.perf_counter()
+        try:
+            async with self.async_session() as session:
+                events = [event for event, _ in batch]
+                session.add_all(events)
+                # Rollups ride in the same transaction, so they never drift from event_logs
+                await session.execute(self._rollup_upsert(events))
+                await session.commit()
+        except Exception as e:
+            logger.error("✗ Batch of %d events failed to commit: %s", len(batch), e)
+            self.rows_failed += len(batch)
+            for _, committed in batch:
+                if not committed.done():
+                    committed.set_exception(e)
+            return
+
+        self.commit_latencies.append(time.perf_counter() - started)
+        self.batches_committed += 1
+        self.rows_committed += len(batch)
+        for event, committed in batch:
+            if not committed.done():
+                committed.set_result(event.id)
+
+    @staticmethod
+    def _rollup_upsert(events: List[EventLog]):
+        rows = {}
+        for event in events:
+            duration = event.duration_unsupervised_seconds
+            for period in ROLLUP_PERIODS:
+                key = (period, floor_bucket(event.timestamp, period), event.state)
+                row = rows.setdefault(key, {
+                    "period": key[0],
+                    "bucket_start": key[1],
+                    "state": key[2],
+                    "event_count": 0,
+                    "alert_count": 0,
+                    "duration_count": 0,
+                    "duration_sum": 0.0,
+                    "duration_max": None
+                })
+                row["event_count"] += 1
+                row["alert_count"] += 1 if event.alert_triggered else 0
+                if duration is not None:
+                    row["duration_count"] += 1
+                    row["duration_sum"] += duration
+                    row["duration_max"] = duration if row["duration_max"] is None else max(row["duration_max"], duration)
+
+        from sqlalchemy import func
+
+        upsert = sqlite_insert(EventRollup).values(list(rows.values()))
+        excluded = upsert.excluded
+        return upsert.on_conflict_do_update(
+            index_elements=["period", "bucket_start", "state"],
+            set_={
+                "event_count": EventRollup.event_count + excluded.event_count,
+                "alert_count": EventRollup.alert_count + excluded.alert_count,
+                "duration_count": EventRollup.duration_count + excluded.duration_count,
+                "duration_sum": EventRollup.duration_sum + excluded.duration_sum,
+                # SQLite's scalar max() returns NULL if either side is NULL
+                "duration_max": func.max(
+                    func.coalesce(EventRollup.duration_max, excluded.duration_max),
+                    func.coalesce(excluded.duration_max, EventRollup.duration_max)
+                )
+            }
+        )
+
+    def get_stats(self) -> dict:
+        latencies = sorted(self.commit_latencies)
+        return {
+            "sqlite_profile": self.sqlite_profile.to_dict() if self.sqlite_profile else None,
+            "queue_depth": self.write_queue.qsize() if self.write_queue else 0,
+            "max_queue_depth": self.max_queue_depth,
+            "queue_size": self.queue_size,
+            "backpressure_waits": self.backpressure_waits,
+            "batches_committed": self.batches_committed,
+            "rows_committed": self.rows_committed,
+            "rows_failed": self.rows_failed,
+            "avg_batch_rows": round(self.rows_committed / self.batches_committed, 2) if self.batches_committed else 0.0,
+            "avg_commit_ms": round(sum(latencies) / len(latencies) * 1000, 2) if latencies else 0.0,
+            "p99_commit_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000, 2) if latencies else 0.0
+        }
+
+    @staticmethod
+    def _encode_snapshot(frame: np.ndarray) -> bytes:
+        _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 70])
+        return buffer.tobytes()
 
     async def get_events(
         self,
@@ -95,106 +634,444 @@ class Database:
         alerts_only: bool = False
     ) -> List[dict]:
         async with self.async_session() as session:
-            from sqlalchemy import select
+            query = self._events_query(start_time, end_time, state_filter, alerts_only)
+            query = query.limit(limit).offset(offset)
 
-            query = select(EventLog)
+            result = await session.execute(query)
+            return [self._event_row_to_dict(row) for row in result.all()]
 
-            if start_time:
-                query = query.where(EventLog.timestamp >= start_time)
-            if end_time:
-                query = query.where(EventLog.timestamp <= end_time)
-            if state_filter:
-                query = query.where(EventLog.state == state_filter)
-            if alerts_only:
-                query = query.where(EventLog.alert_triggered == True)
+    async def get_events_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        state_filter: Optional[str] = None,
+        alerts_only: bool = False
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Newest-first page of events plus an opaque cursor for the next page.
 
-            query = query.order_by(EventLog.timestamp.desc())
-            query = query.limit(limit).offset(offset)
+        Pages continue from the last (timestamp, id) seen rather than an
+        offset, so every page costs the same no matter how deep it is. The
+        returned cursor is None once there are no more events.
+        """
+        query = self._events_query(start_time, end_time, state_filter, alerts_only)
 
-            result = await session.execute(query)
-            events = result.scalars().all()
+        if cursor:
+            cursor_time, cursor_id = decode_cursor(cursor)
+            query = query.where(or_(
+                EventLog.timestamp < cursor_time,
+                and_(EventLog.timestamp == cursor_time, EventLog.id < cursor_id)
+            ))
 
-            return [
-                {
-                    "id": event.id,
-                    "timestamp": event.timestamp.isoformat(),
-                    "state": event.state,
-                    "dogs_detected": event.dogs_detected,
-                    "humans_detected": event.humans_detected,
-                    "duration_unsupervised_seconds": event.duration_unsupervised_seconds,
-                    "alert_triggered": event.alert_triggered,
-                    "has_snapshot": event.frame_snapshot is not None,
-                    "captured_image_filename": event.captured_image_filename,
-                    "captured_image_url": f"/captures/{event.captured_image_filename}" if event.captured_image_filename else None
-                }
-                for event in events
-            ]
+        async with self.async_session() as session:
+            # One extra row tells us whether another page exists
+            result = await session.execute(query.limit(limit + 1))
+            rows = result.all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].timestamp, rows[-1].id)
+
+        return [self._event_row_to_dict(row) for row in rows], next_cursor
+
+    @staticmethod
+    def _events_query(
+        start_time: Optional[datetime],
+        end_time: Optional[datetime],
+        state_filter: Optional[str],
+        alerts_only: bool
+    ):
+        from sqlalchemy import select
+
+        # Project only what the listing needs; snapshots stay on disk
+        query = select(
+            EventLog.id,
+            EventLog.timestamp,
+            EventLog.state,
+            EventLog.dogs_detected,
+            EventLog.humans_detected,
+            EventLog.duration_unsupervised_seconds,
+            EventLog.alert_triggered,
+            EventLog.snapshot_hash,
+            EventLog.captured_image_filename
+        )
+
+        if start_time:
+            query = query.where(EventLog.timestamp >= start_time)
+        if end_time:
+            query = query.where(EventLog.timestamp <= end_time)
+        if state_filter:
+            query = query.where(EventLog.state == state_filter)
+        if alerts_only:
+            query = query.where(EventLog.alert_triggered == True)
+
+        return query.order_by(EventLog.timestamp.desc(), EventLog.id.desc())
+
+    @staticmethod
+    def _event_row_to_dict(event) -> dict:
+        return {
+            "id": event.id,
+            "timestamp": event.timestamp.isoformat(),
+            "state": event.state,
+            "dogs_detected": event.dogs_detected,
+            "humans_detected": event.humans_detected,
+            "duration_unsupervised_seconds": event.duration_unsupervised_seconds,
+            "alert_triggered": event.alert_triggered,
+            "has_snapshot": event.snapshot_hash is not None,
+            "captured_image_filename": event.captured_image_filename,
+            "captured_image_url": f"/captures/{event.captured_image_filename}" if event.captured_image_filename else None
+        }
 
     async def get_event_snapshot(self, event_id: int) -> Optional[str]:
         async with self.async_session() as session:
             from sqlalchemy import select
 
-            query = select(EventLog).where(EventLog.id == event_id)
+            query = select(EventLog.snapshot_hash).where(EventLog.id == event_id)
             result = await session.execute(query)
-            event = result.scalar_one_or_none()
+            snapshot_hash = result.scalar_one_or_none()
+
+        if not snapshot_hash:
+            return None
 
-            if event and event.frame_snapshot:
-                return base64.b64encode(event.frame_snapshot).decode('utf-8')
+        data = await asyncio.get_running_loop().run_in_executor(
+            None, self.blob_store.get, snapshot_hash
+        )
+        if data is None:
             return None
+        return base64.b64encode(data).decode('utf-8')
 
     async def get_statistics(
         self,
         start_time: Optional[datetime] = None,
         end_time: Optional[datetime] = None
     ) -> dict:
+        """Aggregate event statistics over [start_time, end_time].
+
+        Whole days come from the daily rollups and whole hours at either end
+        from the hourly rollups. Only the partial hours at the range edges
+        are read from event_logs.
+        """
+        from sqlalchemy import select, func, case
+
+        raw_ranges, hour_ranges, day_ranges = self._split_statistics_range(start_time, end_time)
+
+        totals = {"events": 0, "alerts": 0, "duration_count": 0, "duration_sum": 0.0, "duration_max": None}
+        state_counts = {}
+
+        def accumulate(rows):
+            for row in rows:
+                totals["events"] += row.events or 0
+                totals["alerts"] += int(row.alerts or 0)
+                totals["duration_count"] += row.duration_count or 0
+                totals["duration_sum"] += row.duration_sum or 0.0
+                if row.duration_max is not None:
+                    totals["duration_max"] = max(totals["duration_max"] or 0.0, row.duration_max)
+                if row.events:
+                    state_counts[row.state] = state_counts.get(row.state, 0) + row.events
+
         async with self.async_session() as session:
-            from sqlalchemy import select, func
+            for low, high, inclusive in raw_ranges:
+                query = select(
+                    EventLog.state,
+                    func.count(EventLog.id).label("events"),
+                    func.sum(case((EventLog.alert_triggered == True, 1), else_=0)).label("alerts"),
+                    func.count(EventLog.duration_unsupervised_seconds).label("duration_count"),
+                    func.sum(EventLog.duration_unsupervised_seconds).label("duration_sum"),
+                    func.max(EventLog.duration_unsupervised_seconds).label("duration_max")
+                )
+                if low:
+                    query = query.where(EventLog.timestamp >= low)
+                if high:
+                    query = query.where(EventLog.timestamp <= high if inclusive else EventLog.timestamp < high)
+                accumulate((await session.execute(query.group_by(EventLog.state))).all())
 
-            query = select(
-                func.count(EventLog.id).label("total_events"),
-                func.sum(EventLog.alert_triggered).label("total_alerts"),
-                func.avg(EventLog.duration_unsupervised_seconds).label("avg_unsupervised_duration"),
-                func.max(EventLog.duration_unsupervised_seconds).label("max_unsupervised_duration")
-            )
+            for period, ranges in (("hour", hour_ranges), ("day", day_ranges)):
+                for low, high in ranges:
+                    query = select(
+                        EventRollup.state,
+                        func.sum(EventRollup.event_count).label("events"),
+                        func.sum(EventRollup.alert_count).label("alerts"),
+                        func.sum(EventRollup.duration_count).label("duration_count"),
+                        func.sum(EventRollup.duration_sum).label("duration_sum"),
+                        func.max(EventRollup.duration_max).label("duration_max")
+                    ).where(EventRollup.period == period)
+                    if low:
+                        query = query.where(EventRollup.bucket_start >= low)
+                    if high:
+                        query = query.where(EventRollup.bucket_start < high)
+                    accumulate((await session.execute(query.group_by(EventRollup.state))).all())
 
-            if start_time:
-                query = query.where(EventLog.timestamp >= start_time)
-            if end_time:
-                query = query.where(EventLog.timestamp <= end_time)
+        avg_duration = totals["duration_sum"] / totals["duration_count"] if totals["duration_count"] else 0.0
+        return {
+            "total_events": totals["events"],
+            "total_alerts": totals["alerts"],
+            "avg_unsupervised_duration": float(avg_duration),
+            "max_unsupervised_duration": float(totals["duration_max"] or 0),
+            "state_counts": state_counts
+        }
 
-            result = await session.execute(query)
-            stats = result.one()
+    @staticmethod
+    def _split_statistics_range(start_time: Optional[datetime], end_time: Optional[datetime]):
+        """Split [start_time, end_time] into raw edge ranges and hour/day rollup ranges.
 
-            state_query = select(
-                EventLog.state,
-                func.count(EventLog.id).label("count")
+        Raw ranges are (low, high, high_inclusive); rollup ranges are
+        half-open (low, high) over bucket starts. None means unbounded.
+        """
+        first_hour = ceil_bucket(start_time, "hour") if start_time else None
+        last_hour = floor_bucket(end_time, "hour") if end_time else None
+
+        if first_hour and last_hour and first_hour > last_hour:
+            # Entirely inside one hour
+            return [(start_time, end_time, True)], [], []
+
+        raw_ranges = []
+        if start_time and start_time < first_hour:
+            raw_ranges.append((start_time, first_hour, False))
+        if end_time:
+            raw_ranges.append((last_hour, end_time, True))
+
+        first_day = ceil_bucket(start_time, "day") if start_time else None
+        last_day = floor_bucket(end_time, "day") if end_time else None
+
+        if first_day and last_day and first_day >= last_day:
+            # No whole day in range
+            return raw_ranges, [(first_hour, last_hour)], []
+
+        hour_ranges = []
+        if first_hour and first_hour < first_day:
+            hour_ranges.append((first_hour, first_day))
+        if last_hour and last_day < last_hour:
+            hour_ranges.append((last_day, last_hour))
+
+        return raw_ranges, hour_ranges, [(first_day, last_day)]
+
+    async def cleanup_old_events(self, days_to_keep: int = 30, batch_size: int = 500) -> int:
+        cutoff_date = datetime.utcnow() - timedelta(days=days_to_keep)
+        total = 0
+        while True:
+            deleted, _ = await self.delete_events_batch(before=cutoff_date, limit=batch_size)
+            total += deleted
+            if deleted < batch_size:
+                return total
+
+    async def delete_events_batch(self, before: Optional[datetime] = None, limit: int = 500) -> Tuple[int, int]:
+        """Delete up to `limit` of the oldest events, optionally only those before `before`.
+
+        Each call is one short transaction, so the writer and readers are
+        never locked out for long. Returns (events deleted, snapshot bytes freed).
+        """
+        from sqlalchemy import delete, select
+
+        async with self.async_session() as session:
+            query = select(EventLog.id, EventLog.timestamp, EventLog.snapshot_hash)
+            if before:
+                query = query.where(EventLog.timestamp < before)
+            query = query.order_by(EventLog.timestamp, EventLog.id).limit(limit)
+            rows = (await session.execute(query)).all()
+            if not rows:
+                return 0, 0
+
+            await session.execute(delete(EventLog).where(EventLog.id.in_([row.id for row in rows])))
+
+            # Recount every day the batch touched; rows are oldest-first
+            first_day = floor_bucket(rows[0].timestamp, "day")
+            end_day = floor_bucket(rows[-1].timestamp, "day") + timedelta(days=1)
+            await session.run_sync(
+                lambda sync_session: self._rebuild_rollups(sync_session, first_day, end_day)
             )
-            if start_time:
-                state_query = state_query.where(EventLog.timestamp >= start_time)
-            if end_time:
-                state_query = state_query.where(EventLog.timestamp <= end_time)
-
-            state_query = state_query.group_by(EventLog.state)
-            state_result = await session.execute(state_query)
-            state_counts = {row.state: row.count for row in state_result}
-
-            return {
-                "total_events": stats.total_events or 0,
-                "total_alerts": int(stats.total_alerts or 0),
-                "avg_unsupervised_duration": float(stats.avg_unsupervised_duration or 0),
-                "max_unsupervised_duration": float(stats.max_unsupervised_duration or 0),
-                "state_counts": state_counts
+            await session.commit()
+
+            # Blobs are shared by content; only drop the ones nothing references now
+            freed = 0
+            candidate_hashes = {row.snapshot_hash for row in rows if row.snapshot_hash}
+            if candidate_hashes:
+                still_used_query = select(EventLog.snapshot_hash).distinct().where(
+                    EventLog.snapshot_hash.in_(candidate_hashes)
+                )
+                still_used = set((await session.execute(still_used_query)).scalars().all())
+                freed = await self._delete_blobs(candidate_hashes - still_used)
+
+            return len(rows), freed
+
+    async def _delete_blobs(self, digests) -> int:
+        def delete_all():
+            freed = 0
+            for digest in digests:
+                path = self.blob_store.path_for(digest)
+                try:
+                    size = path.stat().st_size
+                except FileNotFoundError:
+                    continue
+                if self.blob_store.delete(digest):
+                    freed += size
+            return freed
+
+        return await asyncio.get_running_loop().run_in_executor(None, delete_all)
+
+    async def add_media(
+        self,
+        kind: str,
+        filename: str,
+        created_at: datetime,
+        size_bytes: int,
+        duration_seconds: Optional[float] = None,
+        state: Optional[str] = None
+    ):
+        values = {
+            "kind": kind,
+            "filename": filename,
+            "created_at": created_at,
+            "size_bytes": size_bytes,
+            "duration_seconds": duration_seconds,
+            "state": state
+        }
+        upsert = sqlite_insert(MediaItem).values(**values)
+        upsert = upsert.on_conflict_do_update(
+            index_elements=["kind", "filename"],
+            set_={key: upsert.excluded[key] for key in values if key not in ("kind", "filename")}
+        )
+        async with self.async_session() as session:
+            await session.execute(upsert)
+            await session.commit()
+
+    async def get_media_page(
+        self,
+        kind: str,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        state_filter: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Newest-first page of catalogued media plus a cursor for the next page."""
+        from sqlalchemy import select
+
+        query = select(
+            MediaItem.id,
+            MediaItem.filename,
+            MediaItem.created_at,
+            MediaItem.size_bytes,
+            MediaItem.duration_seconds,
+            MediaItem.state
+        ).where(MediaItem.kind == kind)
+
+        if state_filter:
+            query = query.where(MediaItem.state == state_filter)
+        if start_time:
+            query = query.where(MediaItem.created_at >= start_time)
+        if end_time:
+            query = query.where(MediaItem.created_at <= end_time)
+        if cursor:
+            cursor_time, cursor_id = decode_cursor(cursor)
+            query = query.where(or_(
+                MediaItem.created_at < cursor_time,
+                and_(MediaItem.created_at == cursor_time, MediaItem.id < cursor_id)
+            ))
+
+        query = query.order_by(MediaItem.created_at.desc(), MediaItem.id.desc()).limit(limit + 1)
+        async with self.async_session() as session:
+            rows = (await session.execute(query)).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+        return [
+            {
+                "filename": row.filename,
+                "created": row.created_at.replace(tzinfo=timezone.utc).isoformat(),
+                "size": row.size_bytes,
+                "duration": row.duration_seconds,
+                "state": row.state
             }
+            for row in rows
+        ], next_cursor
+
+    async def get_media_filenames(self, kind: str) -> set:
+        from sqlalchemy import select
 
-    async def cleanup_old_events(self, days_to_keep: int = 30) -> int:
         async with self.async_session() as session:
-            from sqlalchemy import delete
-            from datetime import timedelta
+            query = select(MediaItem.filename).where(MediaItem.kind == kind)
+            return set((await session.execute(query)).scalars().all())
 
-            cutoff_date = datetime.utcnow() - timedelta(days=days_to_keep)
+    async def delete_media(self, kind: str, filenames) -> int:
+        from sqlalchemy import delete
 
-            query = delete(EventLog).where(EventLog.timestamp < cutoff_date)
-            result = await session.execute(query)
+        filenames = list(filenames)
+        if not filenames:
+            return 0
+        async with self.async_session() as session:
+            result = await session.execute(
+                delete(MediaItem).where(MediaItem.kind == kind, MediaItem.filename.in_(filenames))
+            )
+            await session.commit()
+            return result.rowcount
+
+    async def get_oldest_event_time(self) -> Optional[datetime]:
+        from sqlalchemy import select, func
+
+        async with self.async_session() as session:
+            return (await session.execute(select(func.min(EventLog.timestamp)))).scalar()
+
+    async def get_referenced_captures(self) -> set:
+        from sqlalchemy import select
+
+        async with self.async_session() as session:
+            query = select(EventLog.captured_image_filename).distinct().where(
+                EventLog.captured_image_filename.isnot(None)
+            )
+            return set((await session.execute(query)).scalars().all())
+
+    async def get_referenced_snapshot_hashes(self) -> set:
+        from sqlalchemy import select
+
+        async with self.async_session() as session:
+            query = select(EventLog.snapshot_hash).distinct().where(EventLog.snapshot_hash.isnot(None))
+            return set((await session.execute(query)).scalars().all())
+
+    async def clear_capture_references(self, filenames) -> int:
+        """Forget captured images that have been deleted from disk."""
+        from sqlalchemy import update
+
+        filenames = list(filenames)
+        if not filenames:
+            return 0
+        async with self.async_session() as session:
+            result = await session.execute(
+                update(EventLog)
+                .where(EventLog.captured_image_filename.in_(filenames))
+                .values(captured_image_filename=None)
+            )
             await session.commit()
+            return result.rowcount
+
+    async def incremental_vacuum(self, max_pages: int = 1000) -> int:
+        """Return up to max_pages free pages to the filesystem. Returns pages released."""
+        if not self.sqlite_profile:
+            return 0
+        if self.auto_vacuum_pending:
+            return await self._convert_to_incremental_vacuum()
+        async with self.engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            before = (await conn.execute(text("PRAGMA freelist_count"))).scalar()
+            # The pragma frees one page per step and sqlite3's execute() steps
+            # it only once; executescript() runs it to completion
+            raw = await conn.get_raw_connection()
+            await raw.driver_connection.executescript(f"PRAGMA incremental_vacuum({int(max_pages)});")
+            after = (await conn.execute(text("PRAGMA freelist_count"))).scalar()
+        return before - after
 
-            return result.rowcount
\ No newline at end of file
+    async def get_storage_stats(self) -> dict:
+        if not self.sqlite_profile:
+            return {}
+        async with self.engine.connect() as conn:
+            page_size = (await conn.execute(text("PRAGMA page_size"))).scalar()
+            page_count = (await conn.execute(text("PRAGMA page_count"))).scalar()
+            freelist_count = (await conn.execute(text("PRAGMA freelist_count"))).scalar()
+        return {
+            "file_bytes": page_size * page_count,
+            "free_bytes": page_size * freelist_count
+        }
@@ -0,0 +1,84 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import numpy as np
+
+from .detector import DogHumanDetector, DetectionResult
+
+
+class DetectionCache:
+    """Per-frame detection results keyed by the camera's frame sequence number.
+
+    The supervisor, the web UI and the capture action all ask for detections on
+    the same frames; the first caller runs the model and everyone else reuses
+    the result. Concurrent callers for a frame that is still being inferred wait
+    for that inference instead of starting their own.
+    """
+
+    def __init__(self, detector: DogHumanDetector, max_entries: int = 8):
+        self.detector = detector
+        self.max_entries = max_entries
+        self._results: "OrderedDict[int, DetectionResult]" = OrderedDict()
+        self._pending: Dict[int, threading.Event] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, seq: int) -> Optional[DetectionResult]:
+        with self._lock:
+            result = self._results.get(seq)
+            if result is not None:
+                self._results.move_to_end(seq)
+                self.hits += 1
+            return result
+
+    def get_or_detect(self, seq: int, frame: np.ndarray) -> DetectionResult:
+        with self._lock:
+            result = self._results.get(seq)
+            if result is not None:
+                self._results.move_to_end(seq)
+                self.hits += 1
+                return result
+
+            pending = self._pending.get(seq)
+            is_owner = pending is None
+            if is_owner:
+                pending = threading.Event()
+                self._pending[seq] = pending
+                self.misses += 1
+
+        if not is_owner:
+            pending.wait()
+            result = self.get(seq)
+            if result is not None:
+                return result
+            # The inference we waited on failed; run it ourselves
+            return self.detector.classify(frame)
+
+        try:
+            result = self.detector.classify(frame)
+            with self._lock:
+                self._results[seq] = result
+                while len(self._results) > self.max_entries:
+                    self._results.popitem(last=False)
+            return result
+        finally:
+            with self._lock:
+                self._pending.pop(seq, None)
+            pending.set()
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._results),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0
+            }
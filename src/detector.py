@@ -4,6 +4,10 @@ from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 import cv2
 from datetime import datetime
+import logging
+
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -15,6 +19,15 @@ class Detection:
     class_id: int
 
 
+@dataclass
+class DetectionResult:
+    detections: List[Detection]
+    dogs: List[Detection]
+    humans: List[Detection]
+    is_unsupervised: bool
+    timestamp: datetime
+
+
 class DogHumanDetector:
     DOG_CLASSES = ["dog"]
     HUMAN_CLASSES = ["person"]
@@ -33,10 +46,12 @@ class DogHumanDetector:
             idx for idx, name in self.class_names.items()
             if name.lower() in self.HUMAN_CLASSES
         ]
+        self.tracked_class_ids = set(self.dog_class_ids + self.human_class_ids)
 
-        print(f"Initialized detector with model: {model_name}")
-        print(f"Dog class IDs: {self.dog_class_ids}")
-        print(f"Human class IDs: {self.human_class_ids}")
+        logger.info(
+            "Initialized detector with model: %s (dog class IDs %s, human class IDs %s)",
+            model_name, self.dog_class_ids, self.human_class_ids
+        )
 
     def detect(self, frame: np.ndarray) -> List[Detection]:
         results = self.model(frame, conf=self.confidence_threshold, verbose=False)
@@ -53,7 +68,7 @@ class DogHumanDetector:
                 class_id = int(boxes.cls[i])
                 confidence = float(boxes.conf[i])
 
-                if class_id not in self.dog_class_ids + self.human_class_ids:
+                if class_id not in self.tracked_class_ids:
                     continue
 
                 x1, y1, x2, y2 = boxes.xyxy[i].tolist()
@@ -69,20 +84,43 @@ class DogHumanDetector:
 
         return detections
 
-    def detect_dogs(self, frame: np.ndarray) -> List[Detection]:
-        all_detections = self.detect(frame)
-        return [d for d in all_detections if d.class_id in self.dog_class_ids]
-
-    def detect_humans(self, frame: np.ndarray) -> List[Detection]:
-        all_detections = self.detect(frame)
-        return [d for d in all_detections if d.class_id in self.human_class_ids]
+    def classify(self, frame: np.ndarray) -> DetectionResult:
+        """Run the model once and split the result into dogs, humans and the supervision verdict."""
+        return self.classify_detections(self.detect(frame))
+
+    def classify_detections(self, detections: List[Detection]) -> DetectionResult:
+        dogs = self.detect_dogs(detections=detections)
+        humans = self.detect_humans(detections=detections)
+
+        return DetectionResult(
+            detections=detections,
+            dogs=dogs,
+            humans=humans,
+            is_unsupervised=len(dogs) > 0 and len(humans) == 0,
+            timestamp=detections[0].timestamp if detections else datetime.now()
+        )
+
+    def detect_dogs(
+        self,
+        frame: Optional[np.ndarray] = None,
+        detections: Optional[List[Detection]] = None
+    ) -> List[Detection]:
+        if detections is None:
+            detections = self.detect(frame)
+        return [d for d in detections if d.class_id in self.dog_class_ids]
+
+    def detect_humans(
+        self,
+        frame: Optional[np.ndarray] = None,
+        detections: Optional[List[Detection]] = None
+    ) -> List[Detection]:
+        if detections is None:
+            detections = self.detect(frame)
+        return [d for d in detections if d.class_id in self.human_class_ids]
 
     def is_dog_unsupervised(self, frame: np.ndarray) -> Tuple[bool, List[Detection], List[Detection]]:
-        dogs = self.detect_dogs(frame)
-        humans = self.detect_humans(frame)
-
-        is_unsupervised = len(dogs) > 0 and len(humans) == 0
-        return is_unsupervised, dogs, humans
+        result = self.classify(frame)
+        return result.is_unsupervised, result.dogs, result.humans
 
     def draw_detections(self, frame: np.ndarray, detections: List[Detection]) -> np.ndarray:
         annotated_frame = frame.copy()
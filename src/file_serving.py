@@ -0,0 +1,215 @@
+import os
+import secrets
+import stat
+import time
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, MalformedRangeHeader, RangeNotSatisfiable, Response
+from starlette.types import Receive, Scope, Send
+
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# Files modified this recently may still be growing (a recording in progress),
+# so clients must revalidate them instead of caching them forever
+SETTLE_SECONDS = 60
+
+MAX_RANGES = 16
+ZEROCOPY_EXTENSION = "http.response.zerocopysend"
+
+
+class MediaFileResponse(FileResponse):
+    """FileResponse for recordings, captures and thumbnails.
+
+    On top of Starlette's ETag, Last-Modified and byte range support it
+    answers If-None-Match / If-Modified-Since with 304, validates ranges
+    strictly (suffix ranges larger than the file are clamped, overlapping
+    ranges merged, other units and absurd range lists ignored) and sends file bodies with
+    the ASGI zero-copy extension when the server offers it. Otherwise the
+    body is read with pread in large chunks on a worker thread, so no thread
+    is held between chunks while a slow viewer drains the socket.
+
+    The _handle_* and _parse_range_header overrides hook into private
+    FileResponse methods, which is why starlette is pinned in requirements.txt;
+    check them against the new FileResponse.__call__ before upgrading.
+    """
+
+    chunk_size = 256 * 1024
+
+    def __init__(self, path, stat_result: os.stat_result, media_type: str, filename: Optional[str] = None):
+        super().__init__(path, media_type=media_type, filename=filename, stat_result=stat_result)
+        settled = time.time() - stat_result.st_mtime > SETTLE_SECONDS
+        self.headers["cache-control"] = IMMUTABLE_CACHE_CONTROL if settled else REVALIDATE_CACHE_CONTROL
+        self.zerocopy = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if self._not_modified(Headers(scope=scope)):
+            response = Response(status_code=304, headers={
+                key: self.headers[key] for key in ("etag", "last-modified", "cache-control")
+            })
+            return await response(scope, receive, send)
+
+        http_range = Headers(scope=scope).get("range")
+        if http_range is not None and self._ignores_range(http_range):
+            # RFC 9110 §14.2: ignore the field and send the whole file with 200
+            scope = {**scope, "headers": [(key, value) for key, value in scope["headers"] if key.lower() != b"range"]}
+
+        self.zerocopy = ZEROCOPY_EXTENSION in scope.get("extensions", {})
+        await super().__call__(scope, receive, send)
+
+    def _not_modified(self, request_headers: Headers) -> bool:
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match is not None:
+            # Weak comparison, as RFC 9110 requires for If-None-Match
+            etag = self.headers["etag"]
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            return "*" in tags or etag in tags
+
+        if_modified_since = request_headers.get("if-modified-since")
+        if if_modified_since is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(self.stat_result.st_mtime) <= since
+        return False
+
+    @staticmethod
+    def _ignores_range(http_range: str) -> bool:
+        """Range headers answered with the full file: units other than bytes, or too many ranges."""
+        units, _, spec = http_range.partition("=")
+        if units.strip().lower() != "bytes":
+            return True
+        return sum(1 for part in spec.split(",") if part.strip()) > MAX_RANGES
+
+    @staticmethod
+    def _parse_range_header(http_range: str, file_size: int) -> List[Tuple[int, int]]:
+        """Half-open (start, end) byte ranges, sorted and merged."""
+        # __call__ has already dropped other units and over-long range lists
+        _, _, spec = http_range.partition("=")
+        parts = [part.strip() for part in spec.split(",") if part.strip()]
+        if not parts:
+            raise MalformedRangeHeader("Range header: no ranges")
+
+        ranges = []
+        for part in parts:
+            first, sep, last = part.partition("-")
+            first, last = first.strip(), last.strip()
+            if not sep or not (first or last) or any(value and not value.isdigit() for value in (first, last)):
+                raise MalformedRangeHeader(f"Range header: invalid range {part!r}")
+
+            if not first:
+                # Suffix range: the last N bytes, or the whole file if it's shorter
+                length = int(last)
+                if length > 0 and file_size > 0:
+                    ranges.append((max(0, file_size - length), file_size))
+                continue
+
+            start = int(first)
+            if last and int(last) < start:
+                raise MalformedRangeHeader("Range header: start must not exceed end")
+            if start < file_size:
+                ranges.append((start, min(int(last) + 1, file_size) if last else file_size))
+
+        if not ranges:
+            raise RangeNotSatisfiable(file_size)
+
+        ranges.sort()
+        merged = [ranges[0]]
+        for start, end in ranges[1:]:
+            last_start, last_end = merged[-1]
+            if start <= last_end:
+                merged[-1] = (last_start, max(last_end, end))
+            else:
+                merged.append((start, end))
+        return merged
+
+    async def _handle_simple(self, send: Send, send_header_only: bool) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        await self._send_body(send, 0, self.stat_result.st_size, send_header_only)
+
+    async def _handle_single_range(self, send: Send, start: int, end: int, file_size: int, send_header_only: bool) -> None:
+        self.headers["content-range"] = f"bytes {start}-{end - 1}/{file_size}"
+        self.headers["content-length"] = str(end - start)
+        await send({"type": "http.response.start", "status": 206, "headers": self.raw_headers})
+        await self._send_body(send, start, end, send_header_only)
+
+    async def _handle_multiple_ranges(
+        self, send: Send, ranges: List[Tuple[int, int]], file_size: int, send_header_only: bool
+    ) -> None:
+        # Starlette's version puts the boundary in Content-Range and miscounts
+        # Content-Length, which breaks strict clients; build the RFC 9110 body here
+        boundary = secrets.token_hex(13)
+        part_headers = [
+            (
+                f"--{boundary}\r\n"
+                f"Content-Type: {self.media_type}\r\n"
+                f"Content-Range: bytes {start}-{end - 1}/{file_size}\r\n\r\n"
+            ).encode("latin-1")
+            for start, end in ranges
+        ]
+        closing = f"\r\n--{boundary}--\r\n".encode("latin-1")
+        separator = b"\r\n"
+        content_length = (
+            sum(len(header) + end - start for header, (start, end) in zip(part_headers, ranges))
+            + len(separator) * (len(ranges) - 1)
+            + len(closing)
+        )
+
+        self.headers["content-type"] = f"multipart/byteranges; boundary={boundary}"
+        self.headers["content-length"] = str(content_length)
+        await send({"type": "http.response.start", "status": 206, "headers": self.raw_headers})
+        if send_header_only:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        file = await anyio.to_thread.run_sync(open, self.path, "rb")
+        with file:
+            fd = file.fileno()
+            for index, (header, (start, end)) in enumerate(zip(part_headers, ranges)):
+                await send({"type": "http.response.body", "body": (separator if index else b"") + header, "more_body": True})
+                while start < end:
+                    chunk = await anyio.to_thread.run_sync(os.pread, fd, min(self.chunk_size, end - start), start)
+                    if not chunk:
+                        break
+                    start += len(chunk)
+                    await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": closing, "more_body": False})
+
+    async def _send_body(self, send: Send, start: int, end: int, send_header_only: bool) -> None:
+        if send_header_only or start >= end:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        file = await anyio.to_thread.run_sync(open, self.path, "rb")
+        with file:
+            if self.zerocopy:
+                await send({"type": ZEROCOPY_EXTENSION, "file": file, "offset": start, "count": end - start})
+                return
+
+            fd = file.fileno()
+            while start < end:
+                chunk = await anyio.to_thread.run_sync(os.pread, fd, min(self.chunk_size, end - start), start)
+                if not chunk:
+                    # File was truncated underneath us; end the response instead of spinning
+                    break
+                start += len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": start < end})
+            if start < end:
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+async def media_file_response(path: Path, media_type: str, filename: Optional[str] = None) -> Optional[MediaFileResponse]:
+    """MediaFileResponse for path, or None if it isn't a regular file."""
+    try:
+        stat_result = await anyio.to_thread.run_sync(os.stat, path)
+    except FileNotFoundError:
+        return None
+    if not stat.S_ISREG(stat_result.st_mode):
+        return None
+    return MediaFileResponse(path, stat_result, media_type, filename=filename)
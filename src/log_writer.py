@@ -0,0 +1,276 @@
+import asyncio
+import gzip
+import json
+import logging
+import os
+import shutil
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import IO, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+class RotatingJsonlWriter:
+    """Buffered JSON-lines writer with daily and size-based rotation.
+
+    write() only serializes the record and appends it to an in-memory
+    buffer, so it is cheap to call from the event loop and safe to call
+    from other threads (the logging queue listener uses it). A background
+    task flushes the buffer on a worker thread every flush_interval_seconds,
+    or sooner once buffer_bytes have accumulated, into a file that stays
+    open between flushes.
+
+    Files are named <prefix>_YYYYMMDD.log after the day each record was
+    written. A day's file that grows past max_bytes is renamed to
+    <prefix>_YYYYMMDD.N.log and a new one started. The open file is closed
+    at midnight even if nothing more is written. Finished files (earlier
+    days and size-rotated segments) are gzipped when compress is set,
+    including ones a previous run left behind, which are picked up on start().
+    """
+
+    def __init__(
+        self,
+        directory: str = "logs",
+        prefix: str = "events",
+        flush_interval_seconds: float = 1.0,
+        buffer_bytes: int = 64 * 1024,
+        max_bytes: int = 10 * 1024 * 1024,
+        compress: bool = True,
+        max_buffered_records: int = 10000
+    ):
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.flush_interval_seconds = flush_interval_seconds
+        self.buffer_bytes = buffer_bytes
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.max_buffered_records = max_buffered_records
+
+        self.buffer: List[Tuple[str, bytes]] = []
+        self.buffered_bytes = 0
+        self.buffer_lock = threading.Lock()
+        # Serializes flushes; the file handle is only touched while holding it
+        self.file_lock = threading.Lock()
+        self.file: Optional[IO[bytes]] = None
+        self.file_day: Optional[str] = None
+        self.file_size = 0
+        # Latest day written; records stamped just before midnight that are flushed
+        # after the rollover go to the new day instead of reopening a finished file
+        self.last_day: Optional[str] = None
+
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.flush_requested: Optional[asyncio.Event] = None
+        self.task: Optional[asyncio.Task] = None
+
+        self.records_written = 0
+        self.bytes_written = 0
+        self.flushes = 0
+        self.rotations = 0
+        self.dropped = 0
+        self.errors = 0
+
+    def path_for(self, day: str) -> Path:
+        return self.directory / f"{self.prefix}_{day}.log"
+
+    def start(self):
+        if self.task is None or self.task.done():
+            self.loop = asyncio.get_running_loop()
+            self.flush_requested = asyncio.Event()
+            self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        # Whatever is still buffered goes out before the file is closed
+        await asyncio.get_running_loop().run_in_executor(None, self._flush_and_close)
+
+    def write(self, record: dict):
+        """Buffer one record. Never blocks on I/O; callable from any thread."""
+        line = (json.dumps(record, default=str) + "\n").encode("utf-8")
+        day = datetime.now().strftime("%Y%m%d")
+        with self.buffer_lock:
+            if len(self.buffer) >= self.max_buffered_records:
+                # The disk can't keep up; shed the newest rather than grow without bound
+                self.dropped += 1
+                return
+            self.buffer.append((day, line))
+            self.buffered_bytes += len(line)
+            full = self.buffered_bytes >= self.buffer_bytes
+
+        if full and self.loop is not None:
+            try:
+                self.loop.call_soon_threadsafe(self.flush_requested.set)
+            except RuntimeError:
+                # The loop has closed (shutting down); stop() flushes what's left
+                pass
+
+    async def flush(self):
+        await asyncio.get_running_loop().run_in_executor(None, self._flush)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        if self.compress:
+            try:
+                await loop.run_in_executor(None, self._compress_leftovers)
+            except Exception as e:
+                self.errors += 1
+                logger.error("✗ Failed to compress old %s logs: %s", self.prefix, e)
+
+        while True:
+            try:
+                await asyncio.wait_for(self.flush_requested.wait(), self._next_wakeup())
+            except asyncio.TimeoutError:
+                pass
+            self.flush_requested.clear()
+            try:
+                if self.buffer:
+                    await self.flush()
+                if self.file_day is not None and self.file_day != datetime.now().strftime("%Y%m%d"):
+                    await loop.run_in_executor(None, self._close_finished_day)
+            except Exception as e:
+                self.errors += 1
+                logger.error("✗ Failed to flush %s log: %s", self.prefix, e)
+
+    def _next_wakeup(self) -> float:
+        """Seconds until the next periodic flush, or midnight if that comes first."""
+        now = datetime.now()
+        midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        return max(0.0, min(self.flush_interval_seconds, (midnight - now).total_seconds()))
+
+    def _flush(self):
+        with self.buffer_lock:
+            pending, self.buffer = self.buffer, []
+            self.buffered_bytes = 0
+        if not pending:
+            return
+
+        finished: List[Path] = []
+        with self.file_lock:
+            for day, line in pending:
+                if self.last_day is not None and day < self.last_day:
+                    day = self.last_day
+                self.last_day = day
+                if day != self.file_day:
+                    finished.extend(self._open_day(day))
+                elif self.file_size > 0 and self.file_size + len(line) > self.max_bytes:
+                    finished.extend(self._rotate_by_size())
+                self.file.write(line)
+                self.file_size += len(line)
+                self.bytes_written += len(line)
+            self.file.flush()
+            self.records_written += len(pending)
+            self.flushes += 1
+
+        if self.compress:
+            for path in finished:
+                self._compress(path)
+
+    def _open_day(self, day: str) -> List[Path]:
+        finished = []
+        if self.file is not None:
+            self.file.close()
+            finished.append(self.path_for(self.file_day))
+            self.rotations += 1
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.path_for(day)
+        self.file = open(path, "ab")
+        self.file_day = day
+        self.file_size = path.stat().st_size
+        if self.file_size >= self.max_bytes:
+            finished.extend(self._rotate_by_size())
+        return finished
+
+    def _close_finished_day(self):
+        """Close yesterday's file once the day is over, without waiting for the next record."""
+        finished = None
+        with self.file_lock:
+            if self.file is not None and self.file_day != datetime.now().strftime("%Y%m%d"):
+                self.file.close()
+                finished = self.path_for(self.file_day)
+                self.file = None
+                self.file_day = None
+                self.rotations += 1
+        if finished is not None and self.compress:
+            self._compress(finished)
+
+    def _compress_leftovers(self):
+        """Gzip files a previous run finished but never compressed (earlier days, size segments)."""
+        if not self.directory.exists():
+            return
+        today = datetime.now().strftime("%Y%m%d")
+        for path in sorted(self.directory.glob(f"{self.prefix}_*.log")):
+            day, _, segment = path.name[len(self.prefix) + 1:-len(".log")].partition(".")
+            if not (day.isdigit() and len(day) == 8):
+                continue
+            with self.file_lock:
+                in_use = self.file is not None and path == self.path_for(self.file_day)
+            if not in_use and (day < today or segment):
+                self._compress(path)
+
+    def _rotate_by_size(self) -> List[Path]:
+        self.file.close()
+        path = self.path_for(self.file_day)
+        index = 1
+        while any(
+            self.directory.joinpath(f"{self.prefix}_{self.file_day}.{index}.log{suffix}").exists()
+            for suffix in ("", ".gz")
+        ):
+            index += 1
+        segment = self.directory / f"{self.prefix}_{self.file_day}.{index}.log"
+        os.replace(path, segment)
+
+        self.file = open(path, "ab")
+        self.file_size = 0
+        self.rotations += 1
+        return [segment]
+
+    def _compress(self, path: Path):
+        if not path.exists():
+            return
+        target = path.with_name(path.name + ".gz")
+        tmp = path.with_name(f".{path.name}.gz.tmp")
+        try:
+            with open(path, "rb") as src, gzip.open(tmp, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            if target.exists():
+                # Same day compressed before (e.g. across a restart); gzip members concatenate
+                with open(tmp, "rb") as src, open(target, "ab") as dst:
+                    shutil.copyfileobj(src, dst)
+                tmp.unlink()
+            else:
+                os.replace(tmp, target)
+            path.unlink()
+        except OSError as e:
+            self.errors += 1
+            logger.error("✗ Failed to compress %s: %s", path.name, e)
+            if tmp.exists():
+                tmp.unlink()
+
+    def _flush_and_close(self):
+        self._flush()
+        with self.file_lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+                self.file_day = None
+
+    def get_stats(self) -> dict:
+        return {
+            "file": self.path_for(self.file_day).name if self.file_day else None,
+            "buffered": len(self.buffer),
+            "records_written": self.records_written,
+            "bytes_written": self.bytes_written,
+            "flushes": self.flushes,
+            "rotations": self.rotations,
+            "dropped": self.dropped,
+            "errors": self.errors
+        }
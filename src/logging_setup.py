@@ -0,0 +1,131 @@
+import copy
+import logging
+import logging.handlers
+import queue
+import sys
+from datetime import datetime
+from typing import Dict, Optional
+
+from .log_writer import RotatingJsonlWriter
+
+
+CONSOLE_FORMAT = "%(asctime)s %(levelname)-7s [%(name)s] %(message)s"
+
+# Attributes every LogRecord has; anything else came in through extra= and is a structured field
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def logger_name(module: str) -> str:
+    """Full logger name for a short module name from the config ("supervisor" -> "src.supervisor")."""
+    module = module.strip()
+    if module in ("main", "root") or "." in module:
+        return module
+    return f"src.{module}"
+
+
+def parse_module_levels(spec: str) -> Dict[str, int]:
+    """Parse "supervisor=DEBUG,web_app=WARNING" into logger names and levels."""
+    levels = {}
+    for item in (spec or "").split(","):
+        if not item.strip():
+            continue
+        module, sep, level = item.partition("=")
+        numeric = logging.getLevelName(level.strip().upper())
+        if not sep or not isinstance(numeric, int):
+            raise ValueError(f"Invalid log level setting {item.strip()!r} (expected module=LEVEL)")
+        levels[logger_name(module)] = numeric
+    return levels
+
+
+class RecordQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that passes records to the listener with exc_info intact.
+
+    The stock prepare() formats the message and any traceback on the calling
+    thread and folds the traceback into msg, so handlers behind the listener
+    never see exc_info. Here only the message is merged with its args (so
+    later changes to those objects can't alter it); the traceback and the
+    rest of the formatting are left to the listener's handlers.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        return record
+
+
+class JsonlLogHandler(logging.Handler):
+    """Writes records as JSON lines through a RotatingJsonlWriter."""
+
+    def __init__(self, writer: RotatingJsonlWriter, level: int = logging.NOTSET):
+        super().__init__(level)
+        self.writer = writer
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            entry = {
+                "timestamp": self.formatTime(record),
+                "level": record.levelname,
+                "logger": record.name,
+                "message": record.getMessage()
+            }
+            for key, value in vars(record).items():
+                if key not in _RECORD_ATTRIBUTES:
+                    entry[key] = value
+            if record.exc_info:
+                entry["exception"] = logging.Formatter().formatException(record.exc_info)
+            self.writer.write(entry)
+        except Exception:
+            self.handleError(record)
+
+    def formatTime(self, record: logging.LogRecord) -> str:
+        return datetime.fromtimestamp(record.created).isoformat()
+
+
+def configure_logging(
+    level: str = "INFO",
+    module_levels: str = "",
+    json_writer: Optional[RotatingJsonlWriter] = None
+) -> logging.handlers.QueueListener:
+    """Route all logging through a queue so callers never wait on stdout or disk.
+
+    The calling thread only merges the message with its arguments and
+    enqueues the record; a listener thread adds timestamps and tracebacks
+    and writes it to the console and, when json_writer is given, to the
+    JSON-lines log. Records below a logger's level are discarded before any
+    formatting, so debug calls on hot paths cost a level check at INFO.
+    """
+    global _listener
+    shutdown_logging()
+
+    handlers = []
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+    handlers.append(console)
+    if json_writer is not None:
+        handlers.append(JsonlLogHandler(json_writer))
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(RecordQueueHandler(log_queue))
+    root.setLevel(level.upper())
+
+    for name, numeric in parse_module_levels(module_levels).items():
+        logging.getLogger(name).setLevel(numeric)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging():
+    """Drain the queue and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,150 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional, Tuple
+
+import cv2
+
+from .workers import vision_pool
+
+
+logger = logging.getLogger(__name__)
+
+
+RECORDING = "recording"
+CAPTURE = "capture"
+
+
+def local_to_utc(value: datetime) -> datetime:
+    """Naive local time (as in media filenames) to naive UTC, the convention event timestamps use."""
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def parse_recording_filename(path: Path) -> Optional[datetime]:
+    """Creation time from alert_YYYYMMDD_HHMMSS.mp4, or None if it doesn't match."""
+    parts = path.stem.split("_")
+    if len(parts) >= 3:
+        try:
+            return datetime.strptime(f"{parts[1]}_{parts[2]}", "%Y%m%d_%H%M%S")
+        except ValueError:
+            return None
+    return None
+
+
+def parse_capture_filename(path: Path) -> Tuple[Optional[datetime], Optional[str]]:
+    """(creation time, state) from capture_YYYYMMDD_HHMMSS_state.jpg."""
+    parts = path.stem.split("_")
+    if len(parts) >= 4:
+        try:
+            return datetime.strptime(f"{parts[1]}_{parts[2]}", "%Y%m%d_%H%M%S"), parts[3]
+        except ValueError:
+            return None, None
+    return None, None
+
+
+def read_video_duration(file_path: Path) -> float:
+    try:
+        cap = cv2.VideoCapture(str(file_path))
+        if cap.isOpened():
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+            cap.release()
+
+            if fps > 0:
+                return frame_count / fps
+        return 0.0
+    except Exception:
+        return 0.0
+
+
+class MediaCatalog:
+    """Index of recordings and captures, kept in the database.
+
+    Actions register files as they finish writing them, so listing media is
+    an indexed query instead of a directory scan with a cv2 open per video.
+    backfill() brings the index in line with what is on disk at startup.
+    created_at arguments are local time, as in the filenames; the catalog
+    stores UTC like event timestamps.
+    """
+
+    def __init__(self, database, recordings_dir: str = "recordings", captures_dir: str = "captures", thumbnails=None):
+        self.database = database
+        self.thumbnails = thumbnails
+        self.directories = {
+            RECORDING: (Path(recordings_dir), "alert_*.mp4"),
+            CAPTURE: (Path(captures_dir), "capture_*.jpg")
+        }
+
+    async def record_recording(
+        self,
+        path: Path,
+        duration_seconds: Optional[float] = None,
+        state: Optional[str] = None,
+        created_at: Optional[datetime] = None
+    ):
+        await self._record(RECORDING, Path(path), created_at or parse_recording_filename(Path(path)), duration_seconds, state)
+
+    async def record_capture(self, path: Path, state: Optional[str] = None, created_at: Optional[datetime] = None):
+        await self._record(CAPTURE, Path(path), created_at or parse_capture_filename(Path(path))[0], None, state)
+
+    async def _record(self, kind: str, path: Path, created_at: Optional[datetime], duration_seconds, state):
+        try:
+            stat = await asyncio.get_running_loop().run_in_executor(None, path.stat)
+        except FileNotFoundError:
+            return
+        await self.database.add_media(
+            kind,
+            path.name,
+            local_to_utc(created_at) if created_at else datetime.utcfromtimestamp(stat.st_mtime),
+            stat.st_size,
+            duration_seconds,
+            state
+        )
+
+    def submit_thumbnail(self, kind: str, filename: str, frame) -> bool:
+        """Queue a preview rendered from a frame already in memory. Call from the event loop thread."""
+        if self.thumbnails is None:
+            return False
+        return self.thumbnails.submit(kind, filename, frame)
+
+    def source_path(self, kind: str, filename: str) -> Path:
+        return self.directories[kind][0] / filename
+
+    async def forget(self, kind: str, filenames) -> int:
+        filenames = list(filenames)
+        if self.thumbnails:
+            for filename in filenames:
+                self.thumbnails.delete(kind, filename)
+        return await self.database.delete_media(kind, filenames)
+
+    async def list_media(self, kind: str, limit: int = 50, cursor: Optional[str] = None, state: Optional[str] = None):
+        items, next_cursor = await self.database.get_media_page(kind, limit=limit, cursor=cursor, state_filter=state)
+        for item in items:
+            item["thumbnail_url"] = self.thumbnails.url_for(kind, item["filename"]) if self.thumbnails else None
+        return items, next_cursor
+
+    async def backfill(self) -> dict:
+        """Catalog files that are on disk but not indexed, and drop entries whose file is gone."""
+        added = removed = 0
+        for kind, (directory, pattern) in self.directories.items():
+            on_disk = await asyncio.get_running_loop().run_in_executor(
+                None, lambda: {path.name: path for path in directory.glob(pattern)} if directory.exists() else {}
+            )
+            indexed = await self.database.get_media_filenames(kind)
+
+            removed += await self.forget(kind, indexed - on_disk.keys())
+
+            for name in sorted(on_disk.keys() - indexed):
+                path = on_disk[name]
+                if kind == RECORDING:
+                    duration = await vision_pool.run(read_video_duration, path)
+                    await self.record_recording(path, duration_seconds=duration)
+                else:
+                    _, state = parse_capture_filename(path)
+                    await self.record_capture(path, state=state)
+                added += 1
+
+        if added or removed:
+            logger.info("Catalog backfill: %d added, %d removed", added, removed)
+        return {"added": added, "removed": removed}
@@ -0,0 +1,225 @@
+import logging
+import tempfile
+import threading
+import time
+from pathlib import Path
+from queue import Queue, Full
+from typing import Iterable, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+# Browser-compatible codecs in order of preference
+VIDEO_CODECS = [
+    'avc1',  # H.264 (best browser support)
+    'H264',  # H.264 alternative
+    'XVID',  # MPEG-4 Part 2
+    'mp4v',  # Fallback
+]
+
+logger = logging.getLogger(__name__)
+
+_codec_probe: Optional[dict] = None
+_codec_probe_lock = threading.Lock()
+
+
+def probe_video_codec(
+    frame_size: Tuple[int, int] = (640, 480),
+    fps: float = 20,
+    scratch_dir: Optional[str] = None
+) -> dict:
+    """Find the first codec cv2.VideoWriter can actually write, once per process.
+
+    Probing happens in a throwaway directory so failed attempts never leave
+    empty files next to real recordings. The result is cached; call
+    reset_video_codec_probe() to force a new probe.
+    """
+    global _codec_probe
+
+    with _codec_probe_lock:
+        if _codec_probe is not None:
+            return _codec_probe
+
+        started = time.perf_counter()
+        tried = []
+        selected = None
+        blank = np.zeros((frame_size[1], frame_size[0], 3), dtype=np.uint8)
+
+        with tempfile.TemporaryDirectory(prefix="codec_probe_", dir=scratch_dir) as tmp:
+            for codec_name in VIDEO_CODECS:
+                path = Path(tmp) / f"probe_{codec_name}.mp4"
+                out = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*codec_name), fps, frame_size)
+                opened = out.isOpened()
+                if opened:
+                    out.write(blank)
+                out.release()
+
+                works = opened and path.exists() and path.stat().st_size > 0
+                tried.append({"codec": codec_name, "works": works})
+                if works:
+                    selected = codec_name
+                    break
+
+        _codec_probe = {
+            "codec": selected,
+            "tried": tried,
+            "probe_ms": round((time.perf_counter() - started) * 1000, 1)
+        }
+        logger.info("Codec probe selected %s in %sms", selected, _codec_probe["probe_ms"])
+        return _codec_probe
+
+
+def get_video_codec_probe() -> Optional[dict]:
+    return _codec_probe
+
+
+def reset_video_codec_probe():
+    global _codec_probe
+    with _codec_probe_lock:
+        _codec_probe = None
+
+
+class RecordingWriter:
+    """Writes camera frames to a cv2.VideoWriter on a dedicated thread.
+
+    Frames are submitted with their capture timestamps and placed in the
+    constant-rate container by timestamp: each captured frame is written once,
+    and a gap (camera stall, lower-rate pre-roll) is filled by holding the
+    previous frame so the clip's duration matches real time. submit() never
+    blocks; if the writer falls behind, live frames are dropped and counted.
+    Pre-roll goes through submit_preroll(), which waits for queue space
+    instead, since it arrives all at once and is the footage that matters most.
+    """
+
+    _STOP = object()
+
+    def __init__(self, out: cv2.VideoWriter, fps: float, frame_size: Tuple[int, int], queue_size: int = 32):
+        self.out = out
+        self.fps = fps
+        self.frame_size = frame_size
+        self.queue: Queue = Queue(maxsize=queue_size)
+        self.thread = threading.Thread(target=self._run, name="recording-writer", daemon=True)
+        # Set by close() when the thread outlives its timeout; the thread then
+        # releases the VideoWriter itself once it stops writing to it
+        self.release_lock = threading.Lock()
+        self.release_on_exit = False
+
+        self.last_submitted: Optional[float] = None
+        self.first_timestamp: Optional[float] = None
+        self.last_timestamp: Optional[float] = None
+        self.next_index = 0
+        self.last_written: Optional[np.ndarray] = None
+
+        self.frames_received = 0
+        self.frames_written = 0
+        self.frames_repeated = 0
+        self.frames_skipped = 0
+        self.frames_dropped = 0
+
+    def start(self):
+        self.thread.start()
+
+    def submit(self, frame: np.ndarray, timestamp: float) -> bool:
+        return self._enqueue(frame, timestamp)
+
+    def submit_encoded(self, jpeg: bytes, timestamp: float) -> bool:
+        return self._enqueue(jpeg, timestamp)
+
+    def submit_preroll(self, entries: Iterable[Tuple[float, int, bytes]]) -> int:
+        """Queue buffered (timestamp, seq, jpeg) frames, waiting for space. Blocks."""
+        return sum(self._enqueue(jpeg, timestamp, block=True) for timestamp, _seq, jpeg in entries)
+
+    def _enqueue(self, item, timestamp: float, block: bool = False) -> bool:
+        # Frames must arrive in capture order; anything at or before the last
+        # submitted timestamp is already covered (e.g. pre-roll overlap)
+        if self.last_submitted is not None and timestamp <= self.last_submitted:
+            return False
+        try:
+            self.queue.put((item, timestamp), block=block)
+        except Full:
+            self.frames_dropped += 1
+            return False
+        self.last_submitted = timestamp
+        return True
+
+    def close(self, timeout: float = 10.0) -> dict:
+        """Drain the queue, release the writer and return recording stats. Blocks."""
+        try:
+            self.queue.put((self._STOP, None), timeout=timeout)
+        except Full:
+            pass
+        self.thread.join(timeout)
+        with self.release_lock:
+            if self.thread.is_alive():
+                # Still inside out.write(); releasing now would pull the writer out from under it
+                self.release_on_exit = True
+                logger.warning("⚠ Writer thread still busy after %ss, it will release the file when done", timeout)
+            else:
+                self.out.release()
+        return self.get_stats()
+
+    def _run(self):
+        try:
+            while True:
+                item, timestamp = self.queue.get()
+                if item is self._STOP:
+                    break
+                try:
+                    self._write(item, timestamp)
+                except Exception as e:
+                    logger.error("✗ Frame write error: %s", e)
+                if self.release_on_exit and self.queue.empty():
+                    # close() gave up waiting and may not have fit its stop marker in the queue
+                    break
+        finally:
+            with self.release_lock:
+                if self.release_on_exit:
+                    self.out.release()
+
+    def _write(self, item, timestamp: float):
+        if isinstance(item, bytes):
+            frame = cv2.imdecode(np.frombuffer(item, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if frame is None:
+                return
+        else:
+            frame = item
+
+        if (frame.shape[1], frame.shape[0]) != self.frame_size:
+            frame = cv2.resize(frame, self.frame_size)
+
+        self.frames_received += 1
+        if self.first_timestamp is None:
+            self.first_timestamp = timestamp
+        self.last_timestamp = timestamp
+
+        index = round((timestamp - self.first_timestamp) * self.fps)
+        if index < self.next_index:
+            # Arrived faster than the container rate; its slot is taken
+            self.frames_skipped += 1
+            return
+
+        while self.last_written is not None and self.next_index < index:
+            self.out.write(self.last_written)
+            self.frames_repeated += 1
+            self.next_index += 1
+
+        self.out.write(frame)
+        self.frames_written += 1
+        self.next_index += 1
+        self.last_written = frame
+
+    def get_stats(self) -> dict:
+        span = 0.0
+        if self.first_timestamp is not None and self.last_timestamp is not None:
+            span = self.last_timestamp - self.first_timestamp
+        return {
+            "container_fps": self.fps,
+            "achieved_fps": round(self.frames_written / span, 2) if span > 0 else 0.0,
+            "duration_seconds": round(self.next_index / self.fps, 2) if self.fps else 0.0,
+            "frames_received": self.frames_received,
+            "frames_written": self.frames_written,
+            "frames_repeated": self.frames_repeated,
+            "frames_skipped": self.frames_skipped,
+            "frames_dropped": self.frames_dropped
+        }
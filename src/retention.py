@@ -0,0 +1,290 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from .media import CAPTURE, RECORDING
+
+
+logger = logging.getLogger(__name__)
+
+
+class RetentionManager:
+    """Periodically trims events and media to the configured age and size limits.
+
+    Work is done in small batches with short pauses in between, so a pass
+    never holds the database write lock for long and the event loop keeps
+    serving viewers. Each pass:
+
+    - deletes events older than max_age_days, batch by batch
+    - deletes captures and recordings older than max_age_days
+    - prunes orphans: captures no event references, empty recordings and
+      snapshot blobs no event references (only once older than the grace period)
+    - deletes the oldest media and events until captures, recordings and
+      snapshots fit in max_disk_mb (0 disables the size quota)
+    - returns freed database pages to the filesystem with incremental VACUUM
+    """
+
+    def __init__(
+        self,
+        database,
+        captures_dir: str = "captures",
+        recordings_dir: str = "recordings",
+        max_age_days: float = 30,
+        max_disk_mb: float = 0,
+        interval_seconds: float = 3600,
+        batch_size: int = 500,
+        batch_pause_seconds: float = 0.05,
+        orphan_grace_seconds: float = 3600,
+        vacuum_pages: int = 1000,
+        media_catalog=None
+    ):
+        self.database = database
+        self.media_catalog = media_catalog
+        self.captures_dir = Path(captures_dir)
+        self.recordings_dir = Path(recordings_dir)
+        self.max_age_days = max_age_days
+        self.max_disk_bytes = int(max_disk_mb * 1024 * 1024)
+        self.interval_seconds = interval_seconds
+        self.batch_size = max(1, batch_size)
+        self.batch_pause_seconds = batch_pause_seconds
+        self.orphan_grace_seconds = orphan_grace_seconds
+        self.vacuum_pages = vacuum_pages
+
+        self.task: Optional[asyncio.Task] = None
+        self.running = False
+        self.runs = 0
+        self.last_run: Optional[dict] = None
+
+    def start(self, initial_delay_seconds: float = 30):
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run(initial_delay_seconds))
+            logger.info(
+                "Scheduled every %.0f min (max age %s days, quota %s)",
+                self.interval_seconds / 60, self.max_age_days,
+                f"{self.max_disk_bytes // (1024 * 1024)}MB" if self.max_disk_bytes else "off"
+            )
+
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    async def _run(self, initial_delay_seconds: float):
+        await asyncio.sleep(initial_delay_seconds)
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception("✗ Retention pass failed: %s", e)
+            await asyncio.sleep(self.interval_seconds)
+
+    async def run_once(self) -> dict:
+        started = time.perf_counter()
+        self.running = True
+        report = {
+            "started_at": datetime.now().isoformat(),
+            "events_deleted": 0,
+            "files_deleted": 0,
+            "orphans_deleted": 0,
+            "bytes_freed": 0,
+            "pages_vacuumed": 0
+        }
+        try:
+            await self._prune_old_events(report)
+            await self._prune_old_media(report)
+            await self._prune_orphans(report)
+            if self.max_disk_bytes:
+                await self._enforce_quota(report)
+            report["pages_vacuumed"] = await self.database.incremental_vacuum(self.vacuum_pages)
+            report["disk_usage_bytes"] = await self._run_blocking(self._disk_usage)
+        finally:
+            self.running = False
+
+        report["duration_seconds"] = round(time.perf_counter() - started, 2)
+        self.runs += 1
+        self.last_run = report
+
+        if report["events_deleted"] or report["files_deleted"] or report["orphans_deleted"]:
+            logger.info(
+                "✓ Deleted %d events, %d files, %d orphans (%.1fMB) in %ss",
+                report["events_deleted"], report["files_deleted"], report["orphans_deleted"],
+                report["bytes_freed"] / (1024 * 1024), report["duration_seconds"]
+            )
+        return report
+
+    async def _prune_old_events(self, report: dict):
+        cutoff = datetime.utcnow() - timedelta(days=self.max_age_days)
+        while True:
+            deleted, freed = await self.database.delete_events_batch(before=cutoff, limit=self.batch_size)
+            report["events_deleted"] += deleted
+            report["bytes_freed"] += freed
+            if deleted < self.batch_size:
+                return
+            await asyncio.sleep(self.batch_pause_seconds)
+
+    async def _prune_old_media(self, report: dict):
+        cutoff = time.time() - self.max_age_days * 86400
+        expired = [f for f in await self._run_blocking(self._list_media) if f[1] < cutoff]
+        await self._delete_media(expired, report, "files_deleted")
+
+    async def _prune_orphans(self, report: dict):
+        grace_cutoff = time.time() - self.orphan_grace_seconds
+
+        referenced = await self.database.get_referenced_captures()
+        orphans = [
+            f for f in await self._run_blocking(self._list_media)
+            if f[1] < grace_cutoff and (
+                (f[0].parent == self.captures_dir and f[0].name not in referenced)
+                or (f[0].parent == self.recordings_dir and f[2] == 0)
+            )
+        ]
+        await self._delete_media(orphans, report, "orphans_deleted")
+
+        # A blob is written just before its event row commits, so only old blobs can be orphans
+        referenced_hashes = await self.database.get_referenced_snapshot_hashes()
+        blob_store = self.database.blob_store
+
+        def delete_orphan_blobs() -> Tuple[int, int]:
+            deleted = freed = 0
+            for digest in list(blob_store.iter_digests()):
+                if digest in referenced_hashes:
+                    continue
+                path = blob_store.path_for(digest)
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                if stat.st_mtime < grace_cutoff and blob_store.delete(digest):
+                    deleted += 1
+                    freed += stat.st_size
+            return deleted, freed
+
+        deleted, freed = await self._run_blocking(delete_orphan_blobs)
+        report["orphans_deleted"] += deleted
+        report["bytes_freed"] += freed
+
+    async def _enforce_quota(self, report: dict):
+        usage = await self._run_blocking(self._disk_usage)
+        if usage <= self.max_disk_bytes:
+            return
+
+        # Oldest first across media files and events, until back under quota
+        media = sorted(await self._run_blocking(self._list_media), key=lambda f: f[1])
+        media_index = 0
+        while usage > self.max_disk_bytes:
+            oldest_event = await self.database.get_oldest_event_time()
+            oldest_event_ts = oldest_event.replace(tzinfo=timezone.utc).timestamp() if oldest_event else None
+
+            if media_index < len(media) and (oldest_event_ts is None or media[media_index][1] <= oldest_event_ts):
+                batch = []
+                needed = usage - self.max_disk_bytes
+                while (
+                    media_index < len(media)
+                    and len(batch) < self.batch_size
+                    and needed > 0
+                    and (oldest_event_ts is None or media[media_index][1] <= oldest_event_ts)
+                ):
+                    batch.append(media[media_index])
+                    needed -= media[media_index][2]
+                    media_index += 1
+                usage -= await self._delete_media(batch, report, "files_deleted")
+            elif oldest_event_ts is not None:
+                deleted, freed = await self.database.delete_events_batch(limit=min(self.batch_size, 100))
+                report["events_deleted"] += deleted
+                report["bytes_freed"] += freed
+                usage -= freed
+                # Past the last deletable file, only snapshot blobs can bring usage down. A
+                # batch that frees nothing means the rest of the overage is files in use or
+                # still in their grace period, and deleting more history won't change that
+                if deleted == 0 or (freed == 0 and media_index >= len(media)):
+                    break
+            else:
+                break
+            await asyncio.sleep(self.batch_pause_seconds)
+
+    async def _delete_media(self, files: List[Tuple[Path, float, int]], report: dict, counter: str) -> int:
+        if not files:
+            return 0
+
+        def delete_files() -> Tuple[List[str], List[str], int]:
+            deleted_captures = []
+            deleted_recordings = []
+            freed = 0
+            for path, _, size in files:
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    continue
+                freed += size
+                report[counter] += 1
+                if path.parent == self.captures_dir:
+                    deleted_captures.append(path.name)
+                else:
+                    deleted_recordings.append(path.name)
+            return deleted_captures, deleted_recordings, freed
+
+        deleted_captures, deleted_recordings, freed = await self._run_blocking(delete_files)
+        report["bytes_freed"] += freed
+        await self.database.clear_capture_references(deleted_captures)
+        await self._forget_media(CAPTURE, deleted_captures)
+        await self._forget_media(RECORDING, deleted_recordings)
+        return freed
+
+    async def _forget_media(self, kind: str, filenames: List[str]):
+        # Going through the catalog also removes the thumbnails
+        if self.media_catalog:
+            await self.media_catalog.forget(kind, filenames)
+        else:
+            await self.database.delete_media(kind, filenames)
+
+    def _list_media(self) -> List[Tuple[Path, float, int]]:
+        """(path, mtime, size) for every capture and recording, skipping ones still being written."""
+        active_cutoff = time.time() - 60
+        files = []
+        for directory, pattern in ((self.captures_dir, "*.jpg"), (self.recordings_dir, "*.mp4")):
+            if not directory.exists():
+                continue
+            for path in directory.glob(pattern):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                if stat.st_mtime < active_cutoff:
+                    files.append((path, stat.st_mtime, stat.st_size))
+        return files
+
+    def _disk_usage(self) -> int:
+        total = 0
+        for directory in (self.captures_dir, self.recordings_dir, self.database.blob_store.root):
+            if not directory.exists():
+                continue
+            for path in directory.rglob("*"):
+                try:
+                    if path.is_file():
+                        total += path.stat().st_size
+                except FileNotFoundError:
+                    continue
+        return total
+
+    @staticmethod
+    async def _run_blocking(func, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    def get_status(self) -> dict:
+        return {
+            "running": self.running,
+            "runs": self.runs,
+            "interval_seconds": self.interval_seconds,
+            "max_age_days": self.max_age_days,
+            "max_disk_mb": self.max_disk_bytes // (1024 * 1024),
+            "last_run": self.last_run
+        }
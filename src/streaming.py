@@ -0,0 +1,210 @@
+import asyncio
+import base64
+import logging
+import struct
+import time
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Optional, Set
+
+import cv2
+
+from .workers import vision_pool
+
+
+logger = logging.getLogger(__name__)
+
+
+# Binary websocket frame: header followed by the raw JPEG bytes.
+# version, state code, dogs, humans, frame sequence number (network byte order)
+FRAME_HEADER = struct.Struct("!BBBBI")
+FRAME_PROTOCOL_VERSION = 1
+FRAME_STATES = ["idle", "supervised", "unsupervised"]
+
+
+@dataclass
+class EncodedFrame:
+    seq: int
+    jpeg: bytes
+    dogs: int
+    humans: int
+    is_unsupervised: bool
+    timestamp: float
+
+    @property
+    def state(self) -> str:
+        if self.dogs == 0:
+            return "idle"
+        return "unsupervised" if self.is_unsupervised else "supervised"
+
+    @cached_property
+    def binary_message(self) -> bytes:
+        header = FRAME_HEADER.pack(
+            FRAME_PROTOCOL_VERSION,
+            FRAME_STATES.index(self.state),
+            min(self.dogs, 255),
+            min(self.humans, 255),
+            self.seq & 0xFFFFFFFF
+        )
+        return header + self.jpeg
+
+    @cached_property
+    def json_message(self) -> dict:
+        return {
+            "type": "frame",
+            "data": {
+                "image": base64.b64encode(self.jpeg).decode('utf-8'),
+                "dogs": self.dogs,
+                "humans": self.humans,
+                "is_unsupervised": self.is_unsupervised
+            }
+        }
+
+
+class FrameSubscriber:
+    """A single viewer's mailbox. Holds at most one pending frame; a slow
+    viewer simply loses the older frame instead of delaying anyone else."""
+
+    def __init__(self, max_fps: float, binary: bool = True):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        self.max_fps = max_fps
+        # Websocket message format: binary header + JPEG, or the JSON/base64 form
+        self.binary = binary
+        self.last_offered = 0.0
+        self.frames_sent = 0
+        self.frames_dropped = 0
+
+    @property
+    def min_interval(self) -> float:
+        return 1.0 / self.max_fps if self.max_fps > 0 else 0.0
+
+    def offer(self, frame: EncodedFrame):
+        now = time.monotonic()
+        if now - self.last_offered < self.min_interval:
+            return
+        self.last_offered = now
+
+        if self.queue.full():
+            try:
+                self.queue.get_nowait()
+                self.frames_dropped += 1
+            except asyncio.QueueEmpty:
+                pass
+        self.queue.put_nowait(frame)
+
+    async def next_frame(self) -> EncodedFrame:
+        frame = await self.queue.get()
+        self.frames_sent += 1
+        return frame
+
+
+class FrameBroadcaster:
+    """Annotates and JPEG-encodes each new camera frame once and fans the
+    encoded bytes out to every subscriber. The producer task only runs while
+    someone is subscribed."""
+
+    def __init__(self, supervisor, max_fps: float = 10, jpeg_quality: int = 80):
+        self.supervisor = supervisor
+        self.max_fps = max_fps
+        self.jpeg_quality = jpeg_quality
+
+        self.subscribers: Set[FrameSubscriber] = set()
+        self.latest: Optional[EncodedFrame] = None
+        self.producer_task: Optional[asyncio.Task] = None
+        self._encode_lock = asyncio.Lock()
+        self.frames_encoded = 0
+
+    def subscribe(self, max_fps: Optional[float] = None, binary: bool = True) -> FrameSubscriber:
+        subscriber = FrameSubscriber(self._clamp_fps(max_fps), binary)
+        self.subscribers.add(subscriber)
+
+        if self.latest is not None:
+            subscriber.offer(self.latest)
+
+        if self.producer_task is None or self.producer_task.done():
+            self.producer_task = asyncio.create_task(self._produce_loop())
+        self._update_capture_demand()
+        return subscriber
+
+    def unsubscribe(self, subscriber: FrameSubscriber):
+        self.subscribers.discard(subscriber)
+        if not self.subscribers and self.producer_task:
+            self.producer_task.cancel()
+            self.producer_task = None
+        self._update_capture_demand()
+
+    def set_subscriber_fps(self, subscriber: FrameSubscriber, max_fps: Optional[float]):
+        subscriber.max_fps = self._clamp_fps(max_fps)
+        self._update_capture_demand()
+
+    def update_subscriber(self, subscriber: FrameSubscriber, max_fps: Optional[float], binary: bool = True):
+        """Apply a repeated subscribe from an existing viewer: new rate and message format."""
+        subscriber.binary = binary
+        self.set_subscriber_fps(subscriber, max_fps)
+
+    def _update_capture_demand(self):
+        camera = self.supervisor.camera
+        if self.subscribers:
+            camera.request_rate("stream", max(s.max_fps for s in self.subscribers))
+        else:
+            camera.release_rate("stream")
+
+    def _clamp_fps(self, max_fps: Optional[float]) -> float:
+        if not max_fps or max_fps <= 0:
+            return self.max_fps
+        return min(float(max_fps), self.max_fps)
+
+    async def get_frame(self) -> Optional[EncodedFrame]:
+        """Latest encoded frame, encoding the current camera frame only if it is newer."""
+        async with self._encode_lock:
+            seq, frame = self.supervisor.camera.get_frame_with_seq_sync()
+            if frame is None:
+                return self.latest
+            if self.latest is not None and self.latest.seq == seq:
+                return self.latest
+
+            self.latest = await vision_pool.run(self._encode, seq, frame)
+            self.frames_encoded += 1
+            return self.latest
+
+    def _encode(self, seq: int, frame) -> EncodedFrame:
+        result = self.supervisor.detection_cache.get_or_detect(seq, frame)
+        annotated_frame = self.supervisor.detector.draw_detections(frame, result.detections)
+        _, buffer = cv2.imencode('.jpg', annotated_frame, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+
+        return EncodedFrame(
+            seq=seq,
+            jpeg=buffer.tobytes(),
+            dogs=len(result.dogs),
+            humans=len(result.humans),
+            is_unsupervised=result.is_unsupervised,
+            timestamp=time.time()
+        )
+
+    async def _produce_loop(self):
+        last_seq = None
+        while self.subscribers:
+            started = time.monotonic()
+            try:
+                frame = await self.get_frame()
+                if frame is not None and frame.seq != last_seq:
+                    last_seq = frame.seq
+                    for subscriber in list(self.subscribers):
+                        subscriber.offer(frame)
+            except Exception as e:
+                logger.exception("✗ Frame producer error: %s", e)
+                await asyncio.sleep(1)
+
+            # Produce no faster than the most demanding subscriber needs
+            fps = max((s.max_fps for s in self.subscribers), default=self.max_fps)
+            elapsed = time.monotonic() - started
+            await asyncio.sleep(max(0.0, 1.0 / fps - elapsed))
+
+    def get_stats(self) -> dict:
+        return {
+            "subscribers": len(self.subscribers),
+            "max_fps": self.max_fps,
+            "jpeg_quality": self.jpeg_quality,
+            "frames_encoded": self.frames_encoded,
+            "frames_dropped": sum(s.frames_dropped for s in self.subscribers)
+        }
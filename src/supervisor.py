@@ -1,4 +1,5 @@
 import asyncio
+import logging
 from datetime import datetime, timedelta
 from typing import Optional, List, Callable
 from dataclasses import dataclass, field
@@ -7,6 +8,11 @@ from enum import Enum
 
 from .detector import DogHumanDetector, Detection
 from .camera import AsyncCameraCapture
+from .detection_cache import DetectionCache
+from .workers import vision_pool
+
+
+logger = logging.getLogger(__name__)
 
 
 class SupervisionState(Enum):
@@ -37,6 +43,7 @@ class DogSupervisor:
     ):
         self.detector = detector
         self.camera = camera
+        self.detection_cache = DetectionCache(detector)
         self.alert_delay_seconds = alert_delay_seconds
         self.check_interval_seconds = check_interval_seconds
 
@@ -60,14 +67,15 @@ class DogSupervisor:
         if not await self.camera.start():
             raise RuntimeError("Failed to start camera")
 
+        self.camera.request_rate("supervisor", 1.0 / self.check_interval_seconds)
         self.is_running = True
         self.monitor_task = asyncio.create_task(self._monitor_loop())
-        print(f"[SUPERVISOR] 🚀 Dog supervisor started")
-        print(f"[SUPERVISOR] Camera: {self.camera.get_camera_info()}")
-        print(f"[SUPERVISOR] Alert delay: {self.alert_delay_seconds}s")
-        print(f"[SUPERVISOR] Check interval: {self.check_interval_seconds}s")
-        print(f"[SUPERVISOR] Event handlers: {len(self.event_handlers)}")
-        print(f"[SUPERVISOR] State change handlers: {len(self.state_change_handlers)}")
+        logger.info(
+            "🚀 Dog supervisor started (alert delay %ss, check interval %ss, %d event handlers, %d state change handlers)",
+            self.alert_delay_seconds, self.check_interval_seconds,
+            len(self.event_handlers), len(self.state_change_handlers)
+        )
+        logger.debug("Camera: %s", self.camera.get_camera_info())
 
     async def stop(self):
         self.is_running = False
@@ -78,12 +86,12 @@ class DogSupervisor:
             except asyncio.CancelledError:
                 pass
 
+        self.camera.release_rate("supervisor")
         await self.camera.stop()
-        print(f"\n[SUPERVISOR] 🛑 Dog supervisor stopped")
-        print(f"[SUPERVISOR] Total events recorded: {len(self.event_history)}")
+        logger.info("🛑 Dog supervisor stopped (%d events recorded)", len(self.event_history))
         if self.unsupervised_start_time:
             duration = (datetime.now() - self.unsupervised_start_time).total_seconds()
-            print(f"[SUPERVISOR] Final unsupervised duration: {duration:.1f}s")
+            logger.info("Final unsupervised duration: %.1fs", duration)
 
     async def _monitor_loop(self):
         while self.is_running:
@@ -91,23 +99,22 @@ class DogSupervisor:
                 await self._check_supervision()
                 await asyncio.sleep(self.check_interval_seconds)
             except Exception as e:
-                print(f"[SUPERVISOR] ❌ Monitor loop error: {e}")
+                logger.exception("❌ Monitor loop error: %s", e)
                 await asyncio.sleep(1)
 
     async def _check_supervision(self):
-        frame = await self.camera.get_frame()
+        seq, frame = await self.camera.get_frame_with_seq()
         if frame is None:
             return
 
-        is_unsupervised, dogs, humans = await asyncio.get_event_loop().run_in_executor(
-            None, self.detector.is_dog_unsupervised, frame
-        )
+        result = await vision_pool.run(self.detection_cache.get_or_detect, seq, frame)
+        is_unsupervised, dogs, humans = result.is_unsupervised, result.dogs, result.humans
 
         new_state = self._determine_state(is_unsupervised, len(dogs), len(humans))
 
-        # Only log detection details if there are detections or state changes
-        if len(dogs) > 0 or len(humans) > 0 or new_state != self.current_state:
-            print(f"[DETECT] Dogs: {len(dogs)}, Humans: {len(humans)}, State: {new_state.value}")
+        # Runs every tick, so it is debug-only and costs a level check at INFO
+        if logger.isEnabledFor(logging.DEBUG) and (dogs or humans or new_state != self.current_state):
+            logger.debug("Detect: dogs=%d humans=%d state=%s", len(dogs), len(humans), new_state.value)
 
         if new_state != self.current_state:
             self._handle_state_change(self.current_state, new_state, dogs, humans, frame)
@@ -132,27 +139,24 @@ class DogSupervisor:
         frame: np.ndarray
     ):
         timestamp = datetime.now()
-        print(f"\n[STATE] ========== STATE CHANGE ==========")
-        print(f"[STATE] Time: {timestamp.strftime('%H:%M:%S')}")
-        print(f"[STATE] Transition: {old_state.value} → {new_state.value}")
-        print(f"[STATE] Dogs detected: {len(dogs)}")
-        print(f"[STATE] Humans detected: {len(humans)}")
-
-        if dogs:
+        logger.info(
+            "State change: %s → %s (dogs=%d, humans=%d)",
+            old_state.value, new_state.value, len(dogs), len(humans),
+            extra={"old_state": old_state.value, "new_state": new_state.value, "dogs": len(dogs), "humans": len(humans)}
+        )
+        if logger.isEnabledFor(logging.DEBUG):
             for i, dog in enumerate(dogs):
-                print(f"[STATE]   Dog {i+1}: confidence={dog.confidence:.2f}, bbox={dog.bbox}")
-
-        if humans:
+                logger.debug("  Dog %d: confidence=%.2f, bbox=%s", i + 1, dog.confidence, dog.bbox)
             for i, human in enumerate(humans):
-                print(f"[STATE]   Human {i+1}: confidence={human.confidence:.2f}, bbox={human.bbox}")
+                logger.debug("  Human %d: confidence=%.2f, bbox=%s", i + 1, human.confidence, human.bbox)
 
         if new_state == SupervisionState.UNSUPERVISED:
             self.unsupervised_start_time = timestamp
-            print(f"[STATE] ⚠️  Starting unsupervised timer")
+            logger.info("⚠️ Starting unsupervised timer")
         else:
             if self.unsupervised_start_time:
                 duration = (timestamp - self.unsupervised_start_time).total_seconds()
-                print(f"[STATE] ✅ Ending unsupervised period (lasted {duration:.1f}s)")
+                logger.info("✅ Ending unsupervised period (lasted %.1fs)", duration)
             self.unsupervised_start_time = None
 
         event = SupervisionEvent(
@@ -160,23 +164,19 @@ class DogSupervisor:
             timestamp=datetime.now(),
             dogs_detected=len(dogs),
             humans_detected=len(humans),
-            frame_snapshot=frame.copy() if frame is not None else None,
+            frame_snapshot=frame,
             detections=dogs + humans
         )
 
         self._trigger_event(event)
 
-        print(f"[STATE] Notifying {len(self.state_change_handlers)} state change handlers")
         for i, handler in enumerate(self.state_change_handlers):
             try:
                 handler(old_state, new_state)
-                print(f"[STATE] Handler {i+1}: ✓")
             except Exception as e:
-                print(f"[STATE] Handler {i+1}: ✗ Error - {e}")
+                logger.error("State change handler %d failed: %s", i + 1, e)
 
         self.current_state = new_state
-        print(f"[STATE] Current state updated to: {new_state.value}")
-        print(f"[STATE] ========================================\n")
 
     def _check_alert_condition(self, dogs: List[Detection], humans: List[Detection], frame: np.ndarray):
         if self.unsupervised_start_time is None:
@@ -187,10 +187,11 @@ class DogSupervisor:
         if (duration_unsupervised.total_seconds() >= self.alert_delay_seconds
             and self.current_state != SupervisionState.ALERT):
 
-            print(f"\n[ALERT] 🚨 ALERT TRIGGERED! 🚨")
-            print(f"[ALERT] Dog has been unsupervised for {duration_unsupervised.total_seconds():.1f} seconds")
-            print(f"[ALERT] Threshold: {self.alert_delay_seconds} seconds")
-            print(f"[ALERT] Dogs: {len(dogs)}, Humans: {len(humans)}")
+            logger.warning(
+                "🚨 ALERT: dog unsupervised for %.1fs (threshold %ss, dogs=%d, humans=%d)",
+                duration_unsupervised.total_seconds(), self.alert_delay_seconds, len(dogs), len(humans),
+                extra={"duration_unsupervised": duration_unsupervised.total_seconds(), "dogs": len(dogs), "humans": len(humans)}
+            )
 
             event = SupervisionEvent(
                 state=SupervisionState.ALERT,
@@ -198,22 +199,19 @@ class DogSupervisor:
                 dogs_detected=len(dogs),
                 humans_detected=len(humans),
                 duration_unsupervised=duration_unsupervised,
-                frame_snapshot=frame.copy() if frame is not None else None,
+                frame_snapshot=frame,
                 detections=dogs + humans
             )
 
             self._trigger_event(event)
             self.current_state = SupervisionState.ALERT
-            print(f"[ALERT] State changed to ALERT")
-            print(f"[ALERT] Event triggered for action handlers\n")
 
     def _trigger_event(self, event: SupervisionEvent):
         self.event_history.append(event)
         if len(self.event_history) > self.max_history_size:
             self.event_history.pop(0)
 
-        print(f"[EVENT] Triggering event: {event.state.value}")
-        print(f"[EVENT] Notifying {len(self.event_handlers)} event handlers")
+        logger.debug("Triggering %s event for %d handlers", event.state.value, len(self.event_handlers))
 
         for i, handler in enumerate(self.event_handlers):
             try:
@@ -224,17 +222,15 @@ class DogSupervisor:
                 else:
                     # Call sync handler directly
                     handler(event)
-                    print(f"[EVENT] Handler {i+1}: ✓")
             except Exception as e:
-                print(f"[EVENT] Handler {i+1}: ✗ Error - {e}")
+                logger.error("Event handler %d failed: %s", i + 1, e)
 
     async def _call_async_handler(self, handler, event, handler_num):
         """Helper to call async event handlers"""
         try:
             await handler(event)
-            print(f"[EVENT] Handler {handler_num}: ✓ (async)")
         except Exception as e:
-            print(f"[EVENT] Handler {handler_num}: ✗ Error - {e} (async)")
+            logger.exception("Event handler %d failed: %s", handler_num, e)
 
     def add_event_handler(self, handler: Callable[[SupervisionEvent], None]):
         self.event_handlers.append(handler)
@@ -256,8 +252,10 @@ class DogSupervisor:
             "is_running": self.is_running,
             "duration_unsupervised_seconds": duration_unsupervised,
             "camera_info": self.camera.get_camera_info(),
+            "capture": self.camera.get_capture_stats(),
             "alert_delay_seconds": self.alert_delay_seconds,
-            "last_event_count": len(self.event_history)
+            "last_event_count": len(self.event_history),
+            "detection_cache": self.detection_cache.get_stats()
         }
 
     def get_recent_events(self, limit: int = 10) -> List[SupervisionEvent]:
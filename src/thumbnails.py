@@ -0,0 +1,181 @@
+import asyncio
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+import cv2
+import numpy as np
+
+from .workers import vision_pool
+
+
+logger = logging.getLogger(__name__)
+
+
+class ThumbnailPipeline:
+    """Renders small previews for captures and poster frames for recordings.
+
+    Actions hand over the frame they already have in memory, so a preview
+    never costs a JPEG decode or a video open. Rendering happens on the
+    vision pool from a bounded queue. When the queue is full the preview is
+    skipped, and ensure() renders it from the file the first time it is
+    requested. Thumbnails are named after their source file and never
+    change, so they can be cached indefinitely.
+    """
+
+    def __init__(
+        self,
+        root: str = "thumbnails",
+        width: int = 320,
+        image_format: str = "webp",
+        quality: int = 70,
+        queue_size: int = 16
+    ):
+        self.root = Path(root)
+        self.width = width
+        self.quality = quality
+        self.queue_size = queue_size
+        self.extension = self._pick_extension(image_format)
+        self.queue: Optional[asyncio.Queue] = None
+        self.task: Optional[asyncio.Task] = None
+
+        self.generated = 0
+        self.generated_on_demand = 0
+        self.dropped = 0
+        self.failed = 0
+
+    @staticmethod
+    def _pick_extension(image_format: str) -> str:
+        extension = "." + image_format.lower().lstrip(".")
+        if extension == ".jpeg":
+            extension = ".jpg"
+        # Not every OpenCV build includes a WebP encoder
+        ok, _ = cv2.imencode(extension, np.zeros((8, 8, 3), dtype=np.uint8))
+        return extension if ok else ".jpg"
+
+    @property
+    def media_type(self) -> str:
+        return "image/webp" if self.extension == ".webp" else "image/jpeg"
+
+    def name_for(self, filename: str) -> str:
+        return Path(filename).stem + self.extension
+
+    def path_for(self, kind: str, filename: str) -> Path:
+        return self.root / kind / self.name_for(filename)
+
+    def url_for(self, kind: str, filename: str) -> str:
+        return f"/thumbnails/{kind}/{self.name_for(filename)}"
+
+    def start(self):
+        if self.queue is None:
+            self.queue = asyncio.Queue(maxsize=self.queue_size)
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    def submit(self, kind: str, filename: str, frame: np.ndarray) -> bool:
+        """Queue a preview of an in-memory frame. Call from the event loop thread."""
+        if self.queue is None:
+            self.start()
+        try:
+            self.queue.put_nowait((kind, filename, frame))
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+
+    async def _run(self):
+        while True:
+            kind, filename, frame = await self.queue.get()
+            try:
+                if await vision_pool.run(self._render, frame, self.path_for(kind, filename)):
+                    self.generated += 1
+                else:
+                    self.failed += 1
+            except Exception as e:
+                self.failed += 1
+                logger.error("✗ Failed to render thumbnail for %s: %s", filename, e)
+            finally:
+                # Release the frame (possibly a pinned camera buffer) right away
+                frame = None
+
+    async def ensure(self, kind: str, filename: str, source_path: Path) -> Optional[Path]:
+        """Path of the thumbnail, rendering it from the source file if it doesn't exist yet."""
+        path = self.path_for(kind, filename)
+        if path.exists():
+            return path
+        if not source_path.exists():
+            return None
+
+        if await vision_pool.run(self._render_from_file, source_path, path):
+            self.generated_on_demand += 1
+            return path
+        self.failed += 1
+        return None
+
+    def _render_from_file(self, source_path: Path, path: Path) -> bool:
+        if source_path.suffix.lower() == ".mp4":
+            cap = cv2.VideoCapture(str(source_path))
+            try:
+                ok, frame = cap.read()
+            finally:
+                cap.release()
+            if not ok:
+                return False
+        else:
+            # Reduced decode skips most of the IDCT work for a full-size JPEG
+            frame = cv2.imread(str(source_path), cv2.IMREAD_REDUCED_COLOR_2)
+            if frame is None:
+                return False
+        return self._render(frame, path)
+
+    def _render(self, frame: np.ndarray, path: Path) -> bool:
+        height, width = frame.shape[:2]
+        if width > self.width:
+            size = (self.width, max(1, round(height * self.width / width)))
+            frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+        quality_flag = cv2.IMWRITE_WEBP_QUALITY if self.extension == ".webp" else cv2.IMWRITE_JPEG_QUALITY
+        ok, buffer = cv2.imencode(self.extension, frame, [quality_flag, self.quality])
+        if not ok:
+            return False
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp_")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(buffer.tobytes())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return True
+
+    def delete(self, kind: str, filename: str) -> bool:
+        try:
+            self.path_for(kind, filename).unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
+    def get_stats(self) -> dict:
+        return {
+            "format": self.extension.lstrip("."),
+            "width": self.width,
+            "queued": self.queue.qsize() if self.queue else 0,
+            "generated": self.generated,
+            "generated_on_demand": self.generated_on_demand,
+            "dropped": self.dropped,
+            "failed": self.failed
+        }
@@ -1,28 +1,56 @@
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Request
-from fastapi.responses import HTMLResponse, StreamingResponse, FileResponse, Response
+from fastapi.responses import HTMLResponse, StreamingResponse, Response
 from fastapi.staticfiles import StaticFiles
 import cv2
 import numpy as np
 import json
 import asyncio
+import logging
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 import io
 import base64
 import os
 from pathlib import Path
 
 from .camera import AsyncCameraCapture
+from .database import InvalidCursor
+from .file_serving import IMMUTABLE_CACHE_CONTROL, media_file_response
+from .media import CAPTURE, RECORDING, read_video_duration
 from .detector import DogHumanDetector
 from .supervisor import DogSupervisor, SupervisionEvent, SupervisionState
+from .streaming import FrameBroadcaster, FrameSubscriber, EncodedFrame
+from .workers import vision_pool, loop_monitor
+
+
+logger = logging.getLogger(__name__)
 
 
 class WebApp:
-    def __init__(self, supervisor: DogSupervisor, database=None):
+    MJPEG_BOUNDARY = "frame"
+
+    def __init__(
+        self,
+        supervisor: DogSupervisor,
+        database=None,
+        stream_max_fps: float = 10,
+        stream_jpeg_quality: int = 80,
+        action_manager=None,
+        retention_manager=None,
+        media_catalog=None
+    ):
         self.app = FastAPI(title="Doodie Duty")
         self.supervisor = supervisor
         self.database = database
+        self.action_manager = action_manager
+        self.retention_manager = retention_manager
+        self.media_catalog = media_catalog
         self.active_connections: List[WebSocket] = []
+        self.broadcaster = FrameBroadcaster(
+            supervisor,
+            max_fps=stream_max_fps,
+            jpeg_quality=stream_jpeg_quality
+        )
 
         self.setup_routes()
         self.setup_event_handlers()
@@ -34,12 +62,41 @@ class WebApp:
 
         @self.app.get("/status")
         async def get_status():
-            return self.supervisor.get_current_status()
+            status = self.supervisor.get_current_status()
+            status["stream"] = self.broadcaster.get_stats()
+            status["vision_pool"] = vision_pool.get_stats()
+            status["event_loop"] = loop_monitor.get_stats()
+            if self.media_catalog and self.media_catalog.thumbnails:
+                status["thumbnails"] = self.media_catalog.thumbnails.get_stats()
+            if self.database:
+                status["database"] = self.database.get_stats()
+            if self.retention_manager:
+                status["retention"] = self.retention_manager.get_status()
+            if self.action_manager:
+                status["actions"] = self.action_manager.get_status()
+            return status
 
         @self.app.get("/events")
-        async def get_events(limit: int = 10):
+        async def get_events(
+            response: Response,
+            limit: int = 10,
+            cursor: Optional[str] = None,
+            state: Optional[str] = None,
+            alerts_only: bool = False
+        ):
             if self.database:
-                events = await self.database.get_events(limit=limit)
+                limit = max(1, min(limit, 500))
+                try:
+                    events, next_cursor = await self.database.get_events_page(
+                        limit=limit,
+                        cursor=cursor,
+                        state_filter=state,
+                        alerts_only=alerts_only
+                    )
+                except InvalidCursor as e:
+                    raise HTTPException(status_code=400, detail=str(e))
+                if next_cursor:
+                    response.headers["X-Next-Cursor"] = next_cursor
                 return events
             else:
                 # Fallback to supervisor if no database
@@ -60,24 +117,67 @@ class WebApp:
         async def websocket_endpoint(websocket: WebSocket):
             await websocket.accept()
             self.active_connections.append(websocket)
+            subscriber = None
+            sender_task = None
             try:
                 while True:
                     data = await websocket.receive_text()
                     command = json.loads(data)
 
-                    if command.get("type") == "get_frame":
-                        await self.send_frame(websocket)
+                    if command.get("type") == "subscribe":
+                        binary = command.get("format", "binary") == "binary"
+                        if subscriber is None:
+                            subscriber = self.broadcaster.subscribe(command.get("fps"), binary)
+                            sender_task = asyncio.create_task(self.stream_frames(websocket, subscriber))
+                        else:
+                            self.broadcaster.update_subscriber(subscriber, command.get("fps"), binary)
+                    elif command.get("type") == "unsubscribe":
+                        if subscriber is not None:
+                            sender_task.cancel()
+                            self.broadcaster.unsubscribe(subscriber)
+                            subscriber = None
+                            sender_task = None
+                    elif command.get("type") == "get_frame":
+                        await self.send_frame(websocket, binary=command.get("format") == "binary")
                     elif command.get("type") == "get_status":
                         status = self.supervisor.get_current_status()
                         await websocket.send_json({"type": "status", "data": status})
 
             except WebSocketDisconnect:
-                self.active_connections.remove(websocket)
+                pass
             except Exception as e:
-                print(f"WebSocket error: {e}")
+                logger.warning("WebSocket error: %s", e)
+            finally:
+                if sender_task:
+                    sender_task.cancel()
+                if subscriber is not None:
+                    self.broadcaster.unsubscribe(subscriber)
                 if websocket in self.active_connections:
                     self.active_connections.remove(websocket)
 
+        @self.app.get("/stream.mjpg")
+        async def mjpeg_stream(request: Request, fps: Optional[float] = None):
+            return StreamingResponse(
+                self.generate_mjpeg(request, fps),
+                media_type=f"multipart/x-mixed-replace; boundary={self.MJPEG_BOUNDARY}",
+                headers={
+                    "Cache-Control": "no-cache, no-store, must-revalidate",
+                    "X-Accel-Buffering": "no"
+                }
+            )
+
+        @self.app.get("/snapshot.jpg")
+        async def snapshot():
+            frame = await self.broadcaster.get_frame()
+            if frame is None:
+                raise HTTPException(status_code=503, detail="No frame available")
+            # A short max-age lets a caching proxy absorb many pollers per frame
+            return Response(
+                content=frame.jpeg,
+                media_type="image/jpeg",
+                headers={"Cache-Control": "public, max-age=1"}
+            )
+
         @self.app.post("/start")
         async def start_monitoring():
             await self.supervisor.start()
@@ -89,17 +189,35 @@ class WebApp:
             return {"message": "Monitoring stopped"}
 
         @self.app.get("/recordings")
-        async def get_recordings():
+        async def get_recordings(
+            response: Response,
+            limit: int = 50,
+            cursor: Optional[str] = None,
+            state: Optional[str] = None
+        ):
+            if self.media_catalog:
+                return await self.get_media_page(response, RECORDING, "recordings", limit, cursor, state)
             return await self.get_recordings_list()
 
         @self.app.get("/recordings/{filename}")
-        async def get_recording(request: Request, filename: str):
-            return await self.serve_recording(request, filename)
+        async def get_recording(filename: str):
+            return await self.serve_recording(filename)
 
         @self.app.get("/captures")
-        async def get_captures():
+        async def get_captures(
+            response: Response,
+            limit: int = 50,
+            cursor: Optional[str] = None,
+            state: Optional[str] = None
+        ):
+            if self.media_catalog:
+                return await self.get_media_page(response, CAPTURE, "captures", limit, cursor, state)
             return await self.get_captures_list()
 
+        @self.app.get("/thumbnails/{kind}/{name}")
+        async def get_thumbnail(kind: str, name: str):
+            return await self.serve_thumbnail(kind, name)
+
         @self.app.get("/captures/{filename}")
         async def get_capture(filename: str):
             return await self.serve_capture(filename)
@@ -110,28 +228,57 @@ class WebApp:
 
         self.supervisor.add_event_handler(on_event)
 
-    async def send_frame(self, websocket: WebSocket):
-        frame = self.supervisor.camera.get_frame_sync()
+    async def send_frame(self, websocket: WebSocket, binary: bool = False):
+        """Reply to a one-off get_frame request with the shared encoded frame"""
+        frame = await self.broadcaster.get_frame()
         if frame is None:
             return
+        await self.send_encoded_frame(websocket, frame, binary)
 
-        is_unsupervised, dogs, humans = self.supervisor.detector.is_dog_unsupervised(frame)
-
-        all_detections = dogs + humans
-        annotated_frame = self.supervisor.detector.draw_detections(frame, all_detections)
-
-        _, buffer = cv2.imencode('.jpg', annotated_frame, [cv2.IMWRITE_JPEG_QUALITY, 80])
-        frame_base64 = base64.b64encode(buffer).decode('utf-8')
-
-        await websocket.send_json({
-            "type": "frame",
-            "data": {
-                "image": frame_base64,
-                "dogs": len(dogs),
-                "humans": len(humans),
-                "is_unsupervised": is_unsupervised
-            }
-        })
+    async def stream_frames(self, websocket: WebSocket, subscriber: FrameSubscriber):
+        """Push frames from the broadcaster to one websocket until it goes away"""
+        try:
+            while True:
+                frame = await subscriber.next_frame()
+                # Read per frame, so a repeated subscribe can switch the format
+                await self.send_encoded_frame(websocket, frame, subscriber.binary)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.debug("Frame stream to client ended: %s", e)
+
+    async def generate_mjpeg(self, request: Request, fps: Optional[float] = None):
+        """Yield multipart JPEG parts for one MJPEG viewer.
+
+        The viewer gets its own broadcaster subscription, so when the client
+        reads slowly the response send blocks only this generator and the
+        subscriber mailbox drops stale frames in the meantime.
+        """
+        subscriber = self.broadcaster.subscribe(fps)
+        boundary = self.MJPEG_BOUNDARY.encode()
+        try:
+            while not await request.is_disconnected():
+                try:
+                    frame = await asyncio.wait_for(subscriber.next_frame(), timeout=5)
+                except asyncio.TimeoutError:
+                    continue
+
+                yield (
+                    b"--" + boundary + b"\r\n"
+                    b"Content-Type: image/jpeg\r\n"
+                    b"Content-Length: " + str(len(frame.jpeg)).encode() + b"\r\n\r\n"
+                    + frame.jpeg + b"\r\n"
+                )
+        finally:
+            self.broadcaster.unsubscribe(subscriber)
+
+    async def send_encoded_frame(self, websocket: WebSocket, frame: EncodedFrame, binary: bool = True):
+        # Binary frames are header + raw JPEG; the JSON/base64 form is kept
+        # for clients that still ask for it. Both are built once per frame.
+        if binary:
+            await websocket.send_bytes(frame.binary_message)
+        else:
+            await websocket.send_json(frame.json_message)
 
     async def broadcast_event(self, event: SupervisionEvent):
         message = {
@@ -157,8 +304,50 @@ class WebApp:
             if connection in self.active_connections:
                 self.active_connections.remove(connection)
 
+    async def get_media_page(
+        self,
+        response: Response,
+        kind: str,
+        collection: str,
+        limit: int,
+        cursor: Optional[str],
+        state: Optional[str]
+    ) -> dict:
+        """One page of the media catalog, newest first, in the /recordings and /captures shape"""
+        limit = max(1, min(limit, 500))
+        try:
+            items, next_cursor = await self.media_catalog.list_media(kind, limit=limit, cursor=cursor, state=state)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        for item in items:
+            item["url"] = f"/{collection}/{item['filename']}"
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return {collection: items, "next_cursor": next_cursor}
+
+    async def serve_thumbnail(self, kind: str, name: str):
+        """Serve a capture preview or recording poster, rendering it on first request if needed"""
+        thumbnails = self.media_catalog.thumbnails if self.media_catalog else None
+        if thumbnails is None:
+            raise HTTPException(status_code=404, detail="Thumbnails not enabled")
+        if kind not in (CAPTURE, RECORDING) or '/' in name or '\\' in name or not name.endswith(thumbnails.extension):
+            raise HTTPException(status_code=400, detail="Invalid thumbnail")
+
+        source_name = Path(name).stem + (".mp4" if kind == RECORDING else ".jpg")
+        path = await thumbnails.ensure(kind, source_name, self.media_catalog.source_path(kind, source_name))
+        if path is None:
+            raise HTTPException(status_code=404, detail="Media not found")
+
+        response = await media_file_response(path, thumbnails.media_type)
+        if response is None:
+            raise HTTPException(status_code=404, detail="Media not found")
+        # Thumbnails are derived from files that never change once written
+        response.headers["cache-control"] = IMMUTABLE_CACHE_CONTROL
+        return response
+
     async def get_recordings_list(self):
-        """Get list of all recording files with metadata"""
+        """Get list of all recording files with metadata (directory scan, used without a catalog)"""
         recordings_dir = Path("recordings")
         if not recordings_dir.exists():
             return {"recordings": []}
@@ -186,7 +375,7 @@ class WebApp:
                     "url": f"/recordings/{file_path.name}"
                 })
             except Exception as e:
-                print(f"[WEB] Error processing recording {file_path.name}: {e}")
+                logger.warning("Error processing recording %s: %s", file_path.name, e)
 
         # Sort by creation time, newest first
         recordings.sort(key=lambda x: x["created"], reverse=True)
@@ -195,112 +384,21 @@ class WebApp:
 
     async def get_video_duration(self, file_path: Path) -> float:
         """Get video duration in seconds"""
-        try:
-            cap = cv2.VideoCapture(str(file_path))
-            if cap.isOpened():
-                fps = cap.get(cv2.CAP_PROP_FPS)
-                frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
-                cap.release()
-
-                if fps > 0:
-                    return frame_count / fps
-            return 0.0
-        except Exception:
-            return 0.0
-
-    async def serve_recording(self, request: Request, filename: str):
-        """Serve a recording file with proper range request support for video streaming"""
+        return await vision_pool.run(read_video_duration, file_path)
+
+    async def serve_recording(self, filename: str):
+        """Serve a recording with ETag validation and byte range support for video seeking"""
         # Validate filename to prevent directory traversal
         if not filename.endswith('.mp4') or '/' in filename or '\\' in filename:
             raise HTTPException(status_code=400, detail="Invalid filename")
 
-        recordings_dir = Path("recordings")
-        file_path = recordings_dir / filename
-
-        if not file_path.exists():
+        response = await media_file_response(Path("recordings") / filename, 'video/mp4')
+        if response is None:
             raise HTTPException(status_code=404, detail="Recording not found")
-
-        # Get file size
-        file_size = file_path.stat().st_size
-
-        # Parse range header
-        range_header = request.headers.get('range')
-
-        if range_header:
-            # Handle range request
-            return await self._serve_video_range(file_path, range_header, file_size)
-        else:
-            # Serve entire file
-            return await self._serve_video_full(file_path, file_size)
-
-    async def _serve_video_range(self, file_path: Path, range_header: str, file_size: int):
-        """Handle HTTP range requests for video streaming"""
-        try:
-            # Parse range header (e.g., "bytes=0-1023" or "bytes=1024-")
-            range_match = range_header.replace('bytes=', '').split('-')
-            start = int(range_match[0]) if range_match[0] else 0
-            end = int(range_match[1]) if range_match[1] else file_size - 1
-
-            # Ensure valid range
-            start = max(0, start)
-            end = min(file_size - 1, end)
-            content_length = end - start + 1
-
-            def generate():
-                with open(file_path, 'rb') as f:
-                    f.seek(start)
-                    remaining = content_length
-                    while remaining > 0:
-                        chunk_size = min(8192, remaining)  # 8KB chunks
-                        chunk = f.read(chunk_size)
-                        if not chunk:
-                            break
-                        remaining -= len(chunk)
-                        yield chunk
-
-            headers = {
-                'Content-Range': f'bytes {start}-{end}/{file_size}',
-                'Accept-Ranges': 'bytes',
-                'Content-Length': str(content_length),
-                'Content-Type': 'video/mp4',
-            }
-
-            return StreamingResponse(
-                generate(),
-                status_code=206,
-                headers=headers,
-                media_type='video/mp4'
-            )
-
-        except (ValueError, IndexError):
-            # Invalid range header, serve full file
-            return await self._serve_video_full(file_path, file_size)
-
-    async def _serve_video_full(self, file_path: Path, file_size: int):
-        """Serve the entire video file"""
-        def generate():
-            with open(file_path, 'rb') as f:
-                while True:
-                    chunk = f.read(8192)  # 8KB chunks
-                    if not chunk:
-                        break
-                    yield chunk
-
-        headers = {
-            'Accept-Ranges': 'bytes',
-            'Content-Length': str(file_size),
-            'Content-Type': 'video/mp4',
-        }
-
-        return StreamingResponse(
-            generate(),
-            status_code=200,
-            headers=headers,
-            media_type='video/mp4'
-        )
+        return response
 
     async def get_captures_list(self):
-        """Get list of all captured images with metadata"""
+        """Get list of all captured images with metadata (directory scan, used without a catalog)"""
         captures_dir = Path("captures")
         if not captures_dir.exists():
             return {"captures": []}
@@ -330,7 +428,7 @@ class WebApp:
                     "url": f"/captures/{file_path.name}"
                 })
             except Exception as e:
-                print(f"[WEB] Error processing capture {file_path.name}: {e}")
+                logger.warning("Error processing capture %s: %s", file_path.name, e)
 
         # Sort by creation time, newest first
         captures.sort(key=lambda x: x["created"], reverse=True)
@@ -343,17 +441,10 @@ class WebApp:
         if not filename.endswith('.jpg') or '/' in filename or '\\' in filename:
             raise HTTPException(status_code=400, detail="Invalid filename")
 
-        captures_dir = Path("captures")
-        file_path = captures_dir / filename
-
-        if not file_path.exists():
+        response = await media_file_response(Path("captures") / filename, 'image/jpeg', filename=filename)
+        if response is None:
             raise HTTPException(status_code=404, detail="Capture not found")
-
-        return FileResponse(
-            str(file_path),
-            media_type='image/jpeg',
-            filename=filename
-        )
+        return response
 
     def get_index_html(self) -> str:
         return '''
@@ -513,6 +604,20 @@ class WebApp:
         .download-btn:hover {
             background: #45a049;
         }
+        .load-more-btn {
+            display: block;
+            margin: 15px auto 0;
+            background: #f0f0f0;
+            color: #333;
+            border: 1px solid #ddd;
+            padding: 8px 16px;
+            border-radius: 4px;
+            cursor: pointer;
+            font-size: 14px;
+        }
+        .load-more-btn:hover {
+            background: #e0e0e0;
+        }
         .capture-item {
             display: flex;
             align-items: center;
@@ -653,6 +758,7 @@ class WebApp:
             <div id="capturesList">
                 <p>Loading event captures...</p>
             </div>
+            <button id="capturesMore" class="load-more-btn" style="display: none;" onclick="loadEventCaptures(true)">Load more</button>
         </div>
 
         <div class="recordings">
@@ -660,6 +766,7 @@ class WebApp:
             <div id="recordingsList">
                 <p>Loading recordings...</p>
             </div>
+            <button id="recordingsMore" class="load-more-btn" style="display: none;" onclick="loadRecordings(true)">Load more</button>
         </div>
     </div>
 
@@ -675,13 +782,15 @@ class WebApp:
 
     <script>
         let ws = null;
-        let frameInterval = null;
         let isMonitoring = false;
         let videoEnabled = true;
         let frameRateMs = 1000; // Default to 1 FPS
+        let frameObjectUrl = null;
+        const FRAME_STATES = ["idle", "supervised", "unsupervised"];
 
         function connectWebSocket() {
             ws = new WebSocket(`ws://${window.location.host}/ws`);
+            ws.binaryType = "arraybuffer";
 
             ws.onopen = function() {
                 console.log("Connected to server");
@@ -689,6 +798,11 @@ class WebApp:
             };
 
             ws.onmessage = function(event) {
+                if (event.data instanceof ArrayBuffer) {
+                    updateBinaryFrame(event.data);
+                    return;
+                }
+
                 const data = JSON.parse(event.data);
 
                 if (data.type === "frame") {
@@ -702,7 +816,6 @@ class WebApp:
 
             ws.onclose = function() {
                 console.log("Disconnected from server");
-                stopFrameUpdates();
                 setTimeout(connectWebSocket, 3000);
             };
         }
@@ -712,21 +825,36 @@ class WebApp:
         }
 
         function updateFrameInterval() {
-            stopFrameUpdates();
+            // The server pushes frames; we only tell it how many we want
             if (videoEnabled && ws && ws.readyState === WebSocket.OPEN) {
-                frameInterval = setInterval(() => {
-                    if (ws && ws.readyState === WebSocket.OPEN) {
-                        ws.send(JSON.stringify({ type: "get_frame" }));
-                    }
-                }, frameRateMs);
+                ws.send(JSON.stringify({ type: "subscribe", fps: 1000 / frameRateMs, format: "binary" }));
             }
         }
 
         function stopFrameUpdates() {
-            if (frameInterval) {
-                clearInterval(frameInterval);
-                frameInterval = null;
+            if (ws && ws.readyState === WebSocket.OPEN) {
+                ws.send(JSON.stringify({ type: "unsubscribe" }));
+            }
+        }
+
+        function updateBinaryFrame(buffer) {
+            // Header: version, state, dogs, humans (uint8 each), seq (uint32), then JPEG bytes
+            const view = new DataView(buffer);
+            const state = FRAME_STATES[view.getUint8(1)] || "idle";
+            const dogs = view.getUint8(2);
+            const humans = view.getUint8(3);
+
+            if (videoEnabled) {
+                const blob = new Blob([new Uint8Array(buffer, 8)], { type: "image/jpeg" });
+                const img = document.getElementById("videoFeed");
+                if (frameObjectUrl) {
+                    URL.revokeObjectURL(frameObjectUrl);
+                }
+                frameObjectUrl = URL.createObjectURL(blob);
+                img.src = frameObjectUrl;
             }
+
+            updateDetectionInfo(dogs, humans, state);
         }
 
         function updateFrame(data) {
@@ -735,20 +863,22 @@ class WebApp:
                 img.src = `data:image/jpeg;base64,${data.image}`;
             }
 
-            document.getElementById("dogCount").textContent = data.dogs;
-            document.getElementById("humanCount").textContent = data.humans;
-
-            const stateElement = document.getElementById("currentState");
+            let state = "supervised";
             if (data.dogs === 0) {
-                stateElement.textContent = "Idle";
-                stateElement.className = "state-idle";
+                state = "idle";
             } else if (data.is_unsupervised) {
-                stateElement.textContent = "Unsupervised";
-                stateElement.className = "state-unsupervised";
-            } else {
-                stateElement.textContent = "Supervised";
-                stateElement.className = "state-supervised";
+                state = "unsupervised";
             }
+            updateDetectionInfo(data.dogs, data.humans, state);
+        }
+
+        function updateDetectionInfo(dogs, humans, state) {
+            document.getElementById("dogCount").textContent = dogs;
+            document.getElementById("humanCount").textContent = humans;
+
+            const stateElement = document.getElementById("currentState");
+            stateElement.textContent = state.charAt(0).toUpperCase() + state.slice(1);
+            stateElement.className = `state-${state}`;
         }
 
         function updateStatus(status) {
@@ -814,12 +944,22 @@ class WebApp:
             }
         }
 
-        async function loadRecordings() {
+        // Cursor for the next, older page of each media list (null once everything is shown)
+        let recordingsCursor = null;
+        let capturesCursor = null;
+
+        function mediaPageUrl(path, cursor) {
+            return cursor ? `${path}?cursor=${encodeURIComponent(cursor)}` : path;
+        }
+
+        async function loadRecordings(more = false) {
             try {
-                const response = await fetch("/recordings");
+                const response = await fetch(mediaPageUrl("/recordings", more ? recordingsCursor : null));
                 if (response.ok) {
                     const data = await response.json();
-                    displayRecordings(data.recordings);
+                    recordingsCursor = data.next_cursor || null;
+                    document.getElementById("recordingsMore").style.display = recordingsCursor ? "block" : "none";
+                    displayRecordings(data.recordings, more);
                 } else {
                     document.getElementById("recordingsList").innerHTML = "<p>Failed to load recordings</p>";
                 }
@@ -829,10 +969,10 @@ class WebApp:
             }
         }
 
-        function displayRecordings(recordings) {
+        function displayRecordings(recordings, append = false) {
             const recordingsList = document.getElementById("recordingsList");
 
-            if (recordings.length === 0) {
+            if (recordings.length === 0 && !append) {
                 recordingsList.innerHTML = "<p>No recordings available</p>";
                 return;
             }
@@ -845,6 +985,8 @@ class WebApp:
 
                 return `
                     <div class="recording-item">
+                        ${recording.thumbnail_url ? `<img src="${recording.thumbnail_url}" alt="" class="capture-thumbnail" loading="lazy"
+                             onclick="playRecording('${recording.url}', '${recording.filename}')">` : ''}
                         <div class="recording-info">
                             <div class="recording-title">${recording.filename}</div>
                             <div class="recording-meta">
@@ -863,7 +1005,11 @@ class WebApp:
                 `;
             }).join('');
 
-            recordingsList.innerHTML = recordingsHtml;
+            if (append) {
+                recordingsList.insertAdjacentHTML("beforeend", recordingsHtml);
+            } else {
+                recordingsList.innerHTML = recordingsHtml;
+            }
         }
 
         function playRecording(url, filename) {
@@ -943,12 +1089,14 @@ class WebApp:
             updateFrameInterval();
         });
 
-        async function loadEventCaptures() {
+        async function loadEventCaptures(more = false) {
             try {
-                const response = await fetch("/captures");
+                const response = await fetch(mediaPageUrl("/captures", more ? capturesCursor : null));
                 if (response.ok) {
                     const data = await response.json();
-                    displayEventCaptures(data.captures);
+                    capturesCursor = data.next_cursor || null;
+                    document.getElementById("capturesMore").style.display = capturesCursor ? "block" : "none";
+                    displayEventCaptures(data.captures, more);
                 } else {
                     document.getElementById("capturesList").innerHTML = "<p>Failed to load event captures</p>";
                 }
@@ -958,10 +1106,10 @@ class WebApp:
             }
         }
 
-        function displayEventCaptures(captures) {
+        function displayEventCaptures(captures, append = false) {
             const capturesList = document.getElementById("capturesList");
 
-            if (captures.length === 0) {
+            if (captures.length === 0 && !append) {
                 capturesList.innerHTML = "<p>No event captures available</p>";
                 return;
             }
@@ -973,8 +1121,8 @@ class WebApp:
 
                 return `
                     <div class="capture-item">
-                        <img src="${capture.url}" alt="Event Capture" class="capture-thumbnail"
-                             onclick="viewCaptureImage('${capture.url}', '${capture.filename}')">
+                        <img src="${capture.thumbnail_url || capture.url}" alt="Event Capture" class="capture-thumbnail"
+                             loading="lazy" onclick="viewCaptureImage('${capture.url}', '${capture.filename}')">
                         <div class="capture-info">
                             <div class="capture-title">${capture.filename}</div>
                             <div class="capture-meta">
@@ -986,7 +1134,11 @@ class WebApp:
                 `;
             }).join('');
 
-            capturesList.innerHTML = capturesHtml;
+            if (append) {
+                capturesList.insertAdjacentHTML("beforeend", capturesHtml);
+            } else {
+                capturesList.innerHTML = capturesHtml;
+            }
         }
 
         function viewCaptureImage(url, filename) {
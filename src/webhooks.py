@@ -0,0 +1,323 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+from .workers import LatencyHistogram
+
+
+logger = logging.getLogger(__name__)
+
+
+# End-to-end delivery includes retries, so its histogram reaches further than a request's
+DELIVERY_BUCKETS_MS = (100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 300000, 900000)
+
+
+@dataclass
+class OutboxEntry:
+    """One notification waiting to be delivered to one target."""
+    id: str
+    target: str
+    payload: dict
+    created_at: float
+    attempts: int = 0
+    next_attempt_at: float = 0.0
+    last_error: Optional[str] = None
+
+
+class TargetStats:
+    def __init__(self):
+        self.delivered = 0
+        self.requests = 0
+        self.retries = 0
+        self.dead_lettered = 0
+        self.last_status: Optional[int] = None
+        self.last_error: Optional[str] = None
+        self.request_latency = LatencyHistogram()
+        self.delivery_latency = LatencyHistogram(DELIVERY_BUCKETS_MS)
+
+
+class WebhookDispatcher:
+    """Delivers notifications to one or more webhook targets from a durable outbox.
+
+    enqueue() writes one outbox file per target before returning, so an alert
+    survives a failed request or a restart. Each target has its own sender
+    task sharing one pooled aiohttp session. Failed requests (network
+    errors, 429 and 5xx) are retried with exponential backoff and jitter;
+    other 4xx responses and entries out of attempts are moved to outbox/dead.
+
+    Alerts that pile up while a target is backing off, or that arrive within
+    coalesce_seconds of the previous send, go out as one request carrying
+    the latest payload plus the count and list of the alerts it covers.
+    """
+
+    def __init__(
+        self,
+        targets: List[str],
+        outbox_dir: str = "outbox",
+        max_attempts: int = 8,
+        backoff_base_seconds: float = 2.0,
+        backoff_max_seconds: float = 300.0,
+        coalesce_seconds: float = 5.0,
+        max_batch: int = 20,
+        request_timeout_seconds: float = 10.0
+    ):
+        self.targets = list(dict.fromkeys(target.strip() for target in targets if target and target.strip()))
+        self.outbox_dir = Path(outbox_dir)
+        self.dead_dir = self.outbox_dir / "dead"
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.coalesce_seconds = coalesce_seconds
+        self.max_batch = max(1, max_batch)
+        self.request_timeout_seconds = request_timeout_seconds
+
+        # Webhook URLs usually embed a secret token, so logs and stats only show the host
+        self.labels = {target: f"{urlsplit(target).netloc or 'webhook'}#{i + 1}" for i, target in enumerate(self.targets)}
+
+        self.entries: Dict[str, OutboxEntry] = {}
+        self.stats = {target: TargetStats() for target in self.targets}
+        self.wakeups: Dict[str, asyncio.Event] = {}
+        self.last_sent: Dict[str, float] = {}
+        self.tasks: List[asyncio.Task] = []
+        self.session = None
+        # enqueue() starts the dispatcher lazily; concurrent first calls must not start it twice
+        self.start_lock = asyncio.Lock()
+
+    async def start(self):
+        async with self.start_lock:
+            if self.session is not None:
+                return
+            import aiohttp
+
+            await self._run_blocking(self._load_outbox)
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=2, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout_seconds)
+            )
+            for target in self.targets:
+                self.wakeups[target] = asyncio.Event()
+                self.tasks.append(asyncio.create_task(self._sender(target)))
+
+        pending = len(self.entries)
+        logger.info(
+            "Delivering to %d target(s)%s", len(self.targets),
+            f", {pending} notification(s) pending from the outbox" if pending else ""
+        )
+
+    async def stop(self):
+        for task in self.tasks:
+            task.cancel()
+        if self.tasks:
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+    async def enqueue(self, payload: dict) -> int:
+        """Persist payload for every target and wake their senders. Returns the number of entries queued."""
+        if self.session is None:
+            await self.start()
+        now = time.time()
+        entries = [
+            OutboxEntry(id=f"{int(now * 1000):013d}_{uuid.uuid4().hex[:12]}", target=target, payload=payload, created_at=now)
+            for target in self.targets
+        ]
+        # Written before returning, so a crash right after an alert doesn't lose it
+        await self._run_blocking(lambda: [self._write_entry(entry) for entry in entries])
+        for entry in entries:
+            self.entries[entry.id] = entry
+            if entry.target in self.wakeups:
+                self.wakeups[entry.target].set()
+        return len(entries)
+
+    async def _sender(self, target: str):
+        wakeup = self.wakeups[target]
+        while True:
+            now = time.time()
+            pending = sorted(
+                (entry for entry in self.entries.values() if entry.target == target),
+                key=lambda entry: entry.created_at
+            )
+
+            # Newer alerts queue behind one that is backing off, so they stay in
+            # order and go out together once it is retried
+            if not pending or pending[0].next_attempt_at > now:
+                wakeup.clear()
+                timeout = pending[0].next_attempt_at - now if pending else None
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            # Hold back briefly after a send so a burst of alerts goes out as one request
+            hold = self.last_sent.get(target, 0.0) + self.coalesce_seconds - now
+            if hold > 0:
+                await asyncio.sleep(hold)
+                continue
+
+            batch = [entry for entry in pending if entry.next_attempt_at <= now][:self.max_batch]
+            self.last_sent[target] = time.time()
+            try:
+                await self._deliver(target, batch)
+            except Exception as e:
+                # e.g. the outbox disk is full; keep the sender alive and try again later
+                logger.exception("✗ %s: delivery failed unexpectedly: %s", self.labels[target], e)
+                await asyncio.sleep(self.backoff_base_seconds)
+
+    async def _deliver(self, target: str, batch: List[OutboxEntry]):
+        import aiohttp
+
+        stats = self.stats[target]
+        stats.requests += 1
+        started = time.perf_counter()
+        status = None
+        error = None
+        retry_after = None
+        try:
+            async with self.session.post(target, json=self._merge(batch)) as resp:
+                status = resp.status
+                await resp.read()
+                if status == 429 or status >= 500:
+                    error = f"HTTP {status}"
+                    retry_after = self._parse_retry_after(resp.headers.get("Retry-After"))
+                elif status >= 400:
+                    error = f"HTTP {status} (not retried)"
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            error = f"{type(e).__name__}: {e}"
+        stats.request_latency.observe((time.perf_counter() - started) * 1000)
+        stats.last_status = status
+
+        if error is None:
+            now = time.time()
+            for entry in batch:
+                stats.delivery_latency.observe((now - entry.created_at) * 1000)
+            stats.delivered += len(batch)
+            await self._run_blocking(lambda: [self._remove_entry(entry) for entry in batch])
+            for entry in batch:
+                self.entries.pop(entry.id, None)
+            logger.info("✓ Delivered %d notification(s) to %s (status=%s)", len(batch), self.labels[target], status)
+            return
+
+        stats.last_error = error
+        permanent = status is not None and 400 <= status < 500 and status != 429
+        retry, dead = [], []
+        for entry in batch:
+            entry.attempts += 1
+            entry.last_error = error
+            (dead if permanent or entry.attempts >= self.max_attempts else retry).append(entry)
+
+        if retry:
+            delay = max(retry_after or 0.0, self._backoff(max(entry.attempts for entry in retry)))
+            for entry in retry:
+                entry.next_attempt_at = time.time() + delay
+
+        stats.retries += len(retry)
+        stats.dead_lettered += len(dead)
+        await self._run_blocking(lambda: (
+            [self._write_entry(entry) for entry in retry],
+            [self._dead_letter(entry) for entry in dead]
+        ))
+        for entry in dead:
+            self.entries.pop(entry.id, None)
+
+        if retry:
+            logger.warning(
+                "✗ %s: %s, retrying %d notification(s) in %.1fs", self.labels[target], error, len(retry), delay
+            )
+        if dead:
+            logger.error("✗ %s: %s, giving up on %d notification(s)", self.labels[target], error, len(dead))
+
+    def _merge(self, batch: List[OutboxEntry]) -> dict:
+        """Single entries go out unchanged; a burst becomes the latest payload plus a summary."""
+        if len(batch) == 1:
+            return batch[0].payload
+        payload = dict(batch[-1].payload)
+        if "text" in payload:
+            payload["text"] = f"{payload['text']} ({len(batch)} alerts)"
+        payload["coalesced"] = len(batch)
+        payload["alerts"] = [entry.payload for entry in batch]
+        return payload
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(self.backoff_max_seconds, self.backoff_base_seconds * (2 ** (attempts - 1)))
+        # Full jitter on half the delay keeps retries from several targets from lining up
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        try:
+            return max(0.0, float(value)) if value else None
+        except ValueError:
+            return None
+
+    def _load_outbox(self):
+        if not self.outbox_dir.exists():
+            return
+        for path in sorted(self.outbox_dir.glob("*.json")):
+            try:
+                entry = OutboxEntry(**json.loads(path.read_text()))
+            except (OSError, ValueError, TypeError) as e:
+                logger.warning("✗ Skipping unreadable outbox entry %s: %s", path.name, e)
+                continue
+            if entry.target in self.stats:
+                self.entries[entry.id] = entry
+            else:
+                # The target was removed from the config since this was queued
+                self._dead_letter(entry)
+
+    def _write_entry(self, entry: OutboxEntry):
+        self.outbox_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.outbox_dir, prefix=".tmp_")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(asdict(entry), f)
+            os.replace(tmp_path, self.outbox_dir / f"{entry.id}.json")
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def _remove_entry(self, entry: OutboxEntry):
+        try:
+            (self.outbox_dir / f"{entry.id}.json").unlink()
+        except FileNotFoundError:
+            pass
+
+    def _dead_letter(self, entry: OutboxEntry):
+        self.dead_dir.mkdir(parents=True, exist_ok=True)
+        (self.dead_dir / f"{entry.id}.json").write_text(json.dumps(asdict(entry)))
+        self._remove_entry(entry)
+
+    @staticmethod
+    async def _run_blocking(func, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    def get_stats(self) -> dict:
+        return {
+            "pending": len(self.entries),
+            "targets": {
+                self.labels[target]: {
+                    "pending": sum(1 for entry in self.entries.values() if entry.target == target),
+                    "delivered": stats.delivered,
+                    "requests": stats.requests,
+                    "retries": stats.retries,
+                    "dead_lettered": stats.dead_lettered,
+                    "last_status": stats.last_status,
+                    "last_error": stats.last_error,
+                    "request_latency": stats.request_latency.to_dict(),
+                    "delivery_latency": stats.delivery_latency.to_dict()
+                }
+                for target, stats in self.stats.items()
+            }
+        }
@@ -0,0 +1,191 @@
+import asyncio
+import bisect
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+
+
+class VisionWorkerPool:
+    """Dedicated, bounded thread pool for CPU-bound vision work.
+
+    YOLO inference, drawing, resizing and JPEG/MP4 encoding all release the
+    GIL inside OpenCV/torch, so a small thread pool keeps them off the event
+    loop without competing with the default executor used for blocking I/O.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or min(2, os.cpu_count() or 1)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.active = 0
+        self.completed = 0
+        self.total_run_seconds = 0.0
+
+    def configure(self, max_workers: int):
+        """Resize the pool. Work already submitted finishes on the old executor."""
+        with self._lock:
+            self.max_workers = max(1, max_workers)
+            old_executor, self._executor = self._executor, None
+        if old_executor:
+            old_executor.shutdown(wait=False)
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="vision"
+                )
+            return self._executor
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run func(*args, **kwargs) on the pool and await its result."""
+        # Set once the job leaves the queue, by whichever of the worker or a
+        # cancelled caller gets there first, so pending is decremented exactly once
+        dequeued = [False]
+        with self._lock:
+            self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self.executor, partial(self._run_tracked, dequeued, func, *args, **kwargs)
+            )
+        finally:
+            with self._lock:
+                if not dequeued[0]:
+                    # Cancelled (e.g. at shutdown) or rejected before a worker picked it up
+                    dequeued[0] = True
+                    self.pending -= 1
+
+    def _run_tracked(self, dequeued: list, func: Callable, *args, **kwargs) -> Any:
+        with self._lock:
+            if not dequeued[0]:
+                dequeued[0] = True
+                self.pending -= 1
+            self.active += 1
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.active -= 1
+                self.completed += 1
+                self.total_run_seconds += elapsed
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=wait)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "active": self.active,
+                "queued": self.pending,
+                "completed": self.completed,
+                "avg_run_ms": (self.total_run_seconds / self.completed * 1000) if self.completed else 0.0
+            }
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes up from a fixed-interval sleep.
+
+    Any synchronous work on the loop shows up directly as lag, so this is the
+    number to watch to confirm vision work stays off the loop.
+    """
+
+    def __init__(self, interval_seconds: float = 0.25, window: int = 240):
+        self.interval_seconds = interval_seconds
+        self.samples: deque = deque(maxlen=window)
+        self.max_lag_ms = 0.0
+        self.task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval_seconds
+            await asyncio.sleep(self.interval_seconds)
+            lag_ms = max(0.0, (loop.time() - expected) * 1000)
+            self.samples.append(lag_ms)
+            self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+
+    def get_stats(self) -> dict:
+        if not self.samples:
+            return {"samples": 0, "current_lag_ms": 0.0, "avg_lag_ms": 0.0, "p99_lag_ms": 0.0, "max_lag_ms": 0.0}
+
+        ordered = sorted(self.samples)
+        p99_index = min(len(ordered) - 1, int(len(ordered) * 0.99))
+        return {
+            "samples": len(ordered),
+            "current_lag_ms": round(self.samples[-1], 2),
+            "avg_lag_ms": round(sum(ordered) / len(ordered), 2),
+            "p99_lag_ms": round(ordered[p99_index], 2),
+            "max_lag_ms": round(self.max_lag_ms, 2)
+        }
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram, cheap enough to update on every call."""
+
+    BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+    def __init__(self, buckets_ms: Optional[tuple] = None):
+        self.buckets_ms = tuple(buckets_ms or self.BUCKETS_MS)
+        self.counts = [0] * (len(self.buckets_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, latency_ms: float):
+        self.counts[bisect.bisect_left(self.buckets_ms, latency_ms)] += 1
+        self.count += 1
+        self.total_ms += latency_ms
+        self.max_ms = max(self.max_ms, latency_ms)
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given fraction of samples."""
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for bound, count in zip(self.buckets_ms, self.counts):
+            seen += count
+            if seen >= target:
+                return float(min(bound, self.max_ms))
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        labels = [f"<={bound}ms" for bound in self.buckets_ms] + [f">{self.buckets_ms[-1]}ms"]
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 1) if self.count else 0.0,
+            "p50_ms": round(self.percentile(0.5), 1),
+            "p95_ms": round(self.percentile(0.95), 1),
+            "max_ms": round(self.max_ms, 1),
+            "buckets": dict(zip(labels, self.counts))
+        }
+
+
+vision_pool = VisionWorkerPool()
+loop_monitor = LoopLagMonitor()
@@ -6,6 +6,7 @@ Test script to verify Doodie Duty components
 import asyncio
 import cv2
 import numpy as np
+from pathlib import Path
 from src.camera import CameraCapture
 from src.detector import DogHumanDetector
 
@@ -49,10 +50,11 @@ def test_detector():
     detections = detector.detect(test_frame)
     print(f"✓ Detection on blank frame completed: {len(detections)} objects found")
 
-    # Test detection methods
-    dogs = detector.detect_dogs(test_frame)
-    humans = detector.detect_humans(test_frame)
-    is_unsupervised, _, _ = detector.is_dog_unsupervised(test_frame)
+    # Test detection methods (single model pass, helpers reuse the result)
+    result = detector.classify(test_frame)
+    dogs = detector.detect_dogs(detections=result.detections)
+    humans = detector.detect_humans(detections=result.detections)
+    is_unsupervised = result.is_unsupervised
 
     print(f"✓ Dogs detected: {len(dogs)}")
     print(f"✓ Humans detected: {len(humans)}")
@@ -87,19 +89,24 @@ async def test_database():
 
     from src.database import Database
 
-    db = Database("sqlite+aiosqlite:///test.db")
+    db = Database("sqlite+aiosqlite:///test.db", snapshot_directory="test_snapshots")
     await db.init_db()
     print("✓ Database initialized")
 
     # Log a test event
+    import numpy as np
     event_id = await db.log_event(
         state="test",
         dogs_detected=1,
         humans_detected=0,
-        duration_unsupervised_seconds=5.0
+        duration_unsupervised_seconds=5.0,
+        frame_snapshot=np.zeros((48, 64, 3), dtype=np.uint8)
     )
     print(f"✓ Test event logged with ID: {event_id}")
 
+    snapshot = await db.get_event_snapshot(event_id)
+    print(f"✓ Snapshot stored out-of-row: {snapshot is not None}")
+
     # Retrieve events
     events = await db.get_events(limit=1)
     print(f"✓ Retrieved {len(events)} event(s)")
@@ -108,16 +115,78 @@ async def test_database():
     stats = await db.get_statistics()
     print(f"✓ Statistics: {stats['total_events']} total events")
 
+    await db.close()
+
     # Cleanup
     import os
+    import shutil
     if os.path.exists("test.db"):
         os.remove("test.db")
+    shutil.rmtree("test_snapshots", ignore_errors=True)
+
+    return True
+
+
+async def test_webhooks():
+    print("\n5. Testing Webhook Delivery...")
+
+    import shutil
+    from aiohttp import web
+    from src.webhooks import WebhookDispatcher
+
+    # Stub target: fails the first request, then accepts everything
+    received = []
+
+    async def hook(request):
+        received.append(await request.json())
+        if len(received) == 1:
+            return web.Response(status=503)
+        return web.Response(status=200)
+
+    app = web.Application()
+    app.router.add_post("/hook", hook)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    dispatcher = WebhookDispatcher(
+        [f"http://127.0.0.1:{port}/hook"],
+        outbox_dir="test_outbox",
+        backoff_base_seconds=0.2,
+        coalesce_seconds=0.1
+    )
+    try:
+        await dispatcher.start()
+        await dispatcher.enqueue({"text": "first"})
+        await asyncio.sleep(0.05)
+        # These arrive while the first is backing off, so they are retried together
+        await dispatcher.enqueue({"text": "second"})
+        await dispatcher.enqueue({"text": "third"})
+
+        for _ in range(50):
+            if not dispatcher.entries:
+                break
+            await asyncio.sleep(0.1)
+
+        stats = dispatcher.get_stats()
+        target = next(iter(stats["targets"].values()))
+        print(f"✓ Delivered {target['delivered']} notifications in {len(received)} requests "
+              f"({target['retries']} retried)")
+        assert target["delivered"] == 3 and stats["pending"] == 0
+        assert received[-1].get("coalesced") == 3
+        print(f"✓ Outbox drained: {not any(Path('test_outbox').glob('*.json'))}")
+    finally:
+        await dispatcher.stop()
+        await runner.cleanup()
+        shutil.rmtree("test_outbox", ignore_errors=True)
 
     return True
 
 
 def test_config():
-    print("\n5. Testing Configuration...")
+    print("\n6. Testing Configuration...")
 
     from src.config import load_config
 
@@ -130,6 +199,35 @@ def test_config():
     return True
 
 
+def test_recording_writer():
+    print("\n7. Testing Recording Writer...")
+
+    import tempfile
+    from src.recording import RecordingWriter, probe_video_codec
+
+    codec = probe_video_codec((320, 240), 10)["codec"]
+    if codec is None:
+        print("⚠ No working video codec, skipping")
+        return True
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out = cv2.VideoWriter(str(Path(tmp) / "preroll.mp4"), cv2.VideoWriter_fourcc(*codec), 10, (320, 240))
+        writer = RecordingWriter(out, 10, (320, 240))
+        writer.start()
+
+        # 5s of 10 fps pre-roll is more than the live queue holds
+        _, jpeg = cv2.imencode(".jpg", np.zeros((240, 320, 3), dtype=np.uint8))
+        preroll = [(i / 10, i, jpeg.tobytes()) for i in range(50)]
+        queued = writer.submit_preroll(preroll)
+        stats = writer.close()
+
+    print(f"✓ Pre-roll queued {queued}/{len(preroll)} frames, {stats['frames_written']} written")
+    assert queued == len(preroll) and stats["frames_dropped"] == 0
+    assert stats["frames_repeated"] == 0
+
+    return True
+
+
 async def main():
     print("=" * 50)
     print("DOODIE DUTY COMPONENT TEST")
@@ -140,10 +238,12 @@ async def main():
         test_camera()
         test_detector()
         test_config()
+        test_recording_writer()
 
         # Test async components
         await test_web_server()
         await test_database()
+        await test_webhooks()
 
         print("\n" + "=" * 50)
         print("✅ ALL TESTS COMPLETED SUCCESSFULLY!")
@@ -52,7 +52,7 @@ async def websocket_endpoint(websocket: WebSocket):
             data = await websocket.receive_text()
             command = json.loads(data)
 
-            if command.get("type") == "get_frame":
+            if command.get("type") in ("get_frame", "subscribe"):
                 # Send mock frame data
                 await websocket.send_json({
                     "type": "frame",